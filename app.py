@@ -1,11 +1,13 @@
 import os
 import streamlit as st
-from src.core.config import logger, get_translation
+from src.core.config import config, logger, get_translation
 from src.core.config.config import get_openai_api_key
 
 from src.llm.chains.search import SearchChain
 from src.llm.chains.flashcard import FlashcardChain
 from src.llm.chains.quiz import QuizChain
+from src.llm.services.jobs import get_job_manager, DONE, CANCELLED
+from src.data.services.deck_service import DeckService, normalize_topic, hash_file
 
 from src.ui.components.st_init import st_init
 from src.ui.components.st_states import init_session_states
@@ -14,7 +16,7 @@ from src.ui.components.sidebar import sidebar
 from src.ui.components.header import header
 
 from src.ui.components.search import search
-from src.ui.components.flashcard import render_flashcards
+from src.ui.components.flashcard import render_flashcards, render_flashcard_progress
 from src.ui.components.quiz import render_quiz
 
 def check_api_key():
@@ -22,6 +24,261 @@ def check_api_key():
     api_key = get_openai_api_key()
     return api_key is not None
 
+def get_deck_source():
+    """Identify the source of the requested deck
+    
+    Returns:
+        tuple: Source type, source key (normalized topic or file hash), title and language
+    """
+    language = st.session_state.get("current_language", "en")
+    if "file_content" in st.session_state and st.session_state.file_content:
+        content = st.session_state.file_content
+        uploaded_file = st.session_state.get("uploaded_file")
+        data = uploaded_file.getvalue() if uploaded_file is not None else content["content"].encode("utf-8")
+        return DeckService.FILE, hash_file(data), content["metadata"]["file_name"], language
+    
+    topic = st.session_state.input_text
+    return DeckService.TOPIC, normalize_topic(topic), topic, language
+
+@st.fragment(run_every=config.get_job_poll_interval())
+def poll_job(job_id, render_progress=None):
+    """Poll a background job, rerunning the whole app once it finished
+    
+    Only this fragment reruns while the job runs, so the script thread is free
+    between polls and sidebar or language reruns leave the job untouched.
+    
+    Args:
+        job_id (str): Id of the job
+        render_progress (Optional[Callable]): Renders the progress of the running job
+    """
+    job = get_job_manager().get(job_id)
+    if job is None or job.finished:
+        st.rerun()
+    if render_progress is not None:
+        render_progress(job)
+
+def cancel_job(state_key):
+    """Cancel the job whose id the session keeps under a state key"""
+    job_id = st.session_state.pop(state_key, None)
+    if job_id is not None:
+        get_job_manager().cancel(job_id)
+
+def generate_deck(job, source, search_chain, flashcard_chain, file_content, query, regenerate=False):
+    """Job generating the deck of a source and storing it
+    
+    Runs on the job manager, so everything comes from its arguments (the chains
+    are built in the script thread). The flashcards generated so far are
+    reported as the partial result of the job.
+    
+    Returns:
+        dict: Deck with "id" (None if it could not be stored), "flashcards" and "quiz"
+    """
+    source_type, source_key, title, language = source
+    
+    # The deck may have been stored since the session looked it up
+    deck_service = DeckService()
+    deck = None if regenerate else deck_service.find_deck(source_type, source_key, language)
+    if deck:
+        return deck
+    
+    if file_content:
+        # Process uploaded file content
+        summarized_content = search_chain.summarize_content(file_content["content"])
+
+        # Format summarized content for flashcard generation
+        formatted_results = [{
+            "query": "file_upload",
+            "type": "text",
+            "result": {
+                "content": summarized_content,
+                "title": file_content["metadata"]["file_name"],
+                "link": file_content["metadata"]["file_type"]
+            }
+        }]
+    else:
+        # Process search query, yielding each result as soon as it is ready
+        formatted_results = search_chain.iter_queries(query)
+
+    # Generate flashcards, reporting each one as it arrives
+    flashcards = []
+    for flashcard in flashcard_chain.stream_search_results(formatted_results):
+        job.check_cancelled()
+        flashcards.append(flashcard)
+        job.report(completed=len(flashcards), partial=list(flashcards))
+    job.check_cancelled()
+    logger.parser(f"Generated Flashcards: {flashcards}")
+    
+    deck_id = deck_service.save_deck(source_type, source_key, language, title, flashcards)
+    return {"id": deck_id, "flashcards": flashcards, "quiz": None}
+
+def start_deck_job(source, regenerate=False):
+    """Submit the generation of the deck of the session source
+    
+    Sessions asking for the same source (normalized topic or file, and language)
+    while it is generated join the same job instead of each running the search
+    and flashcard pipeline.
+    
+    Args:
+        source (tuple): Source of the deck, see get_deck_source
+        regenerate (bool): Generate the deck even if one is stored
+    
+    Returns:
+        str: Id of the job
+    """
+    source_type, source_key, _, language = source
+    key = None
+    if config.is_deck_coalescing_enabled():
+        key = ("deck", source_type, source_key, language)
+        # Join the running generation before building chains it would not use
+        job_id = get_job_manager().join(key)
+        if job_id is not None:
+            return job_id
+    
+    file_content = st.session_state.get("file_content") or None
+    return get_job_manager().submit(
+        "deck",
+        generate_deck,
+        source,
+        SearchChain(),
+        FlashcardChain(),
+        file_content,
+        st.session_state.get("input_text"),
+        regenerate,
+        key=key
+    )
+
+def render_deck_progress(job):
+    """Render the flashcards a deck job generated so far"""
+    render_flashcard_progress(st.empty(), job.partial or [])
+
+def load_deck():
+    """Load the deck of the session source, from the database or its generation job
+    
+    Returns:
+        dict: Deck with "id", "flashcards" and "quiz", or None while it is being
+            generated (its progress is rendered and polled)
+    """
+    if "deck_error" in st.session_state:
+        render_deck_error(st.session_state.deck_error)
+        return None
+    
+    job_id = st.session_state.get("deck_job_id")
+    if job_id is None:
+        # Load the stored deck of this topic or file instead of regenerating it
+        source = get_deck_source()
+        source_type, source_key, _, language = source
+        regenerate = st.session_state.pop("regenerate_deck", False)
+        deck = None if regenerate else DeckService().find_deck(source_type, source_key, language)
+        if deck:
+            logger.info(f"Loaded stored deck {deck['id']} with {len(deck['flashcards'])} flashcards")
+            return deck
+        job_id = st.session_state.deck_job_id = start_deck_job(source, regenerate)
+    
+    job = get_job_manager().get(job_id)
+    if job is None or job.status == CANCELLED:
+        # The job expired or was cancelled, generate the deck again
+        st.session_state.pop("deck_job_id", None)
+        return load_deck()
+    if not job.finished:
+        poll_job(job_id, render_deck_progress)
+        return None
+    
+    st.session_state.pop("deck_job_id", None)
+    if job.status == DONE:
+        return job.result
+    
+    # Keep the error instead of an empty deck, the user decides when to retry
+    st.session_state.deck_error = job.error or ""
+    render_deck_error(st.session_state.deck_error)
+    return None
+
+def render_deck_error(error):
+    """Tell the user the deck could not be generated, with a button to try again"""
+    st.error(get_translation("Unable to generate the flashcards. Please try again."))
+    if error:
+        st.caption(error)
+    col1, col2, col3 = st.columns([1,2,1])
+    with col2:
+        if st.button(get_translation("Try again 🔄"), use_container_width=True):
+            st.session_state.pop("deck_error", None)
+            st.rerun()
+
+def regenerate_deck():
+    """Drop the deck of the session and generate it again, replacing the stored one"""
+    cancel_job("quiz_job_id")
+    for key in ("generated_flashcards", "generated_quiz", "deck_id"):
+        st.session_state.pop(key, None)
+    st.session_state.regenerate_deck = True
+
+def create_and_store_quiz(job, quiz_chain, flashcards, deck_id):
+    """Job generating a quiz and storing it with its deck
+    
+    The chain stops between shards once the job is cancelled (the user left the
+    deck), and a cancelled quiz is never stored.
+    """
+    quiz = quiz_chain.create_quiz(flashcards, is_cancelled=lambda: job.cancel_requested)
+    job.check_cancelled()
+    if quiz and deck_id:
+        DeckService().save_quiz(deck_id, quiz)
+    return quiz
+
+def start_quiz_job():
+    """Submit the generation of the quiz of the session flashcards
+    
+    The chain is built here, in the script thread, because it reads the API key
+    from the session. Only create_quiz runs in the background.
+    """
+    deck_id = st.session_state.get("deck_id")
+    key = ("quiz", deck_id) if deck_id and config.is_deck_coalescing_enabled() else None
+    job_id = get_job_manager().join(key) if key is not None else None
+    if job_id is not None:
+        st.session_state.quiz_job_id = job_id
+        return
+    st.session_state.quiz_job_id = get_job_manager().submit(
+        "quiz",
+        create_and_store_quiz,
+        QuizChain(),
+        list(st.session_state.generated_flashcards),
+        deck_id,
+        key=key
+    )
+
+def start_quiz_prefetch():
+    """Generate the quiz in the background while the user studies the flashcards"""
+    if not config.is_quiz_prefetch_enabled():
+        return
+    if "quiz_job_id" in st.session_state or "generated_quiz" in st.session_state:
+        return
+    if not st.session_state.get("generated_flashcards"):
+        return
+    start_quiz_job()
+
+def render_quiz_progress(job):
+    """Tell the user the quiz is still being generated"""
+    st.info(get_translation("Generating the quiz..."))
+
+def load_quiz():
+    """Return the quiz of the session from its job, starting the job if needed
+    
+    Returns:
+        list: Quiz questions (empty if the generation failed), or None while the
+            quiz is being generated (its progress is rendered and polled)
+    """
+    if "quiz_job_id" not in st.session_state:
+        start_quiz_job()
+    
+    job = get_job_manager().get(st.session_state.quiz_job_id)
+    if job is None or job.status == CANCELLED:
+        # The job expired or was cancelled, generate the quiz again
+        st.session_state.pop("quiz_job_id", None)
+        return load_quiz()
+    if not job.finished:
+        poll_job(job.id, render_quiz_progress)
+        return None
+    
+    st.session_state.pop("quiz_job_id", None)
+    return job.result if job.status == DONE else []
+
 def main():    
     # Initialize Streamlit components
     st_init()
@@ -38,50 +295,44 @@ def main():
 
     # Main content
     if "input_text" not in st.session_state and "file_content" not in st.session_state:
-        # Reset flashcards when returning to search
+        # Reset flashcards and their quiz when returning to search
+        cancel_job("deck_job_id")
+        cancel_job("quiz_job_id")
         if "generated_flashcards" in st.session_state:
             del st.session_state.generated_flashcards
+        if "generated_quiz" in st.session_state:
+            del st.session_state.generated_quiz
+        st.session_state.pop("deck_id", None)
+        st.session_state.pop("regenerate_deck", None)
+        st.session_state.pop("deck_error", None)
         search()
     else:
         # Generate flashcards if needed
         if "generated_flashcards" not in st.session_state:
-            search_chain = SearchChain()
-            
-            if "file_content" in st.session_state and st.session_state.file_content:
-                # Process uploaded file content
-                content = st.session_state.file_content
-                summarized_content = search_chain.summarize_content(content["content"])
-                
-                # Format summarized content for flashcard generation
-                formatted_results = [{
-                    "query": "file_upload",
-                    "type": "text",
-                    "result": {
-                        "content": summarized_content,
-                        "title": content["metadata"]["file_name"],
-                        "link": content["metadata"]["file_type"]
-                    }
-                }]
-            else:
-                # Process search query
-                query = st.session_state.input_text
-                formatted_results = search_chain.process_queries(query)
-            
-            # Generate flashcards
-            flashcard_chain = FlashcardChain()
-            flashcards = flashcard_chain.process_search_results(formatted_results)
-            logger.parser(f"Generated Flashcards: {flashcards}")
+            deck = load_deck()
+            if deck is None:
+                # Still generating (the poller reruns the app once the deck is
+                # ready) or failed (the user can retry)
+                return
             
             # Store flashcards in session state
-            st.session_state.generated_flashcards = flashcards
+            st.session_state.generated_flashcards = deck["flashcards"]
+            st.session_state.deck_id = deck["id"]
+            if deck["quiz"]:
+                st.session_state.generated_quiz = deck["quiz"]
+        
+        # Start generating the quiz while the user studies the flashcards
+        start_quiz_prefetch()
         
         # Render content based on state
         if "start_quiz" in st.session_state and st.session_state.start_quiz:
             # Generate quiz if starting
             if "generated_quiz" not in st.session_state:
                 if st.session_state.generated_flashcards:
-                    quiz_chain = QuizChain()
-                    quiz = quiz_chain.create_quiz(st.session_state.generated_flashcards)
+                    quiz = load_quiz()
+                    if quiz is None:
+                        # Still generating, the poller reruns the app once the quiz is ready
+                        return
                     logger.parser(f"Generated Quiz: {quiz}")
                     st.session_state.generated_quiz = quiz
                     st.rerun()
@@ -95,6 +346,8 @@ def main():
                 render_quiz(st.session_state.generated_quiz)
             else:
                 st.error(get_translation("Unable to generate the quiz. Please try again."))
+                # Forget the failed quiz so it is generated again
+                st.session_state.pop("generated_quiz", None)
                 st.session_state.start_quiz = False
                 st.rerun()
         else:
@@ -111,6 +364,13 @@ def main():
                     if st.button(get_translation("Start Quiz "), use_container_width=True):
                         st.session_state.start_quiz = True
                         st.rerun()
+            
+            # Generate the deck again instead of reusing the stored one
+            col1, col2, col3 = st.columns([1,2,1])
+            with col2:
+                if st.button(get_translation("Regenerate flashcards 🔄"), use_container_width=True):
+                    regenerate_deck()
+                    st.rerun()
 
 if __name__ == "__main__":
     main()
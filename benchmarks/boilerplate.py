@@ -0,0 +1,64 @@
+"""Report of how much boilerplate the main-content extractor removes per page
+
+Fetches each page through the pooled page fetcher (or reads local HTML files),
+and compares the visible text of the page (what the search chain summarized
+before) with the extracted main content, in characters and tokens, together
+with the extraction time.
+
+Usage (from the repository root):
+    python -m benchmarks.boilerplate URL_OR_FILE [URL_OR_FILE ...]
+"""
+
+import argparse
+import os
+import time
+
+from src.llm.text.readability import extract_main_text
+from src.llm.text.tokens import count_tokens
+from bs4 import BeautifulSoup
+
+
+def load_html(source: str) -> str:
+    """Read a local HTML file or fetch a URL"""
+    if os.path.exists(source):
+        with open(source, encoding="utf-8", errors="replace") as file:
+            return file.read()
+
+    from src.llm.services.fetcher import get_page_fetcher
+    page = get_page_fetcher().fetch(source)
+    if "error" in page:
+        raise ValueError(page["error"])
+    return page["text"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="URLs or local HTML files")
+    args = parser.parse_args()
+
+    print(f"{'page tok':>9} {'main tok':>9} {'removed':>8} {'ms':>7}  source")
+    totals = [0, 0]
+    for source in args.sources:
+        try:
+            html = load_html(source)
+        except Exception as e:
+            print(f"{'-':>9} {'-':>9} {'-':>8} {'-':>7}  {source} ({str(e)})")
+            continue
+
+        page_tokens = count_tokens(BeautifulSoup(html, "html.parser").get_text())
+        start = time.perf_counter()
+        result = extract_main_text(html)
+        elapsed = (time.perf_counter() - start) * 1000
+        main_tokens = count_tokens(result["text"])
+
+        totals[0] += page_tokens
+        totals[1] += main_tokens
+        removed = 1 - main_tokens / page_tokens if page_tokens else 0
+        print(f"{page_tokens:>9} {main_tokens:>9} {removed:>8.0%} {elapsed:>7.1f}  {source}")
+
+    if totals[0]:
+        print(f"\nTotal: {totals[0]} -> {totals[1]} tokens ({1 - totals[1] / totals[0]:.0%} removed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark of concurrent deck writes against SQLite
+
+Runs the same workload on two engines over a fresh database file each:
+
+- legacy: one StaticPool connection shared by every thread with
+  check_same_thread=False, as database.py used to be configured
+- pooled: create_db_engine (connection pool, WAL, busy timeout, BEGIN
+  IMMEDIATE for write units)
+
+Every thread repeatedly stores a deck with its cards (one transaction with a
+multi-row insert, as DeckService.save_deck does) and reads a deck back. The
+benchmark reports throughput, latency percentiles and errors such as
+"database is locked". Each engine runs in its own process, because threads
+sharing the legacy connection can crash the interpreter; a crash is reported
+instead of aborting the benchmark.
+
+Usage (from the repository root):
+    python -m benchmarks.db_concurrency [--threads 16] [--writes 50] [--cards 20]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.data.db.database import Base, create_db_engine
+from src.data.models.deck import Deck
+from src.data.models.card import Card
+
+
+def legacy_engine(url: str):
+    """Engine configured as database.py was before the connection pool"""
+    return create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+
+def write_deck(session_factory, pooled: bool, thread: int, index: int, cards: int):
+    """Store a deck with its cards in one unit of work, then read one back"""
+    session = session_factory()
+    try:
+        if pooled:
+            session.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
+        deck = Deck(source_type="topic", source_key=f"topic {thread}-{index}", language="en", title="Benchmark")
+        session.add(deck)
+        session.flush()
+        session.execute(insert(Card), [
+            {"deck_id": deck.id, "position": position, "question": f"Question {position}?",
+             "answer": "Answer " * 20, "source": "https://example.com", "type": "text"}
+            for position in range(cards)
+        ])
+        session.commit()
+
+        session.execute(select(Deck).where(Deck.id == deck.id)).scalar_one()
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def run(name: str, engine, args) -> dict:
+    """Run the workload on an engine"""
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+    pooled = name == "pooled"
+    latencies = []
+    errors = Counter()
+
+    def worker(thread: int):
+        for index in range(args.writes):
+            start = time.perf_counter()
+            try:
+                write_deck(session_factory, pooled, thread, index, args.cards)
+                latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                errors[str(e).splitlines()[0][:60]] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        list(executor.map(worker, range(args.threads)))
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0
+    return {
+        "ok": len(latencies),
+        "errors": dict(errors),
+        "elapsed": elapsed,
+        "p50": percentile(0.5),
+        "p95": percentile(0.95),
+    }
+
+
+def run_engine(name: str, database: str, args) -> dict:
+    """Run the workload of an engine in a child process"""
+    command = [
+        sys.executable, "-m", "benchmarks.db_concurrency",
+        "--engine", name, "--database", database,
+        "--threads", str(args.threads), "--writes", str(args.writes), "--cards", str(args.cards)
+    ]
+    process = subprocess.run(command, capture_output=True, text=True)
+    if process.returncode != 0:
+        return {"crashed": f"exit code {process.returncode}"}
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16, help="Concurrent writer threads")
+    parser.add_argument("--writes", type=int, default=50, help="Decks written per thread")
+    parser.add_argument("--cards", type=int, default=20, help="Cards per deck")
+    parser.add_argument("--engine", choices=("legacy", "pooled"), help=argparse.SUPPRESS)
+    parser.add_argument("--database", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.engine:
+        url = f"sqlite:///{args.database}"
+        if args.engine == "legacy":
+            engine = legacy_engine(url)
+        else:
+            engine = create_db_engine(url, pool_size=args.threads, max_overflow=0)
+        print(json.dumps(run(args.engine, engine, args)))
+        return
+
+    print(f"{'engine':>7} {'ok':>6} {'errors':>6} {'seconds':>8} {'decks/s':>8} {'p50 ms':>7} {'p95 ms':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("legacy", "pooled"):
+            result = run_engine(name, os.path.join(directory, name + ".db"), args)
+            if "crashed" in result:
+                print(f"{name:>7} crashed ({result['crashed']})")
+                continue
+            print(f"{name:>7} {result['ok']:>6} {sum(result['errors'].values()):>6} "
+                  f"{result['elapsed']:>8.2f} {result['ok'] / result['elapsed']:>8.1f} "
+                  f"{result['p50']:>7.1f} {result['p95']:>7.1f}")
+            for message, count in sorted(result["errors"].items(), key=lambda item: -item[1])[:3]:
+                print(f"{'':>7} {count} x {message}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark of the previous-flashcards context as the deck grows
+
+Renders the web flashcard prompt for a growing deck with the legacy context
+(the repr of every previous card) and with the compact list of covered
+questions, and reports prompt tokens for each. With --live, every prompt is
+also sent to the 70B model to measure the latency per call.
+
+Usage (from the repository root):
+    python -m benchmarks.flashcard_context [--results 20] [--cards-per-result 4] [--live]
+"""
+
+import argparse
+import time
+
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.llm.chains.flashcard import format_previous_flashcards
+from src.llm.prompts.fcard_prompts import web_flashcard_system_template, web_flashcard_human_template
+from src.llm.text.tokens import count_tokens
+
+CONTENT = (
+    "Photosynthesis is the process used by plants, algae and some bacteria to convert light "
+    "energy into chemical energy stored in glucose. It takes place in the chloroplasts. "
+) * 40
+
+
+def build_deck(results: int, cards_per_result: int) -> list:
+    """Build a synthetic deck shaped like the model output"""
+    return [
+        {
+            "question": f"What is concept {result}.{card} of photosynthesis and why does it matter?",
+            "answer": "It is a key step of photosynthesis in which light energy is captured and "
+                      "converted, for example in the thylakoid membranes of the chloroplast.",
+            "source": f"https://en.wikipedia.org/wiki/Photosynthesis#section_{result}",
+            "type": "text"
+        }
+        for result in range(results)
+        for card in range(cards_per_result)
+    ]
+
+
+def prompt_tokens(prompt: ChatPromptTemplate, previous_flashcards: str) -> int:
+    """Count the tokens of the rendered prompt messages"""
+    messages = prompt.format_messages(
+        title="Photosynthesis",
+        link="https://en.wikipedia.org/wiki/Photosynthesis",
+        previous_flashcards=previous_flashcards,
+        content=CONTENT
+    )
+    return sum(count_tokens(message.content) for message in messages)
+
+
+def timed_call(chain, previous_flashcards: str) -> float:
+    """Send one prompt to the model and return its latency in seconds"""
+    start = time.perf_counter()
+    chain.invoke({
+        "title": "Photosynthesis",
+        "link": "https://en.wikipedia.org/wiki/Photosynthesis",
+        "previous_flashcards": previous_flashcards,
+        "content": CONTENT
+    })
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=20, help="Number of search results in the deck")
+    parser.add_argument("--cards-per-result", type=int, default=4, help="Flashcards generated per result")
+    parser.add_argument("--live", action="store_true", help="Also measure the latency of real model calls")
+    args = parser.parse_args()
+
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", web_flashcard_system_template),
+        ("human", web_flashcard_human_template)
+    ])
+
+    chain = None
+    if args.live:
+        from src.llm.chains.flashcard import FlashcardChain
+        chain = FlashcardChain().web_chain
+
+    deck = build_deck(args.results, args.cards_per_result)
+
+    header = f"{'call':>4} {'prev cards':>10} {'legacy tok':>10} {'compact tok':>11}"
+    if args.live:
+        header += f" {'legacy s':>9} {'compact s':>9}"
+    print(header)
+
+    totals = [0, 0]
+    for call in range(args.results):
+        previous = deck[:call * args.cards_per_result]
+        legacy = str(previous) if previous else "[]"
+        compact = format_previous_flashcards(previous)
+
+        legacy_tokens = prompt_tokens(prompt, legacy)
+        compact_tokens = prompt_tokens(prompt, compact)
+        totals[0] += legacy_tokens
+        totals[1] += compact_tokens
+
+        row = f"{call + 1:>4} {len(previous):>10} {legacy_tokens:>10} {compact_tokens:>11}"
+        if chain is not None:
+            row += f" {timed_call(chain, legacy):>9.2f} {timed_call(chain, compact):>9.2f}"
+        print(row)
+
+    print(f"\nTotal prompt tokens: legacy {totals[0]}, compact {totals[1]} "
+          f"({100 * (1 - totals[1] / totals[0]):.1f}% fewer)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Micro-benchmark of JSON extraction from LLM outputs
+
+Compares the regex the parsers used to scan responses with
+(r'(\\{(?:[^{}]|{[^{}]*})*\\})' + json.loads) against the incremental
+JSONStreamExtractor on large, deeply nested and malformed outputs, and reports
+whether the {"flashcards": [...]} object was found (the regex trips over braces
+inside strings and objects nested more than two levels deep), and how early the streaming
+extractor emits its first flashcard.
+
+Usage (from the repository root):
+    python -m benchmarks.json_parsers [--cards 200] [--repeat 5]
+"""
+
+import argparse
+import json
+import re
+import time
+
+from src.llm.parsers.json_stream import JSONStreamExtractor, extract_json_objects
+
+LEGACY_PATTERN = re.compile(r'(\{(?:[^{}]|{[^{}]*})*\})')
+
+
+def legacy_extract(text: str) -> list:
+    """Extraction as done by the parsers before the streaming extractor"""
+    objects = []
+    for match in LEGACY_PATTERN.finditer(text):
+        try:
+            objects.append(json.loads(match.group(0)))
+        except json.JSONDecodeError:
+            continue
+    return objects
+
+
+def flashcards_response(cards: int, nested: bool = False) -> str:
+    """Build a response shaped like the flashcard model output"""
+    flashcards = []
+    for index in range(cards):
+        card = {
+            "question": f"What is concept {index} and how does it relate to {{the others}}?",
+            "answer": "It is a key idea. " * 10,
+            "source": f"https://example.com/{index}",
+            "type": "text"
+        }
+        if nested:
+            card["metadata"] = {"tags": {"level": {"value": index}}}
+        flashcards.append(card)
+    return "Sure! Here are the flashcards:\n```json\n" + json.dumps({"flashcards": flashcards}, indent=2) + "\n```\n"
+
+
+def malformed_response(cards: int) -> str:
+    """Build a long response with unbalanced braces and a truncated object"""
+    text = flashcards_response(cards)
+    return "{ " * 50 + text[: len(text) // 2] + "} {" * 20
+
+
+def found_deck(objects: list) -> str:
+    """Whether the {"flashcards": [...]} wrapper object was extracted"""
+    return "yes" if any(isinstance(obj, dict) and "flashcards" in obj for obj in objects) else "no"
+
+
+def best_time(function, text: str, repeat: int) -> float:
+    """Best wall-clock time of several runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def first_item_offset(text: str, chunk_size: int = 8) -> int:
+    """Number of characters streamed before the first flashcard is emitted"""
+    extractor = JSONStreamExtractor(item_keys=("flashcards",))
+    for start in range(0, len(text), chunk_size):
+        if extractor.feed(text[start:start + chunk_size]):
+            return start + chunk_size
+    return len(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=200, help="Flashcards in the generated outputs")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement")
+    args = parser.parse_args()
+
+    cases = {
+        "large": flashcards_response(args.cards),
+        "nested": flashcards_response(args.cards, nested=True),
+        "malformed": malformed_response(args.cards),
+    }
+
+    print(f"{'case':>10} {'chars':>9} {'regex ms':>9} {'stream ms':>10} {'regex deck':>10} {'stream deck':>11}")
+    for name, text in cases.items():
+        legacy_ms = best_time(legacy_extract, text, args.repeat)
+        stream_ms = best_time(extract_json_objects, text, args.repeat)
+        print(f"{name:>10} {len(text):>9} {legacy_ms:>9.2f} {stream_ms:>10.2f} "
+              f"{found_deck(legacy_extract(text)):>10} {found_deck(extract_json_objects(text)):>11}")
+
+    text = cases["large"]
+    print(f"\nFirst flashcard emitted after {first_item_offset(text)} of {len(text)} streamed characters")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 
 import os
 import streamlit as st
-from typing import Optional
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
 def get_translation(text)->str:
@@ -67,6 +67,15 @@ class Config:
         
         # STORAGE
         self.logs_dir = os.getenv('LOGS_DIR', 'src/data/logs')
+        self.cache_dir = os.getenv('CACHE_DIR', 'src/data/cache')
+        
+        # DATABASE
+        self.database_url = os.getenv('DATABASE_URL', 'sqlite:///./learnicity.db')
+        self.db_pool_size = int(os.getenv('DB_POOL_SIZE', '5'))
+        self.db_max_overflow = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+        self.db_busy_timeout = int(os.getenv('DB_BUSY_TIMEOUT', '5000'))
+        self.deck_max_age_days = float(os.getenv('DECK_MAX_AGE_DAYS', '30'))
+        self.deck_min_cards = int(os.getenv('DECK_MIN_CARDS', '3'))
         
         # API KEYS - Using priority system for all keys
         self.serpapi_api_key = get_api_key('SERPAPI_API_KEY')
@@ -77,6 +86,59 @@ class Config:
         
         # TIMEOUT
         self.inference_timeout = int(os.getenv('INFERENCE', '30'))
+
+        # CONTEXT WINDOWS
+        # Comma-separated model=tokens pairs, e.g. "Meta-Llama-3.1-8B-Instruct=16384"
+        self.context_windows = {}
+        for pair in os.getenv('LLM_CONTEXT_WINDOWS', '').split(','):
+            model_name, _, tokens = pair.partition('=')
+            if model_name.strip() and tokens.strip().isdigit():
+                self.context_windows[model_name.strip()] = int(tokens)
+        
+        # STRUCTURED OUTPUT
+        self.structured_output_enabled = os.getenv('LLM_STRUCTURED_OUTPUT', 'false').lower() == 'true'
+
+        # CONCURRENCY
+        self.search_max_concurrency = int(os.getenv('SEARCH_MAX_CONCURRENCY', '3'))
+        self.summary_max_concurrency = int(os.getenv('SUMMARY_MAX_CONCURRENCY', '4'))
+        self.flashcard_max_concurrency = int(os.getenv('FLASHCARD_MAX_CONCURRENCY', '1'))
+        self.flashcard_dedup_threshold = float(os.getenv('FLASHCARD_DEDUP_THRESHOLD', '0.7'))
+        self.flashcard_context_max_tokens = int(os.getenv('FLASHCARD_CONTEXT_MAX_TOKENS', '600'))
+        self.extract_max_workers = int(os.getenv('EXTRACT_MAX_WORKERS', '2'))
+        self.quiz_max_concurrency = int(os.getenv('QUIZ_MAX_CONCURRENCY', '4'))
+        self.deck_coalescing_enabled = os.getenv('DECK_COALESCING_ENABLED', 'true').lower() == 'true'
+        
+        # JOBS
+        self.job_max_workers = int(os.getenv('JOB_MAX_WORKERS', '4'))
+        self.job_retention = float(os.getenv('JOB_RETENTION_SECONDS', '900'))
+        self.job_poll_interval = float(os.getenv('JOB_POLL_INTERVAL', '1'))
+        
+        # QUIZ
+        self.quiz_num_questions = int(os.getenv('QUIZ_NUM_QUESTIONS', '5'))
+        self.quiz_shard_size = int(os.getenv('QUIZ_SHARD_SIZE', '8'))
+        self.quiz_dedup_threshold = float(os.getenv('QUIZ_DEDUP_THRESHOLD', '0.7'))
+        self.quiz_prefetch_enabled = os.getenv('QUIZ_PREFETCH_ENABLED', 'true').lower() == 'true'
+
+        # RELEVANCE
+        self.summary_top_k_chunks = int(os.getenv('SUMMARY_TOP_K_CHUNKS', '32'))
+        self.relevance_chunk_tokens = int(os.getenv('RELEVANCE_CHUNK_TOKENS', '256'))
+        
+        # FETCH
+        self.fetch_max_connections = int(os.getenv('FETCH_MAX_CONNECTIONS', '20'))
+        self.fetch_max_per_host = int(os.getenv('FETCH_MAX_PER_HOST', '4'))
+        self.fetch_timeout = int(os.getenv('FETCH_TIMEOUT', '15'))
+        self.fetch_max_bytes = int(os.getenv('FETCH_MAX_BYTES', '2000000'))
+
+        # CACHE
+        self.llm_cache_enabled = os.getenv('LLM_CACHE_ENABLED', 'false').lower() == 'true'
+        self.llm_cache_ttl = int(os.getenv('LLM_CACHE_TTL', '86400'))
+        self.llm_cache_max_entries = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '10000'))
+        self.search_cache_enabled = os.getenv('SEARCH_CACHE_ENABLED', 'true').lower() == 'true'
+        self.search_cache_ttl = int(os.getenv('SEARCH_CACHE_TTL', '86400'))
+        self.search_cache_max_entries = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '5000'))
+        self.search_cache_max_stale = int(os.getenv('SEARCH_CACHE_MAX_STALE', '604800'))
+        self.page_cache_enabled = os.getenv('PAGE_CACHE_ENABLED', 'true').lower() == 'true'
+        self.page_cache_max_bytes = int(os.getenv('PAGE_CACHE_MAX_BYTES', '200000000'))
     
     def reload(self):
         """Reload all environment variables"""
@@ -86,10 +148,166 @@ class Config:
         """Get inference timeout value"""
         return self.inference_timeout
     
+    def get_context_window_overrides(self) -> Dict[str, int]:
+        """Get the context window sizes configured per model, overriding the defaults"""
+        return dict(self.context_windows)
+    
+    def is_structured_output_enabled(self) -> bool:
+        """Whether chains request JSON mode and validate items against schemas"""
+        return self.structured_output_enabled
+    
+    def get_search_max_concurrency(self) -> int:
+        """Get the maximum number of search queries processed in parallel"""
+        return max(1, self.search_max_concurrency)
+    
+    def get_summary_max_concurrency(self) -> int:
+        """Get the maximum number of chunks summarized in parallel"""
+        return max(1, self.summary_max_concurrency)
+    
     def get_logs_dir(self) -> Optional[str]:
         """Get the logs directory path"""
         return self.logs_dir
     
+    def get_flashcard_max_concurrency(self) -> int:
+        """Get the maximum number of search results turned into flashcards in parallel"""
+        return max(1, self.flashcard_max_concurrency)
+    
+    def get_flashcard_dedup_threshold(self) -> float:
+        """Get the similarity above which concurrently generated flashcards are duplicates"""
+        return self.flashcard_dedup_threshold
+    
+    def get_flashcard_context_max_tokens(self) -> int:
+        """Get the token budget of the already covered questions in flashcard prompts"""
+        return self.flashcard_context_max_tokens
+    
+    def get_extract_max_workers(self) -> int:
+        """Get the number of processes extracting the main content of fetched pages, 0 extracts inline"""
+        return max(0, self.extract_max_workers)
+    
+    def get_quiz_max_concurrency(self) -> int:
+        """Get the maximum number of quiz shards generated in parallel"""
+        return max(1, self.quiz_max_concurrency)
+    
+    def get_job_max_workers(self) -> int:
+        """Get the maximum number of background jobs running at once"""
+        return max(1, self.job_max_workers)
+    
+    def get_job_retention(self) -> float:
+        """Get how long a finished job stays available, in seconds"""
+        return max(0.0, self.job_retention)
+    
+    def get_job_poll_interval(self) -> float:
+        """Get how often the UI polls a running job, in seconds"""
+        return max(0.1, self.job_poll_interval)
+    
+    def is_quiz_prefetch_enabled(self) -> bool:
+        """Whether the quiz is generated in the background as soon as flashcards exist"""
+        return self.quiz_prefetch_enabled
+    
+    def is_deck_coalescing_enabled(self) -> bool:
+        """Whether concurrent requests for the same deck share one generation"""
+        return self.deck_coalescing_enabled
+    
+    def get_quiz_num_questions(self) -> int:
+        """Get the number of questions of a quiz"""
+        return max(1, self.quiz_num_questions)
+    
+    def get_quiz_shard_size(self) -> int:
+        """Get the number of flashcards per quiz shard, 0 generates the quiz in a single call"""
+        return max(0, self.quiz_shard_size)
+    
+    def get_quiz_dedup_threshold(self) -> float:
+        """Get the similarity above which questions of different shards are duplicates"""
+        return self.quiz_dedup_threshold
+    
+    def get_summary_top_k_chunks(self) -> int:
+        """Get the number of chunks most relevant to the query that are summarized, 0 keeps all"""
+        return max(0, self.summary_top_k_chunks)
+    
+    def get_relevance_chunk_tokens(self) -> int:
+        """Get the size in tokens of the chunks scored against the query"""
+        return max(32, self.relevance_chunk_tokens)
+    
+    def get_fetch_max_connections(self) -> int:
+        """Get the size of the page fetcher connection pool"""
+        return self.fetch_max_connections
+    
+    def get_fetch_max_per_host(self) -> int:
+        """Get the maximum number of concurrent connections per host"""
+        return self.fetch_max_per_host
+    
+    def get_fetch_timeout(self) -> int:
+        """Get the page fetch timeout in seconds"""
+        return self.fetch_timeout
+    
+    def get_fetch_max_bytes(self) -> int:
+        """Get the maximum number of bytes read from a fetched page"""
+        return self.fetch_max_bytes
+    
+    def get_database_url(self) -> str:
+        """Get the SQLAlchemy URL of the application database"""
+        return self.database_url
+    
+    def get_db_pool_size(self) -> int:
+        """Get the number of database connections kept in the pool"""
+        return max(1, self.db_pool_size)
+    
+    def get_db_max_overflow(self) -> int:
+        """Get the number of extra database connections opened under load"""
+        return max(0, self.db_max_overflow)
+    
+    def get_db_busy_timeout(self) -> int:
+        """Get how long a SQLite writer waits for the database lock, in milliseconds"""
+        return max(0, self.db_busy_timeout)
+    
+    def get_deck_max_age_days(self) -> float:
+        """Get the age in days after which a stored deck is generated again, 0 keeps decks forever"""
+        return max(0.0, self.deck_max_age_days)
+    
+    def get_deck_min_cards(self) -> int:
+        """Get the minimum number of flashcards of a stored deck to reuse it"""
+        return max(1, self.deck_min_cards)
+    
+    def get_cache_dir(self) -> str:
+        """Get the directory holding the persistent caches"""
+        return self.cache_dir
+    
+    def is_llm_cache_enabled(self) -> bool:
+        """Whether LLM responses are cached"""
+        return self.llm_cache_enabled
+    
+    def get_llm_cache_ttl(self) -> int:
+        """Get the number of seconds a cached LLM response stays valid"""
+        return self.llm_cache_ttl
+    
+    def get_llm_cache_max_entries(self) -> int:
+        """Get the maximum number of cached LLM responses"""
+        return self.llm_cache_max_entries
+    
+    def is_search_cache_enabled(self) -> bool:
+        """Whether SerpAPI results are cached"""
+        return self.search_cache_enabled
+    
+    def get_search_cache_ttl(self) -> int:
+        """Get the number of seconds cached search results stay fresh"""
+        return self.search_cache_ttl
+    
+    def get_search_cache_max_entries(self) -> int:
+        """Get the maximum number of cached search results"""
+        return self.search_cache_max_entries
+    
+    def get_search_cache_max_stale(self) -> int:
+        """Get the number of seconds expired search results are kept as a fallback"""
+        return self.search_cache_max_stale
+    
+    def is_page_cache_enabled(self) -> bool:
+        """Whether fetched pages are cached and revalidated"""
+        return self.page_cache_enabled
+    
+    def get_page_cache_max_bytes(self) -> int:
+        """Get the byte budget of the page cache"""
+        return self.page_cache_max_bytes
+    
     def get_serpapi_credentials(self) -> Optional[str]:
         """Get SerpAPI API key"""
         return self.serpapi_api_key
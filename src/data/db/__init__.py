@@ -2,4 +2,4 @@ import streamlit as st
 from .database import Base, engine, get_db, init_db, SessionLocal, get_db_context
 from src.core.config import logger
 
-__all__ = ["get_db", "init_db"]
\ No newline at end of file
+__all__ = ["get_db", "get_db_context", "init_db"]
\ No newline at end of file
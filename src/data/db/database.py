@@ -1,20 +1,97 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from sqlalchemy.pool import StaticPool
 import os
 from contextlib import contextmanager
-from src.core.config import logger
+from typing import Iterator
+from src.core.config import config, logger
 
 # Create the base class for declarative models
 Base = declarative_base()
 
-# Create engine (using SQLite for simplicity)
-DATABASE_URL = "sqlite:///./learnicity.db"
-engine = create_engine(
+def _configure_sqlite(engine: Engine, busy_timeout: int):
+    """Configure every new SQLite connection of an engine
+
+    WAL lets readers run while a writer commits, the busy timeout makes writers
+    wait for the lock instead of failing with "database is locked", and
+    foreign keys are enforced. Transactions are begun by SQLAlchemy instead of
+    the sqlite3 driver, so write units can take the write lock up front with
+    BEGIN IMMEDIATE rather than failing when a read lock cannot be upgraded.
+    """
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout)}")
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def on_begin(connection):
+        mode = connection.get_execution_options().get("sqlite_begin", "DEFERRED")
+        connection.exec_driver_sql(f"BEGIN {mode}")
+
+def create_db_engine(
+    database_url: str,
+    pool_size: int = 5,
+    max_overflow: int = 10,
+    busy_timeout: int = 5000
+) -> Engine:
+    """Create the engine of a database URL
+
+    SQLite files get a pool of connections (one per concurrent unit of work)
+    configured for concurrent access, in-memory SQLite a single shared
+    connection, and other databases a pre-pinged pool.
+
+    Args:
+        database_url (str): SQLAlchemy database URL
+        pool_size (int): Connections kept open in the pool
+        max_overflow (int): Extra connections opened under load
+        busy_timeout (int): Milliseconds a SQLite writer waits for the lock
+
+    Returns:
+        Engine: The configured engine
+    """
+    url = make_url(database_url)
+
+    if url.get_backend_name() != "sqlite":
+        return create_engine(
+            url,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
+            echo=False
+        )
+
+    if url.database in (None, "", ":memory:"):
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+            echo=False
+        )
+    else:
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False, "timeout": busy_timeout / 1000},
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            echo=False  # Set to True for SQL query logging
+        )
+    _configure_sqlite(engine, busy_timeout)
+    return engine
+
+# Create engine (SQLite by default, DATABASE_URL points it at another database)
+DATABASE_URL = config.get_database_url()
+engine = create_db_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-    echo=False  # Set to True for SQL query logging
+    pool_size=config.get_db_pool_size(),
+    max_overflow=config.get_db_max_overflow(),
+    busy_timeout=config.get_db_busy_timeout()
 )
 
 # Create sessionmaker
@@ -28,6 +105,9 @@ SessionLocal = sessionmaker(
 def init_db():
     """Initialize database tables"""
     try:
+        # Register the models on the metadata
+        from src.data.models import user, deck  # noqa: F401
+
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
     except Exception as e:
@@ -35,8 +115,11 @@ def init_db():
         raise
 
 def get_db() -> Session:
-    """Get database session with automatic closing
-    
+    """Get a new database session
+
+    The caller owns the session and must close it. Prefer get_db_context, which
+    scopes the session to one unit of work.
+
     Returns:
         Session: SQLAlchemy session
     """
@@ -49,15 +132,25 @@ def get_db() -> Session:
         raise
 
 @contextmanager
-def get_db_context():
+def get_db_context(write: bool = False) -> Iterator[Session]:
     """Context manager for database sessions
-    
+
+    Every block is one unit of work: a session checked out of the pool, one
+    transaction committed on success or rolled back on error, and the session
+    closed (its connection returned to the pool) in any case.
+
+    Args:
+        write (bool): Take the SQLite write lock when the transaction begins, so
+            concurrent writers queue on the busy timeout instead of failing
+
     Usage:
         with get_db_context() as db:
             db.query(...)
     """
     db = SessionLocal()
     try:
+        if write and engine.dialect.name == "sqlite":
+            db.connection(execution_options={"sqlite_begin": "IMMEDIATE"})
         yield db
         db.commit()
     except Exception as e:
@@ -0,0 +1,52 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
+from src.data.db.database import Base
+
+class Card(Base):
+    """Flashcard of a deck"""
+    __tablename__ = "cards"
+    __table_args__ = (
+        # Cards are always read by deck, in order
+        Index("ix_cards_deck_position", "deck_id", "position"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    deck_id = Column(String(36), ForeignKey("decks.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    question = Column(Text, nullable=False)
+    answer = Column(Text, nullable=False)
+    source = Column(Text, nullable=False, default="")
+    type = Column(String(10), nullable=False, default="text")
+
+    def to_dict(self) -> dict:
+        """Converts the card instance to the flashcard dictionary format
+        
+        Returns:
+            dict: Flashcard with question, answer, source and type
+        """
+        return {
+            "question": self.question,
+            "answer": self.answer,
+            "source": self.source,
+            "type": self.type
+        }
+    
+    @classmethod
+    def row_from_dict(cls, deck_id: str, position: int, data: dict) -> dict:
+        """Builds the column values of a card from a flashcard dictionary
+        
+        Args:
+            deck_id (str): ID of the deck
+            position (int): Position of the card in the deck
+            data (dict): Flashcard dictionary
+            
+        Returns:
+            dict: Column values, ready for a bulk insert
+        """
+        return {
+            "deck_id": deck_id,
+            "position": position,
+            "question": str(data.get("question", "")),
+            "answer": str(data.get("answer", "")),
+            "source": str(data.get("source", "") or ""),
+            "type": str(data.get("type", "text") or "text")
+        }
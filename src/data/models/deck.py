@@ -0,0 +1,42 @@
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, DateTime, UniqueConstraint
+from sqlalchemy.orm import relationship
+from src.data.db.database import Base
+from src.data.models.card import Card
+from src.data.models.quiz import Quiz
+
+class Deck(Base):
+    """Deck of flashcards generated from a topic or an uploaded file"""
+    __tablename__ = "decks"
+    __table_args__ = (
+        # Lookup index: one deck per source and language
+        UniqueConstraint("source_type", "source_key", "language", name="uq_decks_source"),
+    )
+
+    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    source_type = Column(String(10), nullable=False)  # "topic" or "file"
+    source_key = Column(String(255), nullable=False)  # Normalized topic or SHA-256 of the file
+    language = Column(String(5), nullable=False, default="en")
+    title = Column(String(255), nullable=False, default="")
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    cards = relationship(Card, order_by=Card.position, lazy="selectin")
+    quiz = relationship(Quiz, uselist=False, lazy="selectin")
+
+    def to_dict(self) -> dict:
+        """Converts the deck instance to a dictionary format
+        
+        Returns:
+            dict: Dictionary representation of the deck, with its flashcards and quiz
+        """
+        return {
+            "id": self.id,
+            "source_type": self.source_type,
+            "source_key": self.source_key,
+            "language": self.language,
+            "title": self.title,
+            "created_at": self.created_at,
+            "flashcards": [card.to_dict() for card in self.cards],
+            "quiz": self.quiz.questions if self.quiz else None
+        }
@@ -0,0 +1,25 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey
+from src.data.db.database import Base
+
+class Quiz(Base):
+    """Quiz generated from a deck"""
+    __tablename__ = "quizzes"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    deck_id = Column(String(36), ForeignKey("decks.id", ondelete="CASCADE"), nullable=False, unique=True)
+    questions = Column(JSON, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        """Converts the quiz instance to a dictionary format
+        
+        Returns:
+            dict: Dictionary representation of the quiz
+        """
+        return {
+            "id": self.id,
+            "deck_id": self.deck_id,
+            "questions": self.questions,
+            "created_at": self.created_at
+        }
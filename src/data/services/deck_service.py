@@ -0,0 +1,186 @@
+import hashlib
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select
+
+from src.data.models.deck import Deck
+from src.data.models.card import Card
+from src.data.models.quiz import Quiz
+from src.data.db import get_db_context
+
+from src.core.config import config, logger
+
+
+def normalize_topic(topic: str) -> str:
+    """Normalize a topic so that equivalent searches share a deck
+
+    Args:
+        topic (str): Topic as typed by the user
+
+    Returns:
+        str: Casefolded topic with collapsed whitespace and no surrounding punctuation
+    """
+    topic = unicodedata.normalize("NFKC", topic).casefold()
+    return " ".join(topic.split()).strip(" .,;:!?¿¡\"'")[:255]
+
+
+def hash_file(data: bytes) -> str:
+    """Hash the contents of an uploaded file
+
+    Args:
+        data (bytes): File contents
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+class DeckService:
+    """Stores generated decks and quizzes so they survive reloads and restarts"""
+
+    TOPIC = "topic"
+    FILE = "file"
+
+    def find_deck(self, source_type: str, source_key: str, language: str) -> Optional[Dict[str, Any]]:
+        """Get a stored deck with its flashcards and quiz
+
+        Decks older than DECK_MAX_AGE_DAYS or with fewer than DECK_MIN_CARDS
+        flashcards (for example half-built by failed searches) are not reused, so
+        they are generated again and replaced.
+
+        Args:
+            source_type (str): DeckService.TOPIC or DeckService.FILE
+            source_key (str): Normalized topic or file hash
+            language (str): Language of the deck
+
+        Returns:
+            Optional[Dict[str, Any]]: The deck as a dictionary if found, None otherwise
+        """
+        try:
+            with get_db_context() as db:
+                deck = db.execute(
+                    select(Deck).where(
+                        Deck.source_type == source_type,
+                        Deck.source_key == source_key,
+                        Deck.language == language
+                    )
+                ).scalar_one_or_none()
+                if deck is None or not self.is_reusable(deck):
+                    return None
+                return deck.to_dict()
+        except Exception as e:
+            logger.error(f"Error getting deck: {str(e)}")
+            return None
+
+    def is_reusable(self, deck: Deck) -> bool:
+        """Whether a stored deck is recent and complete enough to be served again"""
+        if len(deck.cards) < config.get_deck_min_cards():
+            logger.info(f"Not reusing deck {deck.id}: only {len(deck.cards)} flashcards")
+            return False
+
+        max_age_days = config.get_deck_max_age_days()
+        if max_age_days:
+            created_at = deck.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            if datetime.now(timezone.utc) - created_at > timedelta(days=max_age_days):
+                logger.info(f"Not reusing deck {deck.id}: older than {max_age_days} days")
+                return False
+        return True
+
+    def find_topic_deck(self, topic: str, language: str) -> Optional[Dict[str, Any]]:
+        """Get the stored deck of a topic, see find_deck"""
+        return self.find_deck(self.TOPIC, normalize_topic(topic), language)
+
+    def find_file_deck(self, file_hash: str, language: str) -> Optional[Dict[str, Any]]:
+        """Get the stored deck of an uploaded file, see find_deck"""
+        return self.find_deck(self.FILE, file_hash, language)
+
+    def save_deck(
+        self,
+        source_type: str,
+        source_key: str,
+        language: str,
+        title: str,
+        flashcards: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Store a deck, replacing the previous deck of the same source
+
+        The deck and all of its cards are written in one transaction, the cards
+        with a single multi-row insert.
+
+        Args:
+            source_type (str): DeckService.TOPIC or DeckService.FILE
+            source_key (str): Normalized topic or file hash
+            language (str): Language of the deck
+            title (str): Title shown for the deck
+            flashcards (List[Dict[str, Any]]): Flashcards in deck order
+
+        Returns:
+            Optional[str]: ID of the stored deck, None if it could not be stored
+        """
+        if not flashcards:
+            return None
+
+        try:
+            with get_db_context(write=True) as db:
+                previous_ids = select(Deck.id).where(
+                    Deck.source_type == source_type,
+                    Deck.source_key == source_key,
+                    Deck.language == language
+                ).scalar_subquery()
+                db.execute(delete(Card).where(Card.deck_id.in_(previous_ids)))
+                db.execute(delete(Quiz).where(Quiz.deck_id.in_(previous_ids)))
+                db.execute(delete(Deck).where(Deck.id.in_(previous_ids)))
+
+                deck = Deck(
+                    source_type=source_type,
+                    source_key=source_key,
+                    language=language,
+                    title=title[:255]
+                )
+                db.add(deck)
+                db.flush()
+
+                db.execute(
+                    insert(Card),
+                    [Card.row_from_dict(deck.id, position, card) for position, card in enumerate(flashcards)]
+                )
+                logger.info(f"Stored deck {deck.id} with {len(flashcards)} flashcards")
+                return deck.id
+        except Exception as e:
+            logger.error(f"Error storing deck: {str(e)}")
+            return None
+
+    def save_topic_deck(self, topic: str, language: str, flashcards: List[Dict[str, Any]]) -> Optional[str]:
+        """Store the deck of a topic, see save_deck"""
+        return self.save_deck(self.TOPIC, normalize_topic(topic), language, topic, flashcards)
+
+    def save_file_deck(self, file_hash: str, file_name: str, language: str, flashcards: List[Dict[str, Any]]) -> Optional[str]:
+        """Store the deck of an uploaded file, see save_deck"""
+        return self.save_deck(self.FILE, file_hash, language, file_name, flashcards)
+
+    def save_quiz(self, deck_id: str, questions: List[Dict[str, Any]]) -> bool:
+        """Store the quiz of a deck, replacing its previous quiz
+
+        Args:
+            deck_id (str): ID of the deck
+            questions (List[Dict[str, Any]]): Quiz questions
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not questions:
+            return False
+
+        try:
+            with get_db_context(write=True) as db:
+                db.execute(delete(Quiz).where(Quiz.deck_id == deck_id))
+                db.add(Quiz(deck_id=deck_id, questions=questions))
+            return True
+        except Exception as e:
+            logger.error(f"Error storing quiz: {str(e)}")
+            return False
@@ -1,14 +1,13 @@
 from typing import Optional
 
 from src.data.models.user import User
-from src.data.db import get_db
+from src.data.db import get_db_context
 
 from src.core.config import logger
 
 
 class UserService:
-    def __init__(self):
-        self.db = get_db()
+    """User operations, each one running in its own unit of work"""
 
     def create_user(self) -> User:
         """Create a new user in the database
@@ -17,13 +16,12 @@ class UserService:
             User: The created user instance
         """
         try:
-            user = User()
-            self.db.add(user)
-            self.db.commit()
-            self.db.refresh(user)
-            return user
+            with get_db_context(write=True) as db:
+                user = User()
+                db.add(user)
+                db.flush()
+                return user
         except Exception as e:
-            self.db.rollback()
             logger.error(f"Error creating user: {str(e)}")
             raise
 
@@ -37,7 +35,8 @@ class UserService:
             Optional[User]: The user if found, None otherwise
         """
         try:
-            return self.db.query(User).filter(User.id == user_id).first()
+            with get_db_context() as db:
+                return db.query(User).filter(User.id == user_id).first()
         except Exception as e:
             logger.error(f"Error getting user: {str(e)}")
             return None
@@ -52,13 +51,12 @@ class UserService:
             bool: True if successful, False otherwise
         """
         try:
-            user = self.db.query(User).filter(User.id == user_id).first()
-            if user:
-                self.db.delete(user)
-                self.db.commit()
-                return True
-            return False
+            with get_db_context(write=True) as db:
+                user = db.query(User).filter(User.id == user_id).first()
+                if user:
+                    db.delete(user)
+                    return True
+                return False
         except Exception as e:
-            self.db.rollback()
             logger.error(f"Error deleting user: {str(e)}")
             return False
@@ -0,0 +1,78 @@
+"""Persistent LLM response cache shared across server processes"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+from src.core.config import config, logger
+from src.llm.cache.sqlite_store import SQLiteStore
+
+
+class SQLiteLLMCache(BaseCache):
+    """LangChain cache storing chat model responses in a SQLiteStore.
+
+    LangChain calls the cache with the serialized messages as ``prompt`` and the
+    model parameters (model name, temperature, max_tokens, ...) as ``llm_string``,
+    so both are part of the key.
+    """
+
+    def __init__(self, store: SQLiteStore):
+        """Initialize the cache on top of a store"""
+        self.store = store
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        """Build the entry key from the prompt and model parameters"""
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Look up the cached generations for a prompt"""
+        try:
+            value = self.store.get(self._key(prompt, llm_string))
+            if value is None:
+                return None
+            return [loads(generation) for generation in json.loads(value)]
+        except Exception as e:
+            logger.warning(f"Error reading LLM cache: {str(e)}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations returned for a prompt"""
+        try:
+            value = json.dumps([dumps(generation) for generation in return_val])
+            self.store.set(self._key(prompt, llm_string), value.encode("utf-8"))
+        except Exception as e:
+            logger.warning(f"Error writing LLM cache: {str(e)}")
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every cached response"""
+        self.store.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and cache size"""
+        return self.store.stats()
+
+
+_llm_cache: Optional[SQLiteLLMCache] = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> SQLiteLLMCache:
+    """Get the process-wide LLM response cache, creating it on first use"""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            store = SQLiteStore(
+                path=os.path.join(config.get_cache_dir(), "llm_cache.db"),
+                table="llm_responses",
+                ttl=config.get_llm_cache_ttl(),
+                max_entries=config.get_llm_cache_max_entries()
+            )
+            _llm_cache = SQLiteLLMCache(store)
+            logger.info(f"LLM response cache enabled at {store.path}")
+        return _llm_cache
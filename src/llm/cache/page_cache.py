@@ -0,0 +1,80 @@
+"""On-disk cache of fetched pages revalidated with conditional requests"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from src.core.config import config
+from src.llm.cache.sqlite_store import SQLiteStore
+
+
+class PageCache:
+    """Cache of page bodies with their ETag and Last-Modified validators.
+
+    Entries never expire on their own: the fetcher revalidates them with
+    If-None-Match / If-Modified-Since and only downloads the body again when the
+    server does not answer 304. The store evicts least recently used pages once
+    the byte budget is exceeded. Pages without validators are not cached.
+    """
+
+    def __init__(self, store: SQLiteStore):
+        """Initialize the cache on top of a store"""
+        self.store = store
+
+    @staticmethod
+    def _key(url: str) -> str:
+        """Build the entry key from the requested URL"""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get the cached page of a URL, including its validators"""
+        value = self.store.get(self._key(url))
+        return json.loads(value) if value is not None else None
+
+    def put(self, url: str, page: Dict[str, Any], etag: Optional[str], last_modified: Optional[str]):
+        """Store a fetched page with its validators
+
+        Args:
+            url (str): Requested URL
+            page (Dict[str, Any]): Page returned by the fetcher
+            etag (Optional[str]): ETag response header
+            last_modified (Optional[str]): Last-Modified response header
+        """
+        if not etag and not last_modified:
+            return
+        entry = dict(page, etag=etag, last_modified=last_modified)
+        self.store.set(self._key(url), json.dumps(entry).encode("utf-8"))
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Build the revalidation headers for a cached page"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and cache size"""
+        return self.store.stats()
+
+
+_page_cache: Optional[PageCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Get the process-wide page cache, creating it on first use"""
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            store = SQLiteStore(
+                path=os.path.join(config.get_cache_dir(), "page_cache.db"),
+                table="pages",
+                max_bytes=config.get_page_cache_max_bytes()
+            )
+            _page_cache = PageCache(store)
+        return _page_cache
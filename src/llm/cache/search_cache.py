@@ -0,0 +1,110 @@
+"""SerpAPI results cache shared across server processes"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+
+from langchain_community.utilities import SerpAPIWrapper
+
+from src.core.config import config, logger
+from src.llm.cache.sqlite_store import SQLiteStore
+
+
+class SearchResultCache:
+    """Cache of SerpAPI responses keyed by engine, query, language and result count.
+
+    Fresh entries are served without calling SerpAPI. When SerpAPI fails, an entry
+    past its TTL is served instead as long as it is still kept by the store.
+    """
+
+    KEY_PARAMS = ("engine", "hl", "num")
+
+    def __init__(self, store: SQLiteStore):
+        """Initialize the cache on top of a store"""
+        self.store = store
+
+    @classmethod
+    def _key(cls, params: Dict[str, Any], query: str) -> str:
+        """Build the entry key from the search parameters and the query"""
+        key_data = {name: params.get(name) for name in cls.KEY_PARAMS}
+        key_data["q"] = query.strip().lower()
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def results(self, search: SerpAPIWrapper, query: str) -> Dict[str, Any]:
+        """Get the SerpAPI results for a query, using the cache when possible
+
+        Args:
+            search (SerpAPIWrapper): Wrapper holding the engine parameters
+            query (str): Search query
+
+        Returns:
+            Dict[str, Any]: Raw SerpAPI response
+        """
+        key = self._key(search.params, query)
+
+        cached = self.store.get(key)
+        if cached is not None:
+            return json.loads(cached)
+
+        try:
+            results = search.results(query)
+            if "error" in results:
+                raise ValueError(results["error"])
+        except Exception as e:
+            stale = self.store.get(key, allow_stale=True)
+            if stale is None:
+                raise
+            logger.warning(f"Search failed for query '{query}', serving stale results: {str(e)}")
+            return json.loads(stale)
+
+        self.store.set(key, json.dumps(results).encode("utf-8"))
+        return results
+
+    async def aresults(self, search: SerpAPIWrapper, query: str) -> Dict[str, Any]:
+        """Async version of results, SerpAPI is called with aiohttp and the store on a worker thread"""
+        key = self._key(search.params, query)
+
+        cached = await asyncio.to_thread(self.store.get, key)
+        if cached is not None:
+            return json.loads(cached)
+
+        try:
+            results = await search.aresults(query)
+            if "error" in results:
+                raise ValueError(results["error"])
+        except Exception as e:
+            stale = await asyncio.to_thread(self.store.get, key, allow_stale=True)
+            if stale is None:
+                raise
+            logger.warning(f"Search failed for query '{query}', serving stale results: {str(e)}")
+            return json.loads(stale)
+
+        await asyncio.to_thread(self.store.set, key, json.dumps(results).encode("utf-8"))
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and cache size"""
+        return self.store.stats()
+
+
+_search_cache: Optional[SearchResultCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchResultCache:
+    """Get the process-wide search results cache, creating it on first use"""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            store = SQLiteStore(
+                path=os.path.join(config.get_cache_dir(), "search_cache.db"),
+                table="search_results",
+                ttl=config.get_search_cache_ttl(),
+                max_entries=config.get_search_cache_max_entries(),
+                max_stale=config.get_search_cache_max_stale()
+            )
+            _search_cache = SearchResultCache(store)
+        return _search_cache
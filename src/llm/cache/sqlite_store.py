@@ -0,0 +1,216 @@
+"""SQLite backed key-value store shared by the response caches"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class SQLiteStore:
+    """Key-value store in a single SQLite table with TTL and LRU eviction.
+
+    The database file can be shared by several server processes: it runs in WAL
+    mode and every thread keeps its own connection, closed once the thread has
+    exited or the store is closed. Entries older than ``ttl`` are considered
+    stale; they are kept for ``max_stale`` more seconds so callers can still fall
+    back to them, then removed. When ``max_entries`` or ``max_bytes`` is exceeded
+    the least recently used entries are evicted. Reads only record the access
+    time once it is older than ``touch_interval``, so cache hits rarely write.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_stale: float = 0,
+        touch_interval: float = 60
+    ):
+        """Open (and create if needed) the store
+
+        Args:
+            path (str): Path of the SQLite database file
+            table (str): Table holding the entries of this store
+            ttl (Optional[float]): Seconds an entry stays fresh, None for no expiry
+            max_entries (Optional[int]): Maximum number of entries kept
+            max_bytes (Optional[int]): Maximum total size of the stored values
+            max_stale (float): Seconds a stale entry is kept after its TTL
+            touch_interval (float): Seconds before a read records the access time
+                of an entry again, the resolution of the LRU order
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_stale = max_stale
+        self.touch_interval = touch_interval
+
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._stale_hits = 0
+
+        self._create_table()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get the connection of the current thread, opening it on first use"""
+        thread = threading.current_thread()
+        with self._lock:
+            connection = self._connections.get(thread)
+        if connection is not None:
+            return connection
+
+        # Only this thread uses the connection, but close() may run on another one
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            finished = [other for other in self._connections if not other.is_alive()]
+            for other in finished:
+                self._connections.pop(other).close()
+            self._connections[thread] = connection
+        return connection
+
+    def close(self):
+        """Close the connections of every thread, the next call opens new ones"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for connection in connections:
+            connection.close()
+
+    def _create_table(self):
+        """Create the entries table and its LRU index"""
+        connection = self._connection()
+        connection.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        connection.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_{self.table}_accessed_at ON {self.table} (accessed_at)"
+        )
+
+    def _count(self, counter: str):
+        """Increment one of the hit/miss counters"""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def is_stale(self, created_at: float) -> bool:
+        """Whether an entry created at the given time is past its TTL"""
+        return self.ttl is not None and time.time() - created_at > self.ttl
+
+    def get_entry(self, key: str, allow_stale: bool = False) -> Optional[Tuple[bytes, float]]:
+        """Get a value and its creation time
+
+        Args:
+            key (str): Entry key
+            allow_stale (bool): Return the entry even if it is past its TTL
+
+        Returns:
+            Optional[Tuple[bytes, float]]: Value and creation timestamp, None on a miss
+        """
+        connection = self._connection()
+        row = connection.execute(
+            f"SELECT value, created_at, accessed_at FROM {self.table} WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None or (self.is_stale(row[1]) and not allow_stale):
+            self._count("_misses")
+            return None
+
+        self._count("_stale_hits" if self.is_stale(row[1]) else "_hits")
+        now = time.time()
+        if now - row[2] >= self.touch_interval:
+            connection.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return bytes(row[0]), row[1]
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[bytes]:
+        """Get a value, None if it is missing or stale"""
+        entry = self.get_entry(key, allow_stale=allow_stale)
+        return entry[0] if entry else None
+
+    def set(self, key: str, value: bytes):
+        """Insert or replace a value and evict entries over the limits"""
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            f"""INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?)""",
+            (key, value, len(value), now, now)
+        )
+        self.evict()
+
+    def delete(self, key: str):
+        """Remove a single entry"""
+        self._connection().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self):
+        """Remove every entry"""
+        self._connection().execute(f"DELETE FROM {self.table}")
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones over the limits"""
+        connection = self._connection()
+
+        if self.ttl is not None:
+            connection.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?",
+                (time.time() - self.ttl - self.max_stale,)
+            )
+
+        if self.max_entries is not None:
+            connection.execute(
+                f"""DELETE FROM {self.table} WHERE key IN (
+                    SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+
+        if self.max_bytes is not None:
+            total = connection.execute(
+                f"SELECT COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                evicted = []
+                rows = connection.execute(
+                    f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC"
+                )
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    evicted.append((key,))
+                    total -= size
+                connection.executemany(f"DELETE FROM {self.table} WHERE key = ?", evicted)
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss counters of this process and the store size"""
+        entries, size = self._connection().execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "stale_hits": self._stale_hits,
+                "misses": self._misses,
+                "entries": entries,
+                "bytes": size
+            }
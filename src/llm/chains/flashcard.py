@@ -1,10 +1,20 @@
-from typing import List, Dict, Any, Optional
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
 from src.core.config import config, logger
-from src.llm.providers.llama import get_openai_chat_model
+from src.llm.providers.llama import get_openai_chat_model, with_json_mode
+from src.llm.chains.repair import RepairChain
+from src.llm.parsers.json_repair import needs_repair
 from src.llm.parsers.flashcard_parser import parse_flashcards
+from src.llm.parsers.structured_parser import parse_structured_items, validate_items
+from src.llm.parsers.schemas import Flashcard
+from src.llm.parsers.json_stream import JSONStreamExtractor
+from src.llm.text.similarity import NearDuplicateFilter
+from src.llm.text.tokens import count_tokens
 
 from src.llm.prompts.fcard_prompts import (
     web_flashcard_system_template,
@@ -13,6 +23,54 @@ from src.llm.prompts.fcard_prompts import (
     image_flashcard_human_template
 )
 
+# Structure of a flashcard response, shown to the repair model
+FLASHCARDS_FORMAT = (
+    '{"flashcards": [{"question": "...", "answer": "...", "source": "...", "type": "text" or "image"}]}'
+)
+
+def format_previous_flashcards(
+    flashcards: Optional[List[Dict[str, Any]]],
+    max_tokens: Optional[int] = None
+) -> str:
+    """
+    Format previous flashcards as a compact list of already covered questions.
+
+    Only the question stems are kept, deduplicated, newest first until the token
+    budget is spent, so the prompt stays bounded however large the deck grows.
+
+    Args:
+        flashcards: Previously generated flashcards
+        max_tokens: Token budget of the list, defaults to FLASHCARD_CONTEXT_MAX_TOKENS
+
+    Returns:
+        One "- question" line per covered question, in generation order
+    """
+    if not flashcards:
+        return "None"
+
+    if max_tokens is None:
+        max_tokens = config.get_flashcard_context_max_tokens()
+
+    seen = set()
+    lines = []
+    used_tokens = 0
+    for card in reversed(flashcards):
+        question = " ".join(str(card.get("question", "")).split())
+        key = question.lower().rstrip("?.! ")
+        if not key or key in seen:
+            continue
+
+        line = f"- {question}"
+        line_tokens = count_tokens(line) + 1
+        if used_tokens + line_tokens > max_tokens:
+            break
+
+        seen.add(key)
+        lines.append(line)
+        used_tokens += line_tokens
+
+    return "\n".join(reversed(lines)) if lines else "None"
+
 class FlashcardChain():
     """Chain for generating educational flashcards from web content and images."""
 
@@ -29,13 +87,17 @@ class FlashcardChain():
 
     def setup_chains(self):
         """Setup the web and image flashcard generation chains."""
+        # Structured output requests JSON mode and validates every flashcard
+        self.structured_output = config.is_structured_output_enabled()
+
         # Web content flashcard chain
         prompt_web_chain = ChatPromptTemplate.from_messages([
             ("system", web_flashcard_system_template),
             ("human", web_flashcard_human_template)
         ])
 
-        self.web_chain = prompt_web_chain | self.llm | StrOutputParser()
+        web_llm = with_json_mode(self.llm) if self.structured_output else self.llm
+        self.web_chain = prompt_web_chain | web_llm | StrOutputParser()
 
         # Image content flashcard chain
         prompt_image_chain = ChatPromptTemplate.from_messages([
@@ -45,6 +107,38 @@ class FlashcardChain():
 
         self.image_chain = prompt_image_chain | self.image_llm | StrOutputParser()
 
+        # Malformed responses are repaired instead of discarded
+        self.repair_chain = RepairChain()
+
+    def parse_web_response(self, result: str) -> List[Dict[str, Any]]:
+        """
+        Parse the flashcards of a web flashcard response.
+
+        Args:
+            result: Raw model response
+
+        Returns:
+            List of flashcard dictionaries, empty if none could be parsed
+        """
+        if self.structured_output:
+            return parse_structured_items(result, "flashcards", Flashcard)
+        return parse_flashcards(result)
+
+    def parse_image_response(self, result: str) -> List[Dict[str, Any]]:
+        """
+        Parse the flashcard of an image flashcard response.
+
+        Args:
+            result: Raw model response
+
+        Returns:
+            List with at most one flashcard dictionary
+        """
+        flashcards = parse_flashcards(result, is_image=True)
+        if self.structured_output:
+            flashcards = validate_items(flashcards, Flashcard)
+        return flashcards
+
     def create_web_flashcards(
         self,
         content: str,
@@ -66,8 +160,7 @@ class FlashcardChain():
         """
         try:
             # Format previous flashcards for prompt
-            prev_cards_str = str(
-                previous_flashcards) if previous_flashcards else "[]"
+            prev_cards_str = format_previous_flashcards(previous_flashcards)
 
             # Generate flashcards using the messages
             result = self.web_chain.invoke({
@@ -77,11 +170,40 @@ class FlashcardChain():
                 "content": content
             })
 
-            # Parse the JSON response
-            flashcards = parse_flashcards(result)
-            if not flashcards:
-                logger.error("Failed to parse flashcards from response")
-                return []
+            # Parse the JSON response, repairing it if it is malformed
+            flashcards = self.parse_web_response(result)
+            if not flashcards and needs_repair(result, "flashcards"):
+                logger.warning("Failed to parse flashcards from response, repairing it")
+                flashcards = self.repair_chain.repair(result, self.parse_web_response, FLASHCARDS_FORMAT)
+
+            return flashcards
+
+        except Exception as e:
+            logger.error(f"Error creating web flashcards: {str(e)}")
+            return []
+
+    async def acreate_web_flashcards(
+        self,
+        content: str,
+        title: str,
+        link: str,
+        previous_flashcards: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of create_web_flashcards.
+        """
+        try:
+            result = await self.web_chain.ainvoke({
+                "title": title,
+                "link": link,
+                "previous_flashcards": format_previous_flashcards(previous_flashcards),
+                "content": content
+            })
+
+            flashcards = self.parse_web_response(result)
+            if not flashcards and needs_repair(result, "flashcards"):
+                logger.warning("Failed to parse flashcards from response, repairing it")
+                flashcards = await self.repair_chain.arepair(result, self.parse_web_response, FLASHCARDS_FORMAT)
 
             return flashcards
 
@@ -89,6 +211,58 @@ class FlashcardChain():
             logger.error(f"Error creating web flashcards: {str(e)}")
             return []
 
+    def stream_web_flashcards(
+        self,
+        content: str,
+        title: str,
+        link: str,
+        previous_flashcards: Optional[List[Dict[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate flashcards from web content, yielding each one as soon as the model
+        closes its JSON object.
+
+        Args:
+            content: The web content to create flashcards from
+            title: The title of the web page
+            link: The URL of the web page
+            previous_flashcards: List of previously generated flashcards to avoid duplication
+
+        Yields:
+            Flashcard dictionaries
+        """
+        # Cached responses are only served to invoke, so keep using it when caching
+        if self.llm.cache is not None:
+            yield from self.create_web_flashcards(content, title, link, previous_flashcards)
+            return
+
+        try:
+            extractor = JSONStreamExtractor(item_keys=("flashcards",))
+            chunks = []
+            count = 0
+
+            for chunk in self.web_chain.stream({
+                "title": title,
+                "link": link,
+                "previous_flashcards": format_previous_flashcards(previous_flashcards),
+                "content": content
+            }):
+                chunks.append(chunk)
+                items = extractor.feed(chunk)
+                if self.structured_output:
+                    items = validate_items(items, Flashcard)
+                for flashcard in items:
+                    count += 1
+                    yield flashcard
+
+            result = "".join(chunks)
+            if not count and needs_repair(result, "flashcards"):
+                logger.warning("Failed to parse flashcards from response, repairing it")
+                yield from self.repair_chain.repair(result, self.parse_web_response, FLASHCARDS_FORMAT)
+
+        except Exception as e:
+            logger.error(f"Error streaming web flashcards: {str(e)}")
+
     def create_image_flashcards(
         self,
         initial_query: str,
@@ -119,11 +293,39 @@ class FlashcardChain():
                 "image_url": image_url
             })
 
-            # Parse the JSON response
-            flashcards = parse_flashcards(result, is_image=True)
-            if not flashcards:
-                logger.error("Failed to parse flashcards from response")
-                return []
+            # Parse the JSON response, repairing it if it is malformed
+            flashcards = self.parse_image_response(result)
+            if not flashcards and needs_repair(result, "flashcards"):
+                logger.warning("Failed to parse flashcards from response, repairing it")
+                flashcards = self.repair_chain.repair(result, self.parse_image_response, FLASHCARDS_FORMAT)
+
+            return flashcards
+
+        except Exception as e:
+            logger.error(f"Error creating image flashcards: {str(e)}")
+            return []
+
+    async def acreate_image_flashcards(
+        self,
+        initial_query: str,
+        image_url: str,
+        image_description: str,
+        previous_flashcards: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of create_image_flashcards.
+        """
+        try:
+            result = await self.image_chain.ainvoke({
+                "initial_query": initial_query,
+                "image_description": image_description,
+                "image_url": image_url
+            })
+
+            flashcards = self.parse_image_response(result)
+            if not flashcards and needs_repair(result, "flashcards"):
+                logger.warning("Failed to parse flashcards from response, repairing it")
+                flashcards = await self.repair_chain.arepair(result, self.parse_image_response, FLASHCARDS_FORMAT)
 
             return flashcards
 
@@ -144,52 +346,273 @@ class FlashcardChain():
         required_fields = {"question", "answer", "source", "type"}
         return all(field in flashcard for field in required_fields)
 
-    def process_search_results(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def create_result_flashcards(
+        self,
+        result: Dict[str, Any],
+        previous_flashcards: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate the flashcards of a single search result.
+
+        Args:
+            result: Search result from SearchChain
+            previous_flashcards: Flashcards generated so far, to avoid duplication
+
+        Returns:
+            List of flashcard dictionaries
+        """
+        initial_query = result.get("query")
+        query_type = result.get("type")
+        result_data = result.get("result", {})
+
+        if not result_data:
+            return []
+
+        if query_type == "text":
+            # Generate flashcards from web content
+            return self.create_web_flashcards(
+                content=result_data.get("content", ""),
+                title=result_data.get("title", ""),
+                link=result_data.get("link", ""),
+                previous_flashcards=previous_flashcards
+            )
+
+        if query_type == "image":
+            # Generate flashcards from image content
+            # Assuming image URL is in link field
+            image_url = result_data.get("link")
+            if image_url:
+                return self.create_image_flashcards(
+                    initial_query=initial_query,
+                    image_url=image_url,
+                    image_description=result_data.get("title", ""),
+                    previous_flashcards=[]
+                )
+
+        return []
+
+    async def acreate_result_flashcards(
+        self,
+        result: Dict[str, Any],
+        previous_flashcards: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of create_result_flashcards.
+        """
+        initial_query = result.get("query")
+        query_type = result.get("type")
+        result_data = result.get("result", {})
+
+        if not result_data:
+            return []
+
+        if query_type == "text":
+            return await self.acreate_web_flashcards(
+                content=result_data.get("content", ""),
+                title=result_data.get("title", ""),
+                link=result_data.get("link", ""),
+                previous_flashcards=previous_flashcards
+            )
+
+        if query_type == "image":
+            image_url = result_data.get("link")
+            if image_url:
+                return await self.acreate_image_flashcards(
+                    initial_query=initial_query,
+                    image_url=image_url,
+                    image_description=result_data.get("title", ""),
+                    previous_flashcards=[]
+                )
+
+        return []
+
+    def stream_result_flashcards(
+        self,
+        result: Dict[str, Any],
+        previous_flashcards: List[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate the flashcards of a single search result, streaming web flashcards.
+
+        Args:
+            result: Search result from SearchChain
+            previous_flashcards: Flashcards generated so far, to avoid duplication
+
+        Yields:
+            Flashcard dictionaries
+        """
+        result_data = result.get("result", {})
+        if result.get("type") == "text" and result_data:
+            yield from self.stream_web_flashcards(
+                content=result_data.get("content", ""),
+                title=result_data.get("title", ""),
+                link=result_data.get("link", ""),
+                previous_flashcards=previous_flashcards
+            )
+        else:
+            yield from self.create_result_flashcards(result, previous_flashcards)
+
+    def stream_search_results(
+        self,
+        results: Iterable[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate flashcards from search results, yielding them as each result is done.
+
+        Results may come from a generator such as SearchChain.iter_queries, so the
+        first flashcards are available while later searches are still running.
+
+        Sequentially, web flashcards are streamed token by token and every call
+        receives the flashcards generated so far to avoid duplication. With a
+        concurrency above one, results are generated in parallel without that
+        context and near-duplicate cards are removed afterwards by a deterministic
+        similarity filter.
+
+        Args:
+            results: Search results from SearchChain
+            max_concurrency: Maximum results processed in parallel, defaults to
+                FLASHCARD_MAX_CONCURRENCY
+
+        Yields:
+            Flashcard dictionaries
+        """
+        if max_concurrency is None:
+            max_concurrency = config.get_flashcard_max_concurrency()
+
+        if max_concurrency > 1:
+            yield from self.stream_search_results_concurrently(results, max_concurrency)
+            return
+
+        all_flashcards = []
+
+        try:
+            for result in results:
+                previous_flashcards = list(all_flashcards)
+                for flashcard in self.stream_result_flashcards(result, previous_flashcards):
+                    all_flashcards.append(flashcard)
+                    yield flashcard
+
+        except Exception as e:
+            logger.error(f"Error processing search results: {str(e)}")
+
+    def stream_search_results_concurrently(
+        self,
+        results: Iterable[Dict[str, Any]],
+        max_concurrency: int
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate flashcards for all results in parallel and drop near-duplicates.
+
+        Flashcards are yielded in the order the results were received, so the
+        duplicate filter always sees the same sequence and keeps the same cards.
+
+        Args:
+            results: Search results from SearchChain
+            max_concurrency: Maximum results processed in parallel
+
+        Yields:
+            Flashcard dictionaries
+        """
+        duplicate_filter = NearDuplicateFilter(threshold=config.get_flashcard_dedup_threshold())
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="flashcards") as executor:
+            try:
+                for result in results:
+                    pending.append(executor.submit(self.create_result_flashcards, result, []))
+                    # Yield the results at the head of the queue that are already done
+                    while pending and pending[0].done():
+                        yield from self.drop_duplicates(duplicate_filter, pending.popleft().result())
+
+                while pending:
+                    yield from self.drop_duplicates(duplicate_filter, pending.popleft().result())
+
+            except Exception as e:
+                logger.error(f"Error processing search results: {str(e)}")
+
+    def process_search_results(
+        self,
+        results: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Process search results and generate appropriate flashcards.
 
         Args:
             results: List of search results from SearchChain
+            max_concurrency: Maximum results processed in parallel, defaults to
+                FLASHCARD_MAX_CONCURRENCY
 
         Returns:
             List of all generated flashcards
         """
-        all_flashcards = []
+        return list(self.stream_search_results(results, max_concurrency))
+
+    async def aprocess_search_results(
+        self,
+        results: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async version of process_search_results.
+
+        With a concurrency above one, results run as concurrent tasks and
+        near-duplicates are dropped in result order, as in
+        stream_search_results_concurrently. Otherwise results are processed one
+        after the other, each call receiving the flashcards generated so far.
+
+        Args:
+            results: List of search results from SearchChain
+            max_concurrency: Maximum results processed in parallel, defaults to
+                FLASHCARD_MAX_CONCURRENCY
+
+        Returns:
+            List of all generated flashcards
+        """
+        if max_concurrency is None:
+            max_concurrency = config.get_flashcard_max_concurrency()
 
+        all_flashcards = []
         try:
-            for result in results:
-                initial_query = result.get("query")
-                query_type = result.get("type")
-                result_data = result.get("result", {})
-
-                if not result_data:
-                    continue
-
-                if query_type == "text":
-                    # Generate flashcards from web content
-                    flashcards = self.create_web_flashcards(
-                        content=result_data.get("content", ""),
-                        title=result_data.get("title", ""),
-                        link=result_data.get("link", ""),
-                        previous_flashcards=all_flashcards
-                    )
-                    all_flashcards.extend(flashcards)
-
-                elif query_type == "image":
-                    # Generate flashcards from image content
-                    # Assuming image URL is in link field
-                    image_url = result_data.get("link")
-                    if image_url:
-                        flashcards = self.create_image_flashcards(
-                            initial_query=initial_query,
-                            image_url=image_url,
-                            image_description=result_data.get("title", ""),
-                            previous_flashcards=[]
-                        )
-                        all_flashcards.extend(flashcards)
-
-            return all_flashcards
+            if max_concurrency <= 1:
+                for result in results:
+                    all_flashcards += await self.acreate_result_flashcards(result, list(all_flashcards))
+                return all_flashcards
+
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def create(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await self.acreate_result_flashcards(result, [])
+
+            duplicate_filter = NearDuplicateFilter(threshold=config.get_flashcard_dedup_threshold())
+            for flashcards in await asyncio.gather(*(create(result) for result in results)):
+                all_flashcards += self.drop_duplicates(duplicate_filter, flashcards)
 
         except Exception as e:
             logger.error(f"Error processing search results: {str(e)}")
-            return all_flashcards
+
+        return all_flashcards
+
+    def drop_duplicates(
+        self,
+        duplicate_filter: NearDuplicateFilter,
+        flashcards: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Drop the flashcards near-duplicate to the ones the filter already kept.
+
+        Args:
+            duplicate_filter: Filter holding the flashcards kept so far
+            flashcards: Flashcards of the next result
+
+        Returns:
+            The flashcards that were kept
+        """
+        texts = [f"{card.get('question', '')} {card.get('answer', '')}" for card in flashcards]
+        keep = duplicate_filter.filter(texts)
+        dropped = keep.count(False)
+        if dropped:
+            logger.info(f"Dropped {dropped} near-duplicate flashcards")
+        return [card for card, kept in zip(flashcards, keep) if kept]
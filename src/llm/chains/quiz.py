@@ -1,21 +1,40 @@
 """Quiz generation chain for creating quizzes from flashcards"""
 
-from typing import List, Dict, Any
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
 from src.core.config import config, logger
-from src.llm.providers.llama import get_openai_chat_model
+from src.llm.providers.llama import get_openai_chat_model, with_json_mode
+from src.llm.chains.repair import RepairChain
+from src.llm.parsers.json_repair import needs_repair
 from src.llm.parsers.quiz_parser import parse_quiz
+from src.llm.parsers.structured_parser import parse_structured_items
+from src.llm.parsers.schemas import QuizQuestion
+from src.llm.text.similarity import NearDuplicateFilter
+from src.llm.text.tokens import count_tokens, get_input_budget, truncate_to_tokens
 
 from src.llm.prompts.quiz_prompts import (
     quiz_system_template,
     quiz_human_template
 )
 
+# Structure of a quiz response, shown to the repair model
+QUIZ_FORMAT = (
+    '{"quiz": [{"question": "...", "options": ["...", "...", "...", "..."], '
+    '"correct_answer": 0, "explanation": "...", "image_url": "... (image questions only)"}]}'
+)
+
 class QuizChain:
     """Chain for generating quizzes from flashcards"""
     
+    # Extra questions requested per shard, to absorb duplicates and invalid questions
+    SHARD_SPARE_QUESTIONS = 1
+    
+    # Completion tokens of a shard, which only writes a few questions
+    SHARD_MAX_TOKENS = 2048
+    
     def __init__(self):
         """Initialize the quiz generation chain"""
         self.setup_llm()
@@ -24,6 +43,7 @@ class QuizChain:
     def setup_llm(self):
         """Initialize LLM with configuration"""
         self.llm = get_openai_chat_model("Meta-Llama-3.1-8B-Instruct", max_tokens=4096)
+        self.shard_llm = get_openai_chat_model("Meta-Llama-3.1-8B-Instruct", max_tokens=self.SHARD_MAX_TOKENS)
         
     def setup_chain(self):
         """Setup the quiz generation chain"""
@@ -32,13 +52,51 @@ class QuizChain:
             ("human", quiz_human_template)
         ])
         
-        self.chain = prompt | self.llm | StrOutputParser()
+        # Structured output requests JSON mode and validates every question
+        self.structured_output = config.is_structured_output_enabled()
+        llm = with_json_mode(self.llm) if self.structured_output else self.llm
+        self.chain = prompt | llm | StrOutputParser()
+        
+        # Sharded generation leaves more of the context to the flashcards
+        shard_llm = with_json_mode(self.shard_llm) if self.structured_output else self.shard_llm
+        self.shard_chain = prompt | shard_llm | StrOutputParser()
+        self.shard_input_tokens = get_input_budget(
+            self.shard_llm.model_name,
+            self.SHARD_MAX_TOKENS,
+            quiz_system_template + quiz_human_template
+        )
         
-    def create_quiz(self, flashcards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # A failed 4096-token generation is repaired instead of discarded
+        self.repair_chain = RepairChain()
+        
+    def parse_response(self, result: str) -> List[Dict[str, Any]]:
+        """Parse the questions of a quiz response
+        
+        Args:
+            result (str): Raw model response
+            
+        Returns:
+            List[Dict[str, Any]]: Quiz questions, empty if none could be parsed
+        """
+        if self.structured_output:
+            return parse_structured_items(result, "quiz", QuizQuestion)
+        return parse_quiz(result)
+        
+    def create_quiz(
+        self,
+        flashcards: List[Dict[str, Any]],
+        num_questions: Optional[int] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> List[Dict[str, Any]]:
         """Generate a quiz from flashcards
         
+        Decks larger than QUIZ_SHARD_SIZE are generated in shards, see create_sharded_quiz.
+        
         Args:
             flashcards (List[Dict[str, Any]]): List of flashcard dictionaries
+            num_questions (Optional[int]): Number of questions, defaults to QUIZ_NUM_QUESTIONS
+            is_cancelled (Optional[Callable[[], bool]]): Checked before every LLM call
+                and parse, the generation stops with an empty quiz once it returns True
             
         Returns:
             List[Dict[str, Any]]: List of quiz questions. Each question has:
@@ -48,23 +106,252 @@ class QuizChain:
                 - explanation: str
                 - image_url: Optional[str]
         """
+        if num_questions is None:
+            num_questions = config.get_quiz_num_questions()
+        
+        shard_size = config.get_quiz_shard_size()
+        if shard_size and len(flashcards) > shard_size:
+            return self.create_sharded_quiz(flashcards, num_questions, is_cancelled)
+        
         try:
-            # Convert flashcards to string representation
-            flashcards_str = str(flashcards)
+            if is_cancelled and is_cancelled():
+                return []
             
             # Generate quiz using LLM
             result = self.chain.invoke({
-                "flashcards": flashcards_str
+                "flashcards": str(flashcards),
+                "num_questions": num_questions
             })
-            
-            # Parse the quiz using dedicated parser
-            quiz = parse_quiz(result)
-            if not quiz:
-                logger.error("Failed to parse quiz from response")
+            if is_cancelled and is_cancelled():
                 return []
-                
-            return quiz
+            
+            quiz = self.parse_result(result)
+            return self.merge_shards([quiz], [num_questions], num_questions)
             
         except Exception as e:
             logger.error(f"Error generating quiz: {str(e)}")
             return []
+    
+    async def acreate_quiz(self, flashcards: List[Dict[str, Any]], num_questions: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Async version of create_quiz"""
+        if num_questions is None:
+            num_questions = config.get_quiz_num_questions()
+        
+        shard_size = config.get_quiz_shard_size()
+        if shard_size and len(flashcards) > shard_size:
+            return await self.acreate_sharded_quiz(flashcards, num_questions)
+        
+        try:
+            result = await self.chain.ainvoke({
+                "flashcards": str(flashcards),
+                "num_questions": num_questions
+            })
+            
+            quiz = await self.aparse_result(result)
+            return self.merge_shards([quiz], [num_questions], num_questions)
+            
+        except Exception as e:
+            logger.error(f"Error generating quiz: {str(e)}")
+            return []
+    
+    def parse_result(self, result: str) -> List[Dict[str, Any]]:
+        """Parse the quiz using dedicated parser, repairing malformed responses"""
+        quiz = self.parse_response(result)
+        if not quiz and needs_repair(result, "quiz"):
+            logger.warning("Failed to parse quiz from response, repairing it")
+            quiz = self.repair_chain.repair(result, self.parse_response, QUIZ_FORMAT)
+        return quiz
+    
+    async def aparse_result(self, result: str) -> List[Dict[str, Any]]:
+        """Async version of parse_result"""
+        quiz = self.parse_response(result)
+        if not quiz and needs_repair(result, "quiz"):
+            logger.warning("Failed to parse quiz from response, repairing it")
+            quiz = await self.repair_chain.arepair(result, self.parse_response, QUIZ_FORMAT)
+        return quiz
+    
+    def split_deck(self, flashcards: List[Dict[str, Any]], num_questions: int) -> List[List[Dict[str, Any]]]:
+        """Split a deck into consecutive shards of nearly equal size
+        
+        There are at most QUIZ_MAX_CONCURRENCY shards so they all run in a single
+        parallel wave, and never more shards than questions.
+        """
+        num_shards = math.ceil(len(flashcards) / max(1, config.get_quiz_shard_size()))
+        num_shards = max(1, min(num_shards, config.get_quiz_max_concurrency(), num_questions))
+        bounds = [round(index * len(flashcards) / num_shards) for index in range(num_shards + 1)]
+        return [self.fit_shard(flashcards[bounds[index]:bounds[index + 1]]) for index in range(num_shards)]
+    
+    def fit_shard(self, shard: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep evenly spaced flashcards of a shard until it fits the prompt budget
+        
+        A single flashcard larger than the budget has its answer truncated.
+        """
+        tokens = count_tokens(str(shard))
+        if tokens <= self.shard_input_tokens:
+            return shard
+        
+        fitted = shard
+        while len(fitted) > 1 and tokens > self.shard_input_tokens:
+            keep = max(1, min(len(fitted) - 1, int(len(fitted) * self.shard_input_tokens / tokens)))
+            fitted = [shard[index * len(shard) // keep] for index in range(keep)]
+            tokens = count_tokens(str(fitted))
+        if len(fitted) < len(shard):
+            logger.info(f"Sampled {len(fitted)} of {len(shard)} flashcards to fit the quiz shard prompt")
+        
+        if tokens > self.shard_input_tokens:
+            card = fitted[0]
+            answer = str(card.get("answer", ""))
+            answer_tokens = self.shard_input_tokens - count_tokens(str([dict(card, answer="")]))
+            while answer and tokens > self.shard_input_tokens:
+                answer = truncate_to_tokens(answer, answer_tokens)
+                fitted = [dict(card, answer=answer)]
+                tokens = count_tokens(str(fitted))
+                answer_tokens -= max(1, tokens - self.shard_input_tokens)
+            logger.info("Truncated the answer of a flashcard to fit the quiz shard prompt")
+        return fitted
+    
+    def create_sharded_quiz(
+        self,
+        flashcards: List[Dict[str, Any]],
+        num_questions: int,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> List[Dict[str, Any]]:
+        """Generate a quiz from shards of the deck in parallel
+        
+        Every shard gets its share of the questions (plus a spare) in one call, so
+        each prompt and completion stays small and the quiz takes as long as a
+        single shard however large the deck. Shards larger than the prompt budget
+        are sampled evenly rather than overflowing the context. Questions are then
+        merged in deck order, deduplicated and trimmed to num_questions.
+        
+        Shards are parsed as they complete. Once is_cancelled returns True, the
+        shards not started yet are dropped and no other shard is parsed or repaired.
+        
+        Args:
+            flashcards (List[Dict[str, Any]]): List of flashcard dictionaries
+            num_questions (int): Number of questions of the quiz
+            is_cancelled (Optional[Callable[[], bool]]): Checked between shards, the
+                generation stops with an empty quiz once it returns True
+            
+        Returns:
+            List[Dict[str, Any]]: List of quiz questions
+        """
+        try:
+            shards, quotas = self.plan_shards(flashcards, num_questions)
+            results = self.shard_chain.batch_as_completed(
+                self.shard_inputs(shards, quotas),
+                config={"max_concurrency": config.get_quiz_max_concurrency()},
+                return_exceptions=True
+            )
+            
+            shard_questions = [[] for _ in shards]
+            for index, result in results:
+                if is_cancelled and is_cancelled():
+                    # Closing the generator cancels the shards not started yet
+                    results.close()
+                    logger.info("Quiz generation cancelled")
+                    return []
+                if isinstance(result, Exception):
+                    logger.error(f"Error generating quiz shard {index + 1}/{len(shards)}: {str(result)}")
+                    continue
+                shard_questions[index] = self.parse_result(result)
+            
+            return self.merge_shards(shard_questions, quotas, num_questions)
+            
+        except Exception as e:
+            logger.error(f"Error generating sharded quiz: {str(e)}")
+            return []
+    
+    async def acreate_sharded_quiz(self, flashcards: List[Dict[str, Any]], num_questions: int) -> List[Dict[str, Any]]:
+        """Async version of create_sharded_quiz"""
+        try:
+            shards, quotas = self.plan_shards(flashcards, num_questions)
+            results = await self.shard_chain.abatch(
+                self.shard_inputs(shards, quotas),
+                config={"max_concurrency": config.get_quiz_max_concurrency()},
+                return_exceptions=True
+            )
+            
+            shard_questions = []
+            for index, result in enumerate(results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error generating quiz shard {index + 1}/{len(shards)}: {str(result)}")
+                    shard_questions.append([])
+                    continue
+                shard_questions.append(await self.aparse_result(result))
+            
+            return self.merge_shards(shard_questions, quotas, num_questions)
+            
+        except Exception as e:
+            logger.error(f"Error generating sharded quiz: {str(e)}")
+            return []
+    
+    def plan_shards(self, flashcards: List[Dict[str, Any]], num_questions: int) -> Tuple[List[List[Dict[str, Any]]], List[int]]:
+        """Split a deck into shards and share the questions between them"""
+        shards = self.split_deck(flashcards, num_questions)
+        quotas = [
+            num_questions // len(shards) + (1 if index < num_questions % len(shards) else 0)
+            for index in range(len(shards))
+        ]
+        logger.info(f"Generating a {num_questions}-question quiz from {len(flashcards)} flashcards in {len(shards)} shards")
+        return shards, quotas
+    
+    def shard_inputs(self, shards: List[List[Dict[str, Any]]], quotas: List[int]) -> List[Dict[str, Any]]:
+        """Prompt inputs of the shards, each asking for its quota plus spares"""
+        return [
+            {"flashcards": str(shard), "num_questions": quota + self.SHARD_SPARE_QUESTIONS}
+            for shard, quota in zip(shards, quotas)
+        ]
+    
+    def merge_shards(
+        self,
+        shard_questions: List[List[Dict[str, Any]]],
+        quotas: List[int],
+        num_questions: int
+    ) -> List[Dict[str, Any]]:
+        """Merge the questions of every shard into one quiz
+        
+        Near-duplicate questions are dropped, earlier shards first. Each shard then
+        contributes up to its quota, missing questions are filled with the spares of
+        any shard, and the quiz follows the order of the deck.
+        
+        Args:
+            shard_questions (List[List[Dict[str, Any]]]): Questions of each shard, in deck order
+            quotas (List[int]): Questions expected from each shard
+            num_questions (int): Number of questions of the quiz
+            
+        Returns:
+            List[Dict[str, Any]]: List of quiz questions
+        """
+        duplicate_filter = NearDuplicateFilter(threshold=config.get_quiz_dedup_threshold())
+        kept = []
+        for questions in shard_questions:
+            texts = [self.question_text(question) for question in questions]
+            keep = duplicate_filter.filter(texts)
+            kept.append([question for question, kept_question in zip(questions, keep) if kept_question])
+        
+        dropped = sum(len(questions) for questions in shard_questions) - sum(len(questions) for questions in kept)
+        if dropped:
+            logger.info(f"Dropped {dropped} near-duplicate quiz questions")
+        
+        selected = [
+            (shard, position)
+            for shard, questions in enumerate(kept)
+            for position in range(min(quotas[shard], len(questions)))
+        ]
+        spares = [
+            (shard, position)
+            for shard, questions in enumerate(kept)
+            for position in range(quotas[shard], len(questions))
+        ]
+        selected += spares[:max(0, num_questions - len(selected))]
+        
+        return [kept[shard][position] for shard, position in sorted(selected)]
+    
+    @staticmethod
+    def question_text(question: Dict[str, Any]) -> str:
+        """Text compared to detect duplicate questions: the question and its answer"""
+        options = question.get("options") or []
+        answer = question.get("correct_answer")
+        answer_text = options[answer] if isinstance(answer, int) and 0 <= answer < len(options) else ""
+        return f"{question.get('question', '')} {answer_text}"
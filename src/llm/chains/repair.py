@@ -0,0 +1,188 @@
+"""Repair chain recovering items from malformed JSON responses"""
+
+import json
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+
+from src.core.config import logger
+from src.llm.providers.llama import get_openai_chat_model
+from src.llm.parsers.json_repair import repair_json
+from src.llm.text.tokens import count_tokens, get_input_budget, truncate_to_tokens
+
+from src.llm.prompts.repair_prompts import (
+    repair_system_template,
+    repair_human_template
+)
+
+# Tiers of the repair pass, cheapest first
+REPAIR_TIERS = ("deterministic", "llm", "failed")
+
+_repair_stats = Counter()
+_repair_stats_lock = threading.Lock()
+
+def record_repair(tier: str):
+    """Count a repair attempt under the tier that produced it"""
+    with _repair_stats_lock:
+        _repair_stats[tier] += 1
+
+def get_repair_stats() -> Dict[str, int]:
+    """
+    Returns how many malformed responses each repair tier handled.
+
+    Returns:
+        Dict[str, int]: Count per tier ("deterministic", "llm" or "failed")
+    """
+    with _repair_stats_lock:
+        return {tier: _repair_stats[tier] for tier in REPAIR_TIERS}
+
+class RepairChain:
+    """Chain recovering items from responses whose JSON could not be parsed"""
+
+    MODEL_NAME = "Meta-Llama-3.1-8B-Instruct"
+    MAX_TOKENS = 4096
+
+    def __init__(self):
+        """Initialize the repair chain"""
+        self.setup_llm()
+        self.setup_chain()
+
+    def setup_llm(self):
+        """Initialize the small model used as the last repair tier"""
+        self.llm = get_openai_chat_model(self.MODEL_NAME, max_tokens=self.MAX_TOKENS)
+
+    def setup_chain(self):
+        """Setup the LLM repair chain"""
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", repair_system_template),
+            ("human", repair_human_template)
+        ])
+
+        self.chain = prompt | self.llm | StrOutputParser()
+
+    def repair(
+        self,
+        response: str,
+        parse: Callable[[str], List[Dict[str, Any]]],
+        expected_format: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Recover the items of a response that failed to parse.
+
+        Deterministic fixes (trailing commas, single quotes, unbalanced braces,
+        truncated arrays) are tried first. Only if they fail is the response sent
+        to the 8B model, which is still much cheaper than generating it again.
+
+        Args:
+            response (str): Raw model response that failed to parse
+            parse (Callable[[str], List[Dict[str, Any]]]): Parser of the expected items
+            expected_format (str): JSON structure of the response, shown to the model
+
+        Returns:
+            List[Dict[str, Any]]: Recovered items, empty if every tier failed
+        """
+        if not response or not response.strip():
+            record_repair("failed")
+            return []
+
+        items = self.repair_deterministically(response, parse)
+        if items:
+            return items
+
+        try:
+            result = self.chain.invoke({
+                "expected_format": expected_format,
+                "response": self.fit_response(response, expected_format)
+            })
+            items = self.parse_llm_repair(result, parse)
+            if items:
+                return items
+
+        except Exception as e:
+            logger.error(f"Error repairing JSON with the LLM: {str(e)}")
+
+        record_repair("failed")
+        logger.error("Failed to repair malformed JSON response")
+        return []
+
+    async def arepair(
+        self,
+        response: str,
+        parse: Callable[[str], List[Dict[str, Any]]],
+        expected_format: str
+    ) -> List[Dict[str, Any]]:
+        """Async version of repair"""
+        if not response or not response.strip():
+            record_repair("failed")
+            return []
+
+        items = self.repair_deterministically(response, parse)
+        if items:
+            return items
+
+        try:
+            result = await self.chain.ainvoke({
+                "expected_format": expected_format,
+                "response": self.fit_response(response, expected_format)
+            })
+            items = self.parse_llm_repair(result, parse)
+            if items:
+                return items
+
+        except Exception as e:
+            logger.error(f"Error repairing JSON with the LLM: {str(e)}")
+
+        record_repair("failed")
+        logger.error("Failed to repair malformed JSON response")
+        return []
+
+    def fit_response(self, response: str, expected_format: str) -> str:
+        """Cut a response to the input budget of the repair model
+
+        The prompt, the response and the MAX_TOKENS reserved for the rewrite must
+        fit the context window. The end of a cut response is an incomplete item,
+        which the prompt asks the model to drop.
+        """
+        budget = get_input_budget(
+            self.MODEL_NAME,
+            self.MAX_TOKENS,
+            repair_system_template + repair_human_template + expected_format
+        )
+        tokens = count_tokens(response)
+        if tokens <= budget:
+            return response
+        logger.warning(f"Response to repair has {tokens} tokens, keeping the first {budget}")
+        return truncate_to_tokens(response, budget)
+
+    def repair_deterministically(
+        self,
+        response: str,
+        parse: Callable[[str], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """First repair tier: parse the response once its JSON is fixed without the LLM"""
+        repaired = repair_json(response)
+        if repaired is None:
+            return []
+
+        items = parse(json.dumps(repaired))
+        if items:
+            record_repair("deterministic")
+            logger.info(f"Repaired malformed JSON deterministically ({len(items)} items)")
+        return items
+
+    def parse_llm_repair(
+        self,
+        result: str,
+        parse: Callable[[str], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """Parse the response rewritten by the LLM tier, fixing its JSON if needed"""
+        items = parse(result)
+        if not items:
+            repaired = repair_json(result)
+            items = parse(json.dumps(repaired)) if repaired is not None else []
+        if items:
+            record_repair("llm")
+            logger.info(f"Repaired malformed JSON with the LLM ({len(items)} items)")
+        return items
@@ -1,28 +1,83 @@
-from typing import List, Dict, Any, Optional
+import math
+import asyncio
+from typing import List, Dict, Any, Iterator, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.utilities import SerpAPIWrapper
-from langchain_community.document_loaders import WebBaseLoader
 
 from src.core.config import config, logger
-from src.llm.providers.llama import get_openai_chat_model
-from src.llm.prompts.search_prompts import queries_system_template, queries_human_template
+from src.llm.providers.llama import get_openai_chat_model, with_json_mode
+from src.llm.cache.search_cache import get_search_cache
+from src.llm.services.fetcher import get_page_fetcher
+from src.llm.services.extractor import get_content_extractor
+from src.llm.prompts.search_prompts import (
+    queries_system_template,
+    queries_human_template,
+    summary_template,
+    combine_summaries_template
+)
 from src.llm.parsers.queries_parser import parse_queries
+from src.llm.parsers.structured_parser import parse_structured_items
+from src.llm.parsers.schemas import SearchQuery
+from src.llm.text.tokens import count_tokens, truncate_to_tokens, get_input_budget
+from src.llm.text.relevance import select_relevant_chunks
 import streamlit as st
 
 class SearchChain:
+    # Tokens shared by consecutive chunks of a long document
+    SUMMARY_CHUNK_OVERLAP_TOKENS = 64
+
     def __init__(self):
         self.setup_llm()
+        self.setup_summary_chains()
+        self.setup_budgets()
         self.setup_search()
+        self.fetcher = get_page_fetcher()
+        self.extractor = get_content_extractor()
         self.content_cache = {}
-        self.text_splitter = RecursiveCharacterTextSplitter(chunk_size=3000, chunk_overlap=200)
    
     def setup_llm(self):
         """Initialize LLM with OpenAI configuration"""
         self.llm = get_openai_chat_model("Meta-Llama-3.1-8B-Instruct")
     
+    def setup_summary_chains(self):
+        """Setup the map (chunk summary) and reduce (combine summaries) chains"""
+        self.summary_chain = (
+            ChatPromptTemplate.from_template(summary_template) | self.llm | StrOutputParser()
+        )
+        self.combine_chain = (
+            ChatPromptTemplate.from_template(combine_summaries_template) | self.llm | StrOutputParser()
+        )
+    
+    def setup_budgets(self):
+        """Derive the token budgets of the summary prompts from the model context window
+        
+        Each budget is what is left of the context window once the completion
+        (max_tokens) and the fixed prompt text are reserved, so chunks fill the
+        context without overflowing it whatever the language of the page.
+        """
+        model_name = self.llm.model_name
+        self.summary_output_tokens = self.llm.max_tokens
+        self.summary_input_tokens = get_input_budget(model_name, self.summary_output_tokens, summary_template)
+        self.combine_input_tokens = get_input_budget(model_name, self.summary_output_tokens, combine_summaries_template)
+        
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.summary_input_tokens,
+            chunk_overlap=self.SUMMARY_CHUNK_OVERLAP_TOKENS,
+            length_function=count_tokens
+        )
+        
+        # Small chunks scored against the query before summarizing
+        self.relevance_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=config.get_relevance_chunk_tokens(),
+            chunk_overlap=0,
+            length_function=count_tokens
+        )
+    
     def setup_search(self):
         """Initialize search wrapper with default parameters"""
         # Get language from session state, default to English
@@ -47,14 +102,28 @@ class SearchChain:
                 "safe": "active"
             }
         )
+        
+        self.search_cache = get_search_cache() if config.is_search_cache_enabled() else None
+    
+    def run_search(self, search: SerpAPIWrapper, query: str) -> dict:
+        """Run a SerpAPI search, going through the results cache when enabled"""
+        if self.search_cache is None:
+            return search.results(query)
+        return self.search_cache.results(search, query)
+    
+    async def arun_search(self, search: SerpAPIWrapper, query: str) -> dict:
+        """Async version of run_search, calling SerpAPI with aiohttp"""
+        if self.search_cache is None:
+            return await search.aresults(query)
+        return await self.search_cache.aresults(search, query)
     
     def generate_search_queries(self, query: str, num_queries: int = 3) -> List[str]:
-        """Generate multiple search queries to cover different aspects of the topic"""
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", queries_system_template),
-            ("human", queries_human_template)
-        ])
-        chain = prompt | self.llm | StrOutputParser()
+        """Generate multiple search queries to cover different aspects of the topic
+        
+        With structured output enabled the model runs in JSON mode and each query is
+        validated on its own, so only a response without any valid query is retried.
+        """
+        chain = self.build_queries_chain()
         
         max_retries = 2
         current_try = 0
@@ -62,8 +131,7 @@ class SearchChain:
         while current_try < max_retries:
             try:
                 result = chain.invoke({"query": query, "num_queries": num_queries})
-                data = parse_queries(result)
-                queries = data.get("queries", [])
+                queries = self.parse_search_queries(result)
                 if queries:
                     logger.parser(f"Successfully generated {len(queries)} queries on attempt {current_try + 1}")
                     return queries
@@ -78,152 +146,574 @@ class SearchChain:
             
         return []
     
+    async def agenerate_search_queries(self, query: str, num_queries: int = 3) -> List[str]:
+        """Async version of generate_search_queries"""
+        chain = self.build_queries_chain()
+        
+        max_retries = 2
+        current_try = 0
+        
+        while current_try < max_retries:
+            try:
+                result = await chain.ainvoke({"query": query, "num_queries": num_queries})
+                queries = self.parse_search_queries(result)
+                if queries:
+                    logger.parser(f"Successfully generated {len(queries)} queries on attempt {current_try + 1}")
+                    return queries
+                else:
+                    logger.warning(f"Generated empty queries list on attempt {current_try + 1}")
+            except Exception as e:
+                logger.error(f"Error generating queries (attempt {current_try + 1}): {str(e)}")
+                if current_try == max_retries - 1:
+                    logger.error("Max retries reached, returning empty list")
+                    return []
+            current_try += 1
+            
+        return []
+    
+    def build_queries_chain(self):
+        """Build the search queries chain, in JSON mode with structured output"""
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", queries_system_template),
+            ("human", queries_human_template)
+        ])
+        llm = with_json_mode(self.llm) if config.is_structured_output_enabled() else self.llm
+        return prompt | llm | StrOutputParser()
+    
+    def parse_search_queries(self, result: str) -> List[dict]:
+        """Parse the queries of a search queries response"""
+        if config.is_structured_output_enabled():
+            return parse_structured_items(result, "queries", SearchQuery)
+        data = parse_queries(result)
+        return data.get("queries", [])
+    
     def search_image(self, query: str) -> dict:
         """Perform image search and return image result"""
         try:
-            search_results = self.image_search.results(query)
-            images_results = search_results.get("images_results", [])
-            
-            if not images_results:
-                logger.warning(f"No images found for query: {query}")
-                return None
+            search_results = self.run_search(self.image_search, query)
+            return self.format_image_result(search_results, query)
             
-            first_image = images_results[0]
-            return {
-                "title": first_image.get("title", ""),
-                "content": first_image.get("original"),
-                "link": first_image.get("original"),
-                "source": first_image.get("source", "")
-            }
+        except Exception as e:
+            logger.error(f"Error in image search for query '{query}': {str(e)}")
+            return None
+
+    async def asearch_image(self, query: str) -> dict:
+        """Async version of search_image"""
+        try:
+            search_results = await self.arun_search(self.image_search, query)
+            return self.format_image_result(search_results, query)
             
         except Exception as e:
             logger.error(f"Error in image search for query '{query}': {str(e)}")
             return None
 
+    def format_image_result(self, search_results: dict, query: str) -> Optional[dict]:
+        """Build the result of an image search from its first image"""
+        images_results = search_results.get("images_results", [])
+        
+        if not images_results:
+            logger.warning(f"No images found for query: {query}")
+            return None
+        
+        first_image = images_results[0]
+        return {
+            "title": first_image.get("title", ""),
+            "content": first_image.get("original"),
+            "link": first_image.get("original"),
+            "source": first_image.get("source", "")
+        }
+
     def search_and_fetch(self, query: str, query_type: str = "text") -> dict:
         """Perform search and fetch content from URLs"""
         try:
             if query_type == "image":
                 return self.search_image(query)
                 
-            search_results = self.search.results(query)
-            organic_results = search_results.get("organic_results", [])
-            
-            if not organic_results:
-                logger.warning(f"No organic results found for query: {query}")
+            search_results = self.run_search(self.search, query)
+            first_result = self.first_organic_result(search_results, query)
+            if not first_result:
                 return None
-                
-            first_result = organic_results[0]
             url = first_result.get("link", "")
             
-            # Fetch content using WebBaseLoader
+            # Fetch content through the pooled page fetcher
             try:
-                loader = WebBaseLoader(url)
-                docs = loader.load()
-                # Combine all page content
-                content = "".join(doc.page_content for doc in docs)
+                content = self.fetch_page_text(url)
+                return self.format_page_result(first_result, content)
                 
-                return {
-                    "title": first_result.get("title", ""),
-                    "content": content,
-                    "link": url,
-                    "source": first_result.get("source", first_result.get("displayed_link", ""))
-                }
+            except Exception as e:
+                logger.error(f"Error fetching content from URL {url}: {str(e)}")
+                return self.format_page_result(first_result, first_result.get("snippet", ""))
+            
+        except Exception as e:
+            logger.error(f"Error in search for query '{query}': {str(e)}")
+            return None
+
+    async def asearch_and_fetch(self, query: str, query_type: str = "text") -> dict:
+        """Async version of search_and_fetch"""
+        try:
+            if query_type == "image":
+                return await self.asearch_image(query)
+                
+            search_results = await self.arun_search(self.search, query)
+            first_result = self.first_organic_result(search_results, query)
+            if not first_result:
+                return None
+            url = first_result.get("link", "")
+            
+            try:
+                content = await self.afetch_page_text(url)
+                return self.format_page_result(first_result, content)
                 
             except Exception as e:
                 logger.error(f"Error fetching content from URL {url}: {str(e)}")
-                return {
-                    "title": first_result.get("title", ""),
-                    "content": first_result.get("snippet", ""),
-                    "link": url,
-                    "source": first_result.get("source", first_result.get("displayed_link", ""))
-                }
+                return self.format_page_result(first_result, first_result.get("snippet", ""))
             
         except Exception as e:
             logger.error(f"Error in search for query '{query}': {str(e)}")
             return None
 
-    def summarize_content(self, content: str, token_usage: Optional[int]=None) -> str:
-        """Summarize content using LLM with focus on key concepts for flashcard creation"""
+    def first_organic_result(self, search_results: dict, query: str) -> Optional[dict]:
+        """Get the first organic result of a web search"""
+        organic_results = search_results.get("organic_results", [])
+        
+        if not organic_results:
+            logger.warning(f"No organic results found for query: {query}")
+            return None
+        return organic_results[0]
+
+    def format_page_result(self, search_result: dict, content: str) -> dict:
+        """Build the result of a web search from its first result and the page content"""
+        return {
+            "title": search_result.get("title", ""),
+            "content": content,
+            "link": search_result.get("link", ""),
+            "source": search_result.get("source", search_result.get("displayed_link", ""))
+        }
+
+    def fetch_page_text(self, url: str) -> str:
+        """Fetch a page and return the text of its main content
+        
+        Menus, headers, footers, sidebars and comments are stripped from HTML pages
+        before chunking, so they are neither scored, summarized nor paid for.
+        """
+        page = self.fetcher.fetch(url)
+        if "error" in page:
+            raise ValueError(page["error"])
+        
+        if page["content_type"] == "text/plain":
+            return page["text"]
+        return self.extractor.extract(page["text"], url)["text"]
+
+    async def afetch_page_text(self, url: str) -> str:
+        """Async version of fetch_page_text"""
+        page = await self.fetcher.afetch(url)
+        if "error" in page:
+            raise ValueError(page["error"])
+        
+        if page["content_type"] == "text/plain":
+            return page["text"]
+        return (await self.extractor.aextract(page["text"], url))["text"]
+
+    def select_relevant_content(self, content: str, query: str) -> str:
+        """Keep only the parts of a page relevant to the query
+        
+        The page is split into chunks of RELEVANCE_CHUNK_TOKENS that are scored
+        against the query with BM25, and the SUMMARY_TOP_K_CHUNKS best ones are kept
+        in document order, so navigation, comments and unrelated sidebars never
+        reach the LLM. Pages that fit a single summary call are kept whole, since
+        cutting them would not save a call.
+        """
+        top_k = config.get_summary_top_k_chunks()
+        if not top_k or not query:
+            return content
+        
+        if count_tokens(content) <= self.summary_input_tokens:
+            return content
+        
+        chunks = self.relevance_splitter.split_text(content)
+        if len(chunks) <= top_k:
+            return content
+        
+        selected = select_relevant_chunks(chunks, query, top_k)
+        relevant_content = "\n\n".join(selected)
+        logger.info(
+            f"Kept {len(selected)}/{len(chunks)} chunks relevant to '{query}' "
+            f"({count_tokens(content)} -> {count_tokens(relevant_content)} tokens)"
+        )
+        return relevant_content
+
+    def summarize_content(self, content: str, token_usage: Optional[int]=None, query: Optional[str]=None) -> str:
+        """Summarize content using LLM with focus on key concepts for flashcard creation
+        
+        With a query, only the chunks most relevant to it are summarized. Long
+        content is summarized map-reduce style: the chunks are summarized
+        concurrently, then the partial summaries are merged by a reduce call.
+        Content is split only when it exceeds the token budget of the summary prompt.
+        """
         try:
-            # Define the reduce template for content summarization
-            reduce_template = """
-            Role: Educational Content Synthesizer
-            Goal: Create a comprehensive summary optimized for flashcard generation
-            
-            Instructions:
-            1. IGNORE all website metadata, navigation elements, and non-content related text
-            2. Focus ONLY on the main content of the article/document
-            3. Create a summary that preserves:
-               - Key terms and their precise definitions
-               - Core concepts and principles
-               - Important relationships between ideas
-               - Significant examples and applications
-               - Essential technical details
-               - Relevant numerical data
-            4. Structure the information to facilitate flashcard creation
-            5. Maintain academic accuracy and terminology
-            
-            Content to summarize:
-            {text}
-            
-            Educational summary (focus on key concepts):
-            """
-            
-            # Create the reduce prompt and chain
-            reduce_prompt = ChatPromptTemplate.from_template(reduce_template)
-            reduce_chain = reduce_prompt | self.llm | StrOutputParser()
+            if query:
+                content = self.select_relevant_content(content, query)
             
             # Check content length and split if necessary
-            if len(content) > 4000:  # Conservative limit to account for prompt
-                docs = self.text_splitter.create_documents([content])
-                summaries = []
-                
-                # Process each chunk
-                for doc in docs:
-                    chunk_summary = reduce_chain.invoke({"text": doc.page_content})
-                    summaries.append(chunk_summary)
-                
-                # Combine summaries if multiple chunks were processed
-                if len(summaries) > 1:
-                    combined_summary = "\n\n".join(summaries)
-                    # Process combined summary if it's still too long
-                    if len(combined_summary) > 6000:
-                        return reduce_chain.invoke({"text": combined_summary[:6000]})
-                    return combined_summary
+            if count_tokens(content) <= self.summary_input_tokens:
+                return self.summary_chain.invoke({"text": content})
+            
+            docs = self.text_splitter.create_documents([content])
+            summaries = self.map_summaries([doc.page_content for doc in docs])
+            if not summaries:
+                raise ValueError("No chunk could be summarized")
+            if len(summaries) == 1:
                 return summaries[0]
-            else:
-                return reduce_chain.invoke({"text": content})
+            return self.reduce_summaries(summaries)
             
         except Exception as e:
             logger.error(f"Error summarizing content: {str(e)}")
-            return content[:4000]  # Return truncated content as fallback
+            # Return content truncated to the size of a summary as fallback
+            return truncate_to_tokens(content, self.summary_output_tokens)
 
-    def process_queries(self, topic: str) -> List[dict]:
-        """Process multiple queries and aggregate results"""
-        queries = self.generate_search_queries(topic)
-        all_results = []
+    async def asummarize_content(self, content: str, token_usage: Optional[int]=None, query: Optional[str]=None) -> str:
+        """Async version of summarize_content"""
+        try:
+            if query:
+                content = self.select_relevant_content(content, query)
+            
+            if count_tokens(content) <= self.summary_input_tokens:
+                return await self.summary_chain.ainvoke({"text": content})
+            
+            docs = self.text_splitter.create_documents([content])
+            summaries = await self.amap_summaries([doc.page_content for doc in docs])
+            if not summaries:
+                raise ValueError("No chunk could be summarized")
+            if len(summaries) == 1:
+                return summaries[0]
+            return await self.areduce_summaries(summaries)
+            
+        except Exception as e:
+            logger.error(f"Error summarizing content: {str(e)}")
+            return truncate_to_tokens(content, self.summary_output_tokens)
+
+    def map_summaries(self, chunks: List[str]) -> List[str]:
+        """Summarize chunks concurrently, skipping the ones that fail
         
-        for query_data in queries:
-            query = query_data.get("query", "")
-            query_type = query_data.get("type", "text")
+        Args:
+            chunks (List[str]): Text chunks in document order
             
-            try:
-                result = self.search_and_fetch(query, query_type)
-                if result:
-                    content = result.get("content", "")
-                    if content and query_type == "text":
-                        summarized_content = self.summarize_content(content)
-                        result["content"] = summarized_content
-                    
-                    all_results.append({
-                        "query": query,
-                        "type": query_type,
-                        "result": result
-                    })
-                    logger.info(f"Successfully processed query: {query} ({query_type})")
-            except Exception as e:
-                logger.error(f"Error processing query '{query}': {str(e)}")
+        Returns:
+            List[str]: Chunk summaries in document order
+        """
+        results = self.summary_chain.batch(
+            [{"text": chunk} for chunk in chunks],
+            config={"max_concurrency": config.get_summary_max_concurrency()},
+            return_exceptions=True
+        )
+        return self.collect_summaries(chunks, results)
+
+    async def amap_summaries(self, chunks: List[str]) -> List[str]:
+        """Async version of map_summaries"""
+        results = await self.summary_chain.abatch(
+            [{"text": chunk} for chunk in chunks],
+            config={"max_concurrency": config.get_summary_max_concurrency()},
+            return_exceptions=True
+        )
+        return self.collect_summaries(chunks, results)
+
+    def collect_summaries(self, chunks: List[str], results: List[Any]) -> List[str]:
+        """Keep the chunk summaries that succeeded, in document order"""
+        summaries = []
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.error(f"Error summarizing chunk {index + 1}/{len(chunks)}: {str(result)}")
                 continue
+            summaries.append(result)
+        return summaries
+
+    def reduce_summaries(self, summaries: List[str]) -> str:
+        """Merge partial summaries into a single summary with a tree reduce
+        
+        Summaries are merged in consecutive groups that fit the combine prompt, all
+        groups of a level run in parallel, and levels repeat until one summary is left.
+        Groups are filled by token size, so the depth grows logarithmically with the
+        document and no part of it is cut. A summary too large for the combine prompt
+        on its own is split and summarized again first.
+        
+        Args:
+            summaries (List[str]): Partial summaries in document order
+            
+        Returns:
+            str: Combined summary
+        """
+        self.log_reduce_plan(summaries)
+        
+        level = 0
+        while len(summaries) > 1:
+            level += 1
+            plan = self.plan_oversized(summaries)
+            chunks = [chunk for summary_chunks in plan if summary_chunks for chunk in summary_chunks]
+            if chunks:
+                results = self.summary_chain.batch(
+                    [{"text": chunk} for chunk in chunks],
+                    config={"max_concurrency": config.get_summary_max_concurrency()},
+                    return_exceptions=True
+                )
+                summaries = self.merge_resummarized(summaries, plan, results)
+                if not summaries:
+                    raise ValueError("No summary left to combine")
+            
+            groups = self.group_summaries(summaries)
+            results = self.combine_chain.batch(
+                [{"text": "\n\n".join(group)} for group in groups],
+                config={"max_concurrency": config.get_summary_max_concurrency()},
+                return_exceptions=True
+            )
+            summaries = self.collect_combined(groups, results, level)
+        
+        return summaries[0]
+
+    async def areduce_summaries(self, summaries: List[str]) -> str:
+        """Async version of reduce_summaries"""
+        self.log_reduce_plan(summaries)
+        
+        level = 0
+        while len(summaries) > 1:
+            level += 1
+            plan = self.plan_oversized(summaries)
+            chunks = [chunk for summary_chunks in plan if summary_chunks for chunk in summary_chunks]
+            if chunks:
+                results = await self.summary_chain.abatch(
+                    [{"text": chunk} for chunk in chunks],
+                    config={"max_concurrency": config.get_summary_max_concurrency()},
+                    return_exceptions=True
+                )
+                summaries = self.merge_resummarized(summaries, plan, results)
+                if not summaries:
+                    raise ValueError("No summary left to combine")
+            
+            groups = self.group_summaries(summaries)
+            results = await self.combine_chain.abatch(
+                [{"text": "\n\n".join(group)} for group in groups],
+                config={"max_concurrency": config.get_summary_max_concurrency()},
+                return_exceptions=True
+            )
+            summaries = self.collect_combined(groups, results, level)
         
-        return all_results
+        return summaries[0]
+
+    def log_reduce_plan(self, summaries: List[str]):
+        """Log the fan-in and expected depth of a tree reduce"""
+        fan_in = self.reduce_fan_in(summaries)
+        depth = max(1, math.ceil(math.log(len(summaries), fan_in)))
+        logger.info(f"Reducing {len(summaries)} summaries with fan-in ~{fan_in} (~{depth} levels)")
+
+    def collect_combined(self, groups: List[List[str]], results: List[Any], level: int) -> List[str]:
+        """Summaries of a reduce level, a failed group keeps its members joined
+        
+        Raises:
+            ValueError: If every combine call of the level failed, as the reduce
+                would otherwise never finish
+        """
+        if all(isinstance(result, Exception) for result in results):
+            raise ValueError(f"Every combine call failed at level {level}: {str(results[0])}")
+        
+        summaries = []
+        for group, result in zip(groups, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error combining summaries at level {level}: {str(result)}")
+                result = "\n\n".join(group)
+            summaries.append(result)
+        return summaries
+
+    def reduce_fan_in(self, summaries: List[str]) -> int:
+        """Typical number of summaries merged per combine call, at least two"""
+        average_tokens = max(1, sum(count_tokens(summary) for summary in summaries) // len(summaries))
+        return max(2, self.combine_input_tokens // average_tokens)
+
+    def plan_oversized(self, summaries: List[str]) -> List[Optional[List[str]]]:
+        """Split the summaries too large for the combine prompt into chunks
+        
+        Returns:
+            List[Optional[List[str]]]: Chunks of each summary, None for the ones that fit
+        """
+        plan = []
+        for summary in summaries:
+            if count_tokens(summary) <= self.combine_input_tokens:
+                plan.append(None)
+            else:
+                plan.append(self.text_splitter.split_text(summary))
+        
+        oversized = sum(1 for chunks in plan if chunks)
+        if oversized:
+            logger.info(f"Summarizing {oversized} summaries too large to combine again")
+        return plan
+
+    def merge_resummarized(
+        self,
+        summaries: List[str],
+        plan: List[Optional[List[str]]],
+        results: List[Any]
+    ) -> List[str]:
+        """Replace each oversized summary by the summaries of its chunks, in order
+        
+        Args:
+            summaries (List[str]): Summaries of the reduce level
+            plan (List[Optional[List[str]]]): Chunks of each summary, see plan_oversized
+            results (List[Any]): Summary or exception of every chunk, in plan order
+        """
+        merged = []
+        position = 0
+        for summary, chunks in zip(summaries, plan):
+            if chunks is None:
+                merged.append(summary)
+                continue
+            for result in results[position:position + len(chunks)]:
+                if isinstance(result, Exception):
+                    logger.error(f"Error summarizing an oversized summary chunk: {str(result)}")
+                    continue
+                merged.append(result)
+            position += len(chunks)
+        return merged
+
+    def group_summaries(self, summaries: List[str]) -> List[List[str]]:
+        """Split summaries into consecutive groups that fit the combine prompt
+        
+        Groups are filled in document order and closed before they would overflow
+        the prompt budget, so every summary reaches the combine call whole.
+        """
+        separator_tokens = count_tokens("\n\n")
+        groups = []
+        group = []
+        used_tokens = 0
+        for summary in summaries:
+            tokens = count_tokens(summary)
+            if group and used_tokens + separator_tokens + tokens > self.combine_input_tokens:
+                groups.append(group)
+                group = []
+                used_tokens = 0
+            used_tokens += tokens + (separator_tokens if group else 0)
+            group.append(summary)
+        if group:
+            groups.append(group)
+        return groups
+
+    def process_query(self, query_data: Dict[str, Any]) -> Optional[dict]:
+        """Search, fetch and summarize a single generated query"""
+        query = query_data.get("query", "")
+        query_type = query_data.get("type", "text")
+        
+        try:
+            result = self.search_and_fetch(query, query_type)
+            if not result:
+                return None
+            
+            content = result.get("content", "")
+            if content and query_type == "text":
+                summarized_content = self.summarize_content(content, query=query)
+                result["content"] = summarized_content
+            
+            logger.info(f"Successfully processed query: {query} ({query_type})")
+            return {
+                "query": query,
+                "type": query_type,
+                "result": result
+            }
+        except Exception as e:
+            logger.error(f"Error processing query '{query}': {str(e)}")
+            return None
+
+    async def aprocess_query(self, query_data: Dict[str, Any]) -> Optional[dict]:
+        """Async version of process_query"""
+        query = query_data.get("query", "")
+        query_type = query_data.get("type", "text")
+        
+        try:
+            result = await self.asearch_and_fetch(query, query_type)
+            if not result:
+                return None
+            
+            content = result.get("content", "")
+            if content and query_type == "text":
+                result["content"] = await self.asummarize_content(content, query=query)
+            
+            logger.info(f"Successfully processed query: {query} ({query_type})")
+            return {
+                "query": query,
+                "type": query_type,
+                "result": result
+            }
+        except Exception as e:
+            logger.error(f"Error processing query '{query}': {str(e)}")
+            return None
+
+    def process_queries(self, topic: str, max_concurrency: Optional[int] = None) -> List[dict]:
+        """Process multiple queries and aggregate results
+        
+        Queries are processed on a bounded worker pool so the topic takes roughly as
+        long as its slowest query. Results keep the order of the generated queries and
+        a failing query is skipped without affecting the others.
+        
+        Args:
+            topic (str): Topic to research
+            max_concurrency (Optional[int]): Maximum queries in flight, defaults to
+                SEARCH_MAX_CONCURRENCY. Use 1 to process queries sequentially.
+        """
+        return list(self.iter_queries(topic, max_concurrency))
+
+    async def aprocess_queries(self, topic: str, max_concurrency: Optional[int] = None) -> List[dict]:
+        """Async version of process_queries
+        
+        Queries run as tasks on the caller's event loop, at most max_concurrency at a
+        time, with async search, fetch and LLM calls all the way through. No thread is
+        held per query, so a service can keep many topics in flight at once.
+        
+        Args:
+            topic (str): Topic to research
+            max_concurrency (Optional[int]): Maximum queries in flight, defaults to
+                SEARCH_MAX_CONCURRENCY
+        """
+        queries = await self.agenerate_search_queries(topic)
+        if not queries:
+            return []
+        
+        if max_concurrency is None:
+            max_concurrency = config.get_search_max_concurrency()
+        semaphore = asyncio.Semaphore(max(1, min(max_concurrency, len(queries))))
+        
+        async def process(query_data: Dict[str, Any]) -> Optional[dict]:
+            async with semaphore:
+                return await self.aprocess_query(query_data)
+        
+        results = await asyncio.gather(*(process(query_data) for query_data in queries))
+        return [result for result in results if result]
+
+    def iter_queries(self, topic: str, max_concurrency: Optional[int] = None) -> Iterator[dict]:
+        """Process multiple queries, yielding each result as soon as it is ready
+        
+        Same as process_queries, but each result is yielded once it and the ones of
+        the queries before it are done, so callers can start working on the first
+        queries while the others run and always see the results in query order.
+        
+        Args:
+            topic (str): Topic to research
+            max_concurrency (Optional[int]): Maximum queries in flight, defaults to
+                SEARCH_MAX_CONCURRENCY. Use 1 to process queries sequentially.
+        """
+        queries = self.generate_search_queries(topic)
+        if not queries:
+            return
+        
+        if max_concurrency is None:
+            max_concurrency = config.get_search_max_concurrency()
+        max_workers = max(1, min(max_concurrency, len(queries)))
+        
+        if max_workers == 1:
+            for query_data in queries:
+                result = self.process_query(query_data)
+                if result:
+                    yield result
+            return
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search") as executor:
+            pending = deque(executor.submit(self.process_query, query_data) for query_data in queries)
+            while pending:
+                result = pending.popleft().result()
+                if result:
+                    yield result
@@ -1,10 +1,10 @@
 """Flashcard parser for handling LLM responses"""
 
-import re
-import json
 from typing import Dict, Any, List, Optional
 import logging
 
+from src.llm.parsers.json_stream import extract_json_objects
+
 logger = logging.getLogger(__name__)
 
 def parse_flashcards(text: str, is_image: bool = False) -> List[Dict[str, Any]]:
@@ -20,25 +20,16 @@ def parse_flashcards(text: str, is_image: bool = False) -> List[Dict[str, Any]]:
     """
     try:
         # Try to find JSON objects in the text
-        matches = re.finditer(r'(\{(?:[^{}]|{[^{}]*})*\})', text)
-        
-        for match in matches:
-            try:
-                json_str = match.group(0)
-                result = json.loads(json_str)
-                
-                # Check if it's a flashcards object
-                if isinstance(result, dict) and "flashcards" in result:
-                    flashcards = result["flashcards"]
-                    if isinstance(flashcards, list):
-                        # For images, validate only one flashcard
-                        if is_image and len(flashcards) > 1:
-                            logger.warning("More than one flashcard found for image. Using only the first one.")
-                            return [flashcards[0]]
-                        return flashcards
-                        
-            except json.JSONDecodeError:
-                continue
+        for result in extract_json_objects(text):
+            # Check if it's a flashcards object
+            if isinstance(result, dict) and "flashcards" in result:
+                flashcards = result["flashcards"]
+                if isinstance(flashcards, list):
+                    # For images, validate only one flashcard
+                    if is_image and len(flashcards) > 1:
+                        logger.warning("More than one flashcard found for image. Using only the first one.")
+                        return [flashcards[0]]
+                    return flashcards
         
         logger.warning("No valid flashcard JSON found in response")
         return []
@@ -0,0 +1,185 @@
+"""Deterministic repair of malformed JSON in LLM responses"""
+
+import ast
+import re
+import json
+from typing import Any, List, Optional, Tuple
+import logging
+
+from src.llm.parsers.json_stream import extract_json_objects
+
+logger = logging.getLogger(__name__)
+
+CODE_FENCE_PATTERN = re.compile(r"```(?:json)?", re.IGNORECASE)
+CLOSING_BRACKET_PATTERN = re.compile(r"\s*[}\]]")
+
+# Number of truncation points tried when closing a truncated object
+MAX_TRUNCATION_CANDIDATES = 50
+
+def _loads(text: str) -> Optional[Any]:
+    """Decode JSON text, None if it is invalid"""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return None
+
+def _raw_decode(text: str) -> Optional[Any]:
+    """Decode the JSON value at the start of the text, ignoring what follows it"""
+    try:
+        return json.JSONDecoder().raw_decode(text)[0]
+    except json.JSONDecodeError:
+        return None
+
+def _strip_trailing_commas(text: str) -> str:
+    """Remove the commas directly before a closing bracket, outside of strings"""
+    chars: List[str] = []
+    in_string = False
+    escape = False
+
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "," and CLOSING_BRACKET_PATTERN.match(text, index + 1):
+            continue
+        chars.append(char)
+    return "".join(chars)
+
+def _closers(stack: Tuple[str, ...]) -> str:
+    """Closing brackets for the open containers, innermost first"""
+    return "".join("}" if opener == "{" else "]" for opener in reversed(stack))
+
+def _close_truncated(text: str) -> Optional[Any]:
+    """
+    Close a truncated JSON object.
+
+    The text is cut back to the end of the last complete element and the open
+    arrays and objects are closed, so a response cut by max_tokens keeps every
+    item that was fully generated.
+    """
+    stack: List[str] = []
+    safe_points: List[Tuple[int, Tuple[str, ...]]] = []
+    in_string = False
+    escape = False
+
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+        elif char in "}]":
+            if not stack or (stack[-1] == "{") != (char == "}"):
+                break
+            stack.pop()
+            safe_points.append((index + 1, tuple(stack)))
+            if not stack:
+                break
+        elif char == ",":
+            safe_points.append((index, tuple(stack)))
+
+    if not stack and not in_string:
+        return None
+
+    # Cut between the items of the outermost array first, so a partially
+    # generated item (e.g. a quiz question) is dropped rather than kept incomplete
+    candidates = list(reversed(safe_points[-MAX_TRUNCATION_CANDIDATES:]))
+    candidates.sort(key=lambda point: (point[1][-1:] != ("[",), len(point[1])))
+
+    for end, open_containers in candidates:
+        if not open_containers:
+            continue
+        candidate = text[:end].rstrip().rstrip(",") + _closers(open_containers)
+        result = _loads(candidate)
+        if result is not None:
+            return result
+    return None
+
+def needs_repair(text: str, key: str) -> bool:
+    """
+    Whether a response without usable items is malformed JSON worth repairing.
+
+    A response that decodes to an object holding the ``key`` array is well
+    formed, even when the array is empty or schema validation dropped every
+    item: a repair cannot recover anything from it.
+
+    Args:
+        text (str): Response text
+        key (str): Name of the array holding the items (e.g. "flashcards")
+
+    Returns:
+        bool: False if the response holds a decodable ``key`` array
+    """
+    return not any(
+        isinstance(document, dict) and isinstance(document.get(key), list)
+        for document in extract_json_objects(text)
+    )
+
+def repair_json(text: str) -> Optional[Any]:
+    """
+    Repair the first JSON object of a response with deterministic fixes.
+
+    Fixes are tried in order of cost: code fences and surrounding text (the
+    first complete value is decoded, whatever follows it), trailing commas,
+    single quotes and Python literals, then unbalanced braces and truncated arrays.
+
+    Args:
+        text (str): Response text that failed to parse
+
+    Returns:
+        Optional[Any]: The decoded object, or None if no fix worked
+    """
+    try:
+        text = CODE_FENCE_PATTERN.sub("", text)
+        openers = [index for index in (text.find("{"), text.find("[")) if index != -1]
+        if not openers:
+            return None
+
+        # A complete value followed by prose, which may itself contain braces
+        first = min(openers)
+        for attempt in (text[first:], _strip_trailing_commas(text[first:])):
+            result = _raw_decode(attempt)
+            if result is not None:
+                return result
+
+        start = text.find("{")
+        if start == -1:
+            return None
+
+        end = text.rfind("}")
+        candidate = text[start:end + 1] if end > start else text[start:]
+        without_trailing_commas = _strip_trailing_commas(candidate)
+
+        for attempt in (candidate, without_trailing_commas):
+            result = _loads(attempt)
+            if result is not None:
+                return result
+
+        # Single quotes, True/False/None: the model wrote a Python literal
+        try:
+            result = ast.literal_eval(without_trailing_commas)
+            if isinstance(result, (dict, list)):
+                return json.loads(json.dumps(result))
+        except (ValueError, SyntaxError, MemoryError, RecursionError, TypeError):
+            pass
+
+        # Unbalanced braces or truncated output: use everything after the first brace
+        return _close_truncated(_strip_trailing_commas(text[start:]))
+
+    except Exception as e:
+        logger.error(f"Error repairing JSON: {str(e)}")
+        return None
@@ -0,0 +1,188 @@
+"""Incremental JSON extractor for streamed LLM responses"""
+
+import re
+import json
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Characters that change the parser state outside and inside strings
+STRUCTURE_PATTERN = re.compile(r'[{}\[\]":]')
+STRING_PATTERN = re.compile(r'["\\]')
+
+CLOSING = {"}": "{", "]": "["}
+
+
+class JSONStreamExtractor:
+    """
+    Extract JSON objects from LLM text as it streams in.
+
+    Text outside JSON objects (explanations, markdown fences) is skipped. Every
+    top-level object is collected in ``documents`` once it closes, and objects
+    that are items of an array named in ``item_keys`` (for example the
+    "flashcards" array) are returned by ``feed`` the moment their closing brace
+    arrives, before the rest of the response is generated.
+
+    Nesting depth is unlimited and the scan is linear: each character is looked at
+    once and runs of plain text are skipped with a single regex search.
+    """
+
+    def __init__(self, item_keys: Iterable[str] = ()):
+        """
+        Args:
+            item_keys (Iterable[str]): Names of the arrays whose object items are emitted
+        """
+        self.item_keys = set(item_keys)
+        self.documents: List[Any] = []
+        self._buffer = ""
+        self._pos = 0
+        self._reset()
+
+    def _reset(self):
+        """Forget the object being parsed"""
+        self._stack: List[Dict[str, Any]] = []
+        self._in_string = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+
+    @staticmethod
+    def _frame(kind: str, start: int, key: Optional[str]) -> Dict[str, Any]:
+        """Build the parser frame of an open object or array"""
+        return {"type": kind, "start": start, "key": key, "pending_key": None, "children": []}
+
+    def _discard(self, pos: int):
+        """Drop buffered text before pos"""
+        self._buffer = self._buffer[pos:]
+        self._pos = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume a chunk of streamed text.
+
+        Args:
+            chunk (str): Next piece of the response
+
+        Returns:
+            List[Dict[str, Any]]: Items completed by this chunk
+        """
+        items = []
+        self._buffer += chunk
+
+        while True:
+            if not self._stack:
+                start = self._buffer.find("{", self._pos)
+                if start == -1:
+                    self._discard(len(self._buffer))
+                    return items
+                self._discard(start)
+                self._stack.append(self._frame("{", 0, None))
+                self._pos = 1
+                continue
+
+            if self._in_string:
+                match = STRING_PATTERN.search(self._buffer, self._pos)
+                if match is None:
+                    self._pos = len(self._buffer)
+                    return items
+                if match.group() == "\\":
+                    if match.end() >= len(self._buffer):
+                        # Wait for the escaped character
+                        self._pos = match.start()
+                        return items
+                    self._pos = match.end() + 1
+                    continue
+                self._in_string = False
+                self._last_string = self._buffer[self._string_start:match.end()]
+                self._pos = match.end()
+                continue
+
+            match = STRUCTURE_PATTERN.search(self._buffer, self._pos)
+            if match is None:
+                self._pos = len(self._buffer)
+                return items
+
+            char = match.group()
+            index = match.start()
+            self._pos = match.end()
+            frame = self._stack[-1]
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = index
+            elif char == ":":
+                if frame["type"] == "{":
+                    frame["pending_key"] = self._decode_key(self._last_string)
+            elif char in "{[":
+                key = frame["pending_key"] if frame["type"] == "{" else frame["key"]
+                self._stack.append(self._frame(char, index, key))
+            elif CLOSING[char] != frame["type"]:
+                logger.warning("Mismatched bracket in streamed JSON, skipping object")
+                self._reset()
+                self._discard(self._pos)
+            else:
+                self._stack.pop()
+                if self._stack:
+                    self._stack[-1]["children"].append((frame["type"], frame["start"], index + 1))
+                if not self._stack:
+                    document = self._load(self._buffer[:index + 1])
+                    if document is not None:
+                        self.documents.append(document)
+                    self._reset()
+                    self._discard(self._pos)
+                elif char == "}" and self._stack[-1]["type"] == "[" and self._stack[-1]["key"] in self.item_keys:
+                    item = self._load(self._buffer[frame["start"]:index + 1])
+                    if isinstance(item, dict):
+                        items.append(item)
+
+    def close(self):
+        """
+        Finish the stream.
+
+        If an object is still open, its opening brace was most likely stray text
+        (or the response was truncated). The complete objects nested directly in
+        the open ones are then collected as documents, so they are recovered
+        without scanning the text again.
+        """
+        for frame in self._stack:
+            for kind, start, end in frame["children"]:
+                if kind == "{":
+                    document = self._load(self._buffer[start:end])
+                    if document is not None:
+                        self.documents.append(document)
+        self._reset()
+        self._discard(len(self._buffer))
+
+    @staticmethod
+    def _decode_key(raw: Optional[str]) -> Optional[str]:
+        """Decode a quoted JSON string token"""
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return raw.strip('"')
+
+    @staticmethod
+    def _load(text: str) -> Optional[Any]:
+        """Decode a complete object, None if it is not valid JSON"""
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
+
+
+def extract_json_objects(text: str) -> List[Any]:
+    """
+    Extract every valid top-level JSON object from a complete response.
+
+    Args:
+        text (str): Text that may contain JSON objects among other content
+
+    Returns:
+        List[Any]: Decoded objects in order of appearance
+    """
+    extractor = JSONStreamExtractor()
+    extractor.feed(text)
+    extractor.close()
+    return extractor.documents
@@ -1,8 +1,8 @@
-import re
-import json
 from typing import Dict, Any, Optional
 import logging
 
+from src.llm.parsers.json_stream import extract_json_objects
+
 logger = logging.getLogger(__name__)
 
 def parse_queries(text: str) -> Optional[Dict[str, Any]]:
@@ -18,18 +18,10 @@ def parse_queries(text: str) -> Optional[Dict[str, Any]]:
     """
     try:
         # Buscar el JSON más completo que contenga "queries"
-        matches = re.finditer(r'(\{(?:[^{}]|{[^{}]*})*\})', text)
-        
-        for match in matches:
-            try:
-                json_str = match.group(0)
-                # Intentar parsear el JSON
-                result = json.loads(json_str)
-                # Verificar si tiene la estructura esperada
-                if isinstance(result, dict) and "queries" in result:
-                    return result
-            except json.JSONDecodeError:
-                continue
+        for result in extract_json_objects(text):
+            # Verificar si tiene la estructura esperada
+            if isinstance(result, dict) and "queries" in result:
+                return result
         
         logger.warning("No valid JSON object found with queries structure")
         return None
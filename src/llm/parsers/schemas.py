@@ -0,0 +1,28 @@
+"""Typed schemas of the structured LLM outputs"""
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SearchQuery(BaseModel):
+    """A generated search query"""
+    query: str = Field(min_length=1)
+    type: Literal["text", "image"] = "text"
+
+
+class Flashcard(BaseModel):
+    """A generated flashcard"""
+    question: str = Field(min_length=1)
+    answer: str = Field(min_length=1)
+    source: str = ""
+    type: Literal["text", "image"] = "text"
+
+
+class QuizQuestion(BaseModel):
+    """A generated multiple-choice quiz question"""
+    question: str = Field(min_length=1)
+    options: List[str] = Field(min_length=4, max_length=4)
+    correct_answer: int = Field(ge=0, le=3)
+    explanation: str = ""
+    image_url: Optional[str] = None
@@ -0,0 +1,57 @@
+"""Structured output parser validating items against typed schemas"""
+
+import json
+from typing import Any, Dict, List, Type
+import logging
+
+from pydantic import BaseModel, ValidationError
+
+from src.llm.parsers.json_stream import extract_json_objects
+
+logger = logging.getLogger(__name__)
+
+def validate_items(items: List[Any], schema: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """
+    Validate items one by one, dropping the invalid ones.
+    
+    Args:
+        items (List[Any]): Items decoded from the response
+        schema (Type[BaseModel]): Schema every item must match
+        
+    Returns:
+        List[Dict[str, Any]]: Valid items as dictionaries
+    """
+    valid_items = []
+    for index, item in enumerate(items):
+        try:
+            valid_items.append(schema.model_validate(item).model_dump(exclude_none=True))
+        except ValidationError as e:
+            logger.warning(f"Dropping invalid {schema.__name__} at position {index}: {e.error_count()} errors")
+    return valid_items
+
+def parse_structured_items(text: str, key: str, schema: Type[BaseModel]) -> List[Dict[str, Any]]:
+    """
+    Parse the items of a JSON-mode response.
+    
+    JSON mode responses are a single JSON object, but any JSON object embedded in
+    text is also accepted so the parser works with models that ignore the mode.
+    
+    Args:
+        text (str): Response text
+        key (str): Name of the array holding the items (e.g. "flashcards")
+        schema (Type[BaseModel]): Schema every item must match
+        
+    Returns:
+        List[Dict[str, Any]]: Valid items, empty if no array was found
+    """
+    try:
+        documents = [json.loads(text)]
+    except json.JSONDecodeError:
+        documents = extract_json_objects(text)
+    
+    for document in documents:
+        if isinstance(document, dict) and isinstance(document.get(key), list):
+            return validate_items(document[key], schema)
+    
+    logger.warning(f"No valid {key} JSON found in structured response")
+    return []
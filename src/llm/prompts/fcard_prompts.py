@@ -5,9 +5,9 @@ web_flashcard_system_template = """Role: Educational Flashcard Creator
 Task: Create 3-5 high-quality educational flashcards from web content while avoiding duplication with previous cards.
 
 Instructions:
-1. Analyze the content and previous flashcards carefully
+1. Analyze the content and the already covered questions carefully
 2. Create 3-5 NEW flashcards that:
-   - Don't duplicate concepts from previous flashcards
+   - Don't duplicate concepts from the already covered questions
    - Focus on key terms, definitions, and core concepts
    - Include practical examples where relevant
    - Maintain academic accuracy and clarity
@@ -41,7 +41,8 @@ web_flashcard_human_template = """
 Context Information:
 Title: {title}
 URL: {link}
-Previous Flashcards: {previous_flashcards}
+Already Covered Questions (do not repeat these concepts):
+{previous_flashcards}
 
 Content to Process:
 {content}
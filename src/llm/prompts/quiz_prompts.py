@@ -4,7 +4,7 @@ quiz_system_template = """Role: Educational Quiz Generator
 Task: Create a multiple-choice quiz based on the provided flashcards.
 
 Instructions:
-1. Create exactly 5 multiple-choice questions based on the flashcards content
+1. Create exactly {num_questions} multiple-choice questions based on the flashcards content
 2. Each question must:
    - Be clear and specific
    - Have exactly 4 options (A, B, C, D)
@@ -46,5 +46,5 @@ quiz_human_template = """
 Context:
 Previous Flashcards: {flashcards}
 
-Generate a 5-question multiple-choice quiz based on these flashcards. Remember to include the image URL for image-based flashcards.
+Generate a {num_questions}-question multiple-choice quiz based on these flashcards. Remember to include the image URL for image-based flashcards.
 """
@@ -0,0 +1,17 @@
+"""Prompts for repairing malformed JSON responses"""
+
+repair_system_template = """Role: JSON Repair Tool
+Task: Rewrite a malformed model response as one valid JSON object.
+
+Instructions:
+1. Keep the content of the response, do not add, remove or rewrite items
+2. Fix the syntax only: quotes, commas, brackets and escaping
+3. Drop the last item if it was cut off before it was complete
+4. The JSON object must follow this structure:
+{expected_format}
+5. Return ONLY the JSON object, without explanations or code fences"""
+
+repair_human_template = """Malformed response:
+{response}
+
+Valid JSON:"""
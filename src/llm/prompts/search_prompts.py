@@ -49,3 +49,47 @@ Visual Search Tip:
 queries_human_template = """
 Topic: {query}
 {num_queries} Generated Queries:"""
+
+# Content Summarization Prompt (map step, one call per chunk)
+summary_template = """
+Role: Educational Content Synthesizer
+Goal: Create a comprehensive summary optimized for flashcard generation
+
+Instructions:
+1. IGNORE all website metadata, navigation elements, and non-content related text
+2. Focus ONLY on the main content of the article/document
+3. Create a summary that preserves:
+   - Key terms and their precise definitions
+   - Core concepts and principles
+   - Important relationships between ideas
+   - Significant examples and applications
+   - Essential technical details
+   - Relevant numerical data
+4. Structure the information to facilitate flashcard creation
+5. Maintain academic accuracy and terminology
+
+Content to summarize:
+{text}
+
+Educational summary (focus on key concepts):
+"""
+
+# Summary Combination Prompt (reduce step over chunk summaries)
+combine_summaries_template = """
+Role: Educational Content Synthesizer
+Goal: Merge partial summaries of one document into a single summary optimized for flashcard generation
+
+Instructions:
+1. The partial summaries below cover consecutive sections of the same document
+2. Merge them into one coherent summary, keeping the original order of ideas
+3. Remove repeated information but keep every distinct:
+   - Key term and its precise definition
+   - Core concept and principle
+   - Significant example, application and numerical data
+4. Maintain academic accuracy and terminology
+
+Partial summaries:
+{text}
+
+Combined educational summary (focus on key concepts):
+"""
@@ -1,16 +1,61 @@
 import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import httpx
+from langchain_core.runnables import Runnable
 from langchain_openai import ChatOpenAI
 from src.core.config import config
+from src.core.config.config import get_openai_api_key
+from src.llm.cache.llm_cache import get_llm_cache
+
+# Maximum number of ChatOpenAI clients kept in the registry
+MAX_REGISTERED_MODELS = 64
+
+_registry: "OrderedDict[tuple, ChatOpenAI]" = OrderedDict()
+_registry_lock = threading.Lock()
+_http_client: Optional[httpx.Client] = None
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Returns the HTTP client shared by every chat model.
 
-def get_openai_chat_model(model_name: str, max_tokens : int = 1024) -> ChatOpenAI:
+    All models reuse the same connection pool, so connections to the inference
+    endpoint stay alive across chains, sessions and script threads.
     """
-    Initializes and returns a ChatOpenAI language model.
+    global _http_client
+    with _registry_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return _http_client
+
+
+def clear_chat_model_registry():
+    """Drops every registered chat model, they are rebuilt on next use."""
+    with _registry_lock:
+        _registry.clear()
+
+
+def get_openai_chat_model(model_name: str, max_tokens : int = 1024, cache: Optional[bool] = None) -> ChatOpenAI:
+    """
+    Returns a ChatOpenAI language model from the process-wide registry.
 
     This function gets the OpenAI API key and base URL from the application's
     configuration. The configuration is managed through the core.config module.
+    Models are registered by name, parameters and credentials: building a chain
+    reuses an existing client unless the credentials changed, and every client
+    shares the same HTTP connection pool.
 
     Args:
         model_name (str): Name of the model to use (e.g., "Meta-Llama-3.1-8B-Instruct")
+        max_tokens (int): Maximum number of tokens to generate
+        cache (Optional[bool]): Whether to cache responses in the persistent LLM cache,
+            defaults to the LLM_CACHE_ENABLED setting
 
     Returns:
         ChatOpenAI: An initialized ChatOpenAI object ready for use.
@@ -18,28 +63,68 @@ def get_openai_chat_model(model_name: str, max_tokens : int = 1024) -> ChatOpenA
     Raises:
         ValueError: If the OpenAI credentials are not properly configured.
     """
-    
-    # Get credentials from config
-    config.reload()
-    api_key, base_url = config.get_openai_credentials()
+
+    # Get credentials without reloading the whole configuration
+    api_key = get_openai_api_key()
+    _, base_url = config.get_openai_credentials()
 
     if not api_key:
         raise ValueError("OpenAI API key is not configured in the application settings.")
 
-    # Initialize ChatOpenAI with parameters
-    llm = ChatOpenAI(
-        name=model_name,
-        model_name=model_name,
-        temperature=0.3,
-        max_tokens=max_tokens,
-        timeout=config.get_inference_timeout(),
-        max_retries=3,
-        openai_api_key=api_key,
-        base_url=base_url if base_url else None,
+    if cache is None:
+        cache = config.is_llm_cache_enabled()
+
+    key = (
+        model_name,
+        max_tokens,
+        bool(cache),
+        config.get_inference_timeout(),
+        base_url,
+        hashlib.sha256(api_key.encode("utf-8")).hexdigest(),
     )
+    http_client = get_http_client()
+
+    with _registry_lock:
+        llm = _registry.get(key)
+        if llm is not None:
+            _registry.move_to_end(key)
+            return llm
+
+        # Initialize ChatOpenAI with parameters
+        llm = ChatOpenAI(
+            name=model_name,
+            model_name=model_name,
+            temperature=0.3,
+            max_tokens=max_tokens,
+            timeout=config.get_inference_timeout(),
+            max_retries=3,
+            openai_api_key=api_key,
+            base_url=base_url if base_url else None,
+            cache=get_llm_cache() if cache else None,
+            http_client=http_client,
+        )
+
+        _registry[key] = llm
+        if len(_registry) > MAX_REGISTERED_MODELS:
+            _registry.popitem(last=False)
 
     return llm
 
+def with_json_mode(llm: ChatOpenAI) -> Runnable:
+    """
+    Binds the OpenAI-compatible JSON mode to a chat model.
+
+    The endpoint then constrains generations to a single JSON object. The prompt
+    must still describe the expected JSON structure.
+
+    Args:
+        llm (ChatOpenAI): Chat model from get_openai_chat_model
+
+    Returns:
+        Runnable: The model with response_format set to json_object
+    """
+    return llm.bind(response_format={"type": "json_object"})
+
 if __name__ == "__main__":
     # Example usage:
     model = get_openai_chat_model("Meta-Llama-3.1-8B-Instruct")
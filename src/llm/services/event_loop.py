@@ -0,0 +1,57 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+
+class BackgroundLoop:
+    """Asyncio event loop running forever on a daemon thread.
+
+    Long-lived async clients (aiohttp sessions, semaphores) are bound to the loop
+    they were created on, so they live here and sync callers such as the Streamlit
+    script threads submit coroutines to it instead of calling asyncio.run.
+    """
+
+    def __init__(self, name: str = "learnicity-loop"):
+        """Start the loop thread"""
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Thread target running the loop"""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        """Schedule a coroutine on the loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and wait for its result"""
+        if self.in_loop():
+            raise RuntimeError("BackgroundLoop.run cannot be called from the loop thread")
+        return self.submit(coro).result(timeout)
+
+    async def arun(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Await a coroutine on the loop from another event loop"""
+        if self.in_loop():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def in_loop(self) -> bool:
+        """Whether the caller runs on the loop thread"""
+        return threading.current_thread() is self._thread
+
+
+_background_loop: Optional[BackgroundLoop] = None
+_background_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Get the process-wide background loop, starting it on first use"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            _background_loop = BackgroundLoop()
+        return _background_loop
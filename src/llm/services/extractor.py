@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Optional
+
+from src.core.config import config, logger
+from src.llm.text.readability import extract_main_text
+
+
+class ContentExtractor:
+    """Extracts the main content of fetched pages on a pool of worker processes.
+
+    Parsing HTML is CPU-bound and holds the GIL, so pages fetched by concurrent
+    queries are cleaned in separate processes instead of queueing on the script
+    threads. Workers are spawned (not forked, the app runs many threads) on the
+    first extraction and reused afterwards. Spawned workers import the main module
+    again, so scripts using the extractor need an ``if __name__ == "__main__"``
+    guard (the streamlit entry point has one). Every extraction logs how much of
+    the page was boilerplate.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """
+        Args:
+            max_workers (int): Worker processes, 0 extracts in the calling thread
+        """
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        """Start the worker processes on first use"""
+        if self.max_workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def extract(self, html: str, url: str = "") -> Dict[str, Any]:
+        """Extract the main text of a page
+
+        Args:
+            html (str): HTML of the page
+            url (str): URL of the page, for the shrink report
+
+        Returns:
+            Dict[str, Any]: "text", "page_chars" and "text_chars", see extract_main_text
+        """
+        executor = self._get_executor()
+        if executor is None:
+            result = extract_main_text(html)
+        else:
+            try:
+                result = executor.submit(extract_main_text, html).result()
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                result = extract_main_text(html)
+
+        self._log_shrink(result, url)
+        return result
+
+    async def aextract(self, html: str, url: str = "") -> Dict[str, Any]:
+        """Extract the main text of a page without blocking the event loop
+
+        Same as extract, inline extractions run on a worker thread.
+        """
+        executor = self._get_executor()
+        if executor is None:
+            result = await asyncio.to_thread(extract_main_text, html)
+        else:
+            try:
+                result = await asyncio.wrap_future(executor.submit(extract_main_text, html))
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                result = await asyncio.to_thread(extract_main_text, html)
+
+        self._log_shrink(result, url)
+        return result
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Forget a broken pool so the next extraction starts a new one"""
+        logger.warning("Extraction worker died, restarting the pool")
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+
+    def _log_shrink(self, result: Dict[str, Any], url: str):
+        """Log how much of a page was boilerplate"""
+        page_chars = result["page_chars"]
+        shrink = 1 - result["text_chars"] / page_chars if page_chars else 0
+        logger.info(f"Extracted main content of {url}: {page_chars} -> {result['text_chars']} chars ({shrink:.0%} removed)")
+
+    def close(self):
+        """Stop the worker processes"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_content_extractor: Optional[ContentExtractor] = None
+_content_extractor_lock = threading.Lock()
+
+
+def get_content_extractor() -> ContentExtractor:
+    """Get the process-wide content extractor, creating it on first use"""
+    global _content_extractor
+    with _content_extractor_lock:
+        if _content_extractor is None:
+            _content_extractor = ContentExtractor(max_workers=config.get_extract_max_workers())
+        return _content_extractor
@@ -0,0 +1,190 @@
+import os
+import codecs
+import asyncio
+import aiohttp
+import threading
+from typing import List, Dict, Any, Optional
+
+from src.core.config import config, logger
+from src.llm.services.event_loop import BackgroundLoop, get_background_loop
+from src.llm.cache.page_cache import PageCache, get_page_cache
+
+DEFAULT_HEADERS = {
+    "User-Agent": os.getenv(
+        "USER_AGENT",
+        "Mozilla/5.0 (compatible; Learnicity/0.1; +https://github.com/blazzbyte/learnicity)"
+    ),
+    "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.8,es;q=0.6",
+}
+
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+
+
+def decode_body(body: bytes, charset: Optional[str]) -> str:
+    """Decode a response body with its declared charset, utf-8 if it is missing or unknown"""
+    try:
+        encoding = codecs.lookup(charset).name if charset else "utf-8"
+    except LookupError:
+        encoding = "utf-8"
+    return body.decode(encoding, errors="replace")
+
+
+class PageFetcher:
+    """Fetches web pages through one long-lived aiohttp connection pool.
+
+    The session lives on a background event loop so connections are kept alive
+    and reused across queries, sessions and script threads. The pool caps the
+    total and per-host number of connections, every request has a deadline and
+    bodies are streamed and cut at ``max_bytes``. With a page cache, known pages
+    are revalidated with conditional requests and a 304 reuses the stored body.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 20,
+        max_per_host: int = 4,
+        timeout: float = 15,
+        max_bytes: int = 2_000_000,
+        headers: Optional[Dict[str, str]] = None,
+        loop: Optional[BackgroundLoop] = None,
+        cache: Optional[PageCache] = None
+    ):
+        """Initialize the fetcher, the session is created on first use"""
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.headers = headers or DEFAULT_HEADERS
+        self.loop = loop or get_background_loop()
+        self.cache = cache
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session, creating it on the background loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=min(5, self.timeout))
+            )
+        return self._session
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> tuple[bytes, bool]:
+        """Stream the response body up to max_bytes
+
+        Returns:
+            tuple[bytes, bool]: The body and whether it was truncated
+        """
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                return b"".join(chunks)[:self.max_bytes], True
+        return b"".join(chunks), False
+
+    async def _fetch(self, url: str) -> Dict[str, Any]:
+        """Fetch a single URL on the background loop"""
+        try:
+            cached = await asyncio.to_thread(self.cache.get, url) if self.cache else None
+            headers = PageCache.conditional_headers(cached) if cached else None
+
+            session = await self._get_session()
+            async with session.get(url, headers=headers, allow_redirects=True) as response:
+                if cached and response.status == 304:
+                    return dict(cached, status=304)
+
+                response.raise_for_status()
+
+                content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                if content_type and content_type not in TEXT_CONTENT_TYPES:
+                    return {"url": url, "error": f"Unsupported content type: {content_type}"}
+
+                if response.content_length and response.content_length > self.max_bytes:
+                    logger.warning(f"Response from {url} exceeds {self.max_bytes} bytes, truncating")
+
+                body, truncated = await self._read_body(response)
+                page = {
+                    "url": str(response.url),
+                    "status": response.status,
+                    "content_type": content_type or "text/html",
+                    "text": decode_body(body, response.charset),
+                    "truncated": truncated
+                }
+
+                if self.cache and not truncated:
+                    await asyncio.to_thread(
+                        self.cache.put,
+                        url,
+                        page,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified")
+                    )
+                return page
+        except asyncio.TimeoutError:
+            return {"url": url, "error": f"Timed out after {self.timeout} seconds"}
+        except aiohttp.ClientError as e:
+            return {"url": url, "error": str(e)}
+        except Exception as e:
+            return {"url": url, "error": f"An unexpected error occurred: {e}"}
+
+    async def _fetch_many(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Fetch several URLs concurrently, keeping their order"""
+        return await asyncio.gather(*(self._fetch(url) for url in urls))
+
+    def fetch(self, url: str) -> Dict[str, Any]:
+        """
+        Fetch a single URL from synchronous code.
+
+        Args:
+            url: The URL to fetch.
+
+        Returns:
+            A dictionary with the final 'url', 'status', 'content_type', 'text' and
+            'truncated' keys, or with 'url' and 'error' if the fetch failed. The status
+            is 304 when the page was revalidated and served from the page cache.
+        """
+        return self.loop.run(self._fetch(url))
+
+    def fetch_many(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Fetch several URLs concurrently from synchronous code, keeping their order"""
+        return self.loop.run(self._fetch_many(urls))
+
+    async def afetch(self, url: str) -> Dict[str, Any]:
+        """Fetch a single URL from any event loop"""
+        return await self.loop.arun(self._fetch(url))
+
+    async def _close(self):
+        """Close the pooled session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def close(self):
+        """Close the pooled session and its connections"""
+        self.loop.run(self._close())
+
+
+_page_fetcher: Optional[PageFetcher] = None
+_page_fetcher_lock = threading.Lock()
+
+
+def get_page_fetcher() -> PageFetcher:
+    """Get the process-wide page fetcher, creating it on first use"""
+    global _page_fetcher
+    with _page_fetcher_lock:
+        if _page_fetcher is None:
+            _page_fetcher = PageFetcher(
+                max_connections=config.get_fetch_max_connections(),
+                max_per_host=config.get_fetch_max_per_host(),
+                timeout=config.get_fetch_timeout(),
+                max_bytes=config.get_fetch_max_bytes(),
+                cache=get_page_cache() if config.is_page_cache_enabled() else None
+            )
+        return _page_fetcher
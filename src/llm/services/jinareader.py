@@ -2,37 +2,171 @@ import os
 import asyncio
 import aiohttp
 import json
-from typing import List, Dict, Any
+import random
+import threading
+from typing import List, Dict, Any, Optional
+
+from src.llm.services.event_loop import BackgroundLoop, get_background_loop
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def default_headers() -> Dict[str, str]:
+    """Default Jina Reader headers."""
+    return {
+        "Accept": "application/json",
+        "Authorization": f"Bearer {os.getenv('JINA_API_kEY')}",  # Replace with actual token if needed
+        "X-Retain-Images": "none"
+    }
+
+async def read_response(url: str, response: aiohttp.ClientResponse) -> Dict[str, Any]:
+    """Reads a response into a result dictionary."""
+    try:
+        response.raise_for_status()
+        if response.headers['Content-Type'].startswith('application/json'):
+            data = await response.json()
+        else:
+            data = await response.text()
+        return {"url": url, "data": data}
+    except aiohttp.ClientError as e:
+        return {"url": url, "error": str(e)}
+    except json.JSONDecodeError as e:
+        return {"url": url, "error": f"JSON decoding error: {e}"}
+    except KeyError as e:
+        return {"url": url, "error": f"Missing key in response headers: {e}"}
+    except Exception as e:
+        return {"url": url, "error": f"An unexpected error occurred: {e}"}
 
 async def fetch_url(url: str, headers: Dict[str, str] = None, session: aiohttp.ClientSession = None) -> Dict[str, Any]:
     """Fetches data from a single URL asynchronously."""
     if headers is None:
-        headers = {
-            "Accept": "application/json",
-            "Authorization": f"Bearer {os.getenv('JINA_API_kEY')}",  # Replace with actual token if needed
-            "X-Retain-Images": "none"
-        }
+        headers = default_headers()
     async with session.get(url, headers=headers) as response:
+        return await read_response(url, response)
+
+class ReaderClient:
+    """
+    Long-lived Jina Reader client.
+
+    The aiohttp session lives on a background event loop, so DNS, TLS and
+    connections are reused across calls instead of paying for a new loop and
+    session per batch. Requests share a concurrency semaphore, are retried with
+    exponential backoff on 429/5xx responses and each URL has an overall deadline.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "https://r.jina.ai/",
+        max_concurrency: int = 8,
+        timeout: float = 30,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        loop: Optional[BackgroundLoop] = None
+    ):
+        """
+        Args:
+            base_url: Reader endpoint the target URLs are appended to.
+            max_concurrency: Maximum number of requests in flight.
+            timeout: Deadline in seconds for each URL, retries included.
+            max_retries: Number of retries on 429/5xx responses, connection errors and timeouts.
+            backoff: Base delay in seconds, doubled on every retry.
+            loop: Background loop running the client, defaults to the shared one.
+        """
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.loop = loop or get_background_loop()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Gets the pooled session, creating it on the background loop."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency, ttl_dns_cache=300)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _retry_delay(self, attempt: int, response: Optional[aiohttp.ClientResponse] = None) -> float:
+        """Delay before the next attempt, honoring Retry-After when present."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    async def _fetch_with_retry(self, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Fetches a single URL, retrying on 429/5xx, connection errors and timeouts."""
+        session = await self._get_session()
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                async with self._semaphore:
+                    async with session.get(url, headers=headers) as response:
+                        if response.status not in RETRY_STATUSES or last_attempt:
+                            return await read_response(url, response)
+                        delay = self._retry_delay(attempt, response)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if last_attempt:
+                    return {"url": url, "error": str(e) or type(e).__name__}
+                delay = self._retry_delay(attempt)
+            except aiohttp.ClientError as e:
+                return {"url": url, "error": str(e)}
+            await asyncio.sleep(delay)
+
+    async def _fetch(self, url: str, headers: Dict[str, str]) -> Dict[str, Any]:
+        """Fetches a single URL within its deadline, returning errors instead of raising them."""
         try:
-            response.raise_for_status()
-            if response.headers['Content-Type'] == 'application/json':
-                data = await response.json()
-            else:
-                data = await response.text()
-            return {"url": url, "data": data}
-        except aiohttp.ClientError as e:
-            return {"url": url, "error": str(e)}
-        except json.JSONDecodeError as e:
-            return {"url": url, "error": f"JSON decoding error: {e}"}
-        except KeyError as e:
-            return {"url": url, "error": f"Missing key in response headers: {e}"}
+            return await asyncio.wait_for(self._fetch_with_retry(url, headers), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return {"url": url, "error": f"Timed out after {self.timeout} seconds"}
         except Exception as e:
             return {"url": url, "error": f"An unexpected error occurred: {e}"}
 
+    async def _fetch_many(self, urls: List[str], headers: Optional[Dict[str, str]]) -> List[Dict[str, Any]]:
+        """Fetches several URLs concurrently, keeping their order."""
+        if headers is None:
+            headers = default_headers()
+        links = [self.base_url + url for url in urls]
+        return await asyncio.gather(*(self._fetch(link, headers) for link in links))
+
+    def fetch_urls(self, urls: List[str], headers: Dict[str, str] = None) -> List[Dict[str, Any]]:
+        """Fetches a list of URLs from synchronous code."""
+        return self.loop.run(self._fetch_many(urls, headers))
+
+    async def afetch_urls(self, urls: List[str], headers: Dict[str, str] = None) -> List[Dict[str, Any]]:
+        """Fetches a list of URLs from any event loop."""
+        return await self.loop.arun(self._fetch_many(urls, headers))
+
+    async def _close(self):
+        """Closes the pooled session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def close(self):
+        """Closes the pooled session and its connections."""
+        self.loop.run(self._close())
+
+_reader_client: Optional[ReaderClient] = None
+_reader_client_lock = threading.Lock()
+
+def get_reader_client() -> ReaderClient:
+    """Gets the process-wide reader client, creating it on first use."""
+    global _reader_client
+    with _reader_client_lock:
+        if _reader_client is None:
+            _reader_client = ReaderClient()
+        return _reader_client
+
 def fetch_urls(urls: List[str], headers: Dict[str, str] = None) -> List[Dict[str, Any]]:
     """
     Fetches data from a list of URLs synchronously, using asynchronous requests internally.
 
+    The requests run on the shared ReaderClient, so repeated calls reuse its
+    event loop and connections.
+
     Args:
         urls: A list of URLs to fetch data from.
         headers: A dictionary of HTTP headers to include in the requests.
@@ -45,14 +179,7 @@ def fetch_urls(urls: List[str], headers: Dict[str, str] = None) -> List[Dict[str
         raise TypeError("urls must be a list")
     if not urls:
         raise ValueError("urls cannot be empty")
-    links = ["https://r.jina.ai/" + url for url in urls]
-    async def run_async():
-        async with aiohttp.ClientSession() as session:
-            tasks = [fetch_url(url, headers, session) for url in links]
-            results = await asyncio.gather(*tasks)
-            return results
-
-    return asyncio.run(run_async())
+    return get_reader_client().fetch_urls(urls, headers)
 
 def main(urls: List[str]):
     """
@@ -0,0 +1,259 @@
+import time
+import uuid
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.core.config import config, logger
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function when its job was cancelled"""
+
+
+class Job:
+    """A unit of background work, its progress and its outcome.
+
+    Job functions receive their Job as first argument. They report progress
+    with ``report`` and call ``check_cancelled`` between steps, which raises
+    JobCancelled once the job was cancelled. Everything the UI reads (status,
+    progress, partial result, result) is plain data safe to read from any thread.
+    """
+
+    def __init__(self, name: str, key: Optional[Hashable] = None):
+        """
+        Args:
+            name (str): Kind of work, for the logs
+            key (Optional[Hashable]): Identity of the work, see JobManager.submit
+        """
+        self.id = uuid.uuid4().hex
+        self.name = name
+        self.key = key
+        self.status = PENDING
+        self.completed = 0
+        self.total: Optional[int] = None
+        self.message = ""
+        self.partial: Any = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.subscribers = 1
+        self.future: Optional[Future] = None
+        self._cancel_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job is done, failed or cancelled"""
+        return self.status in FINISHED_STATES
+
+    @property
+    def cancel_requested(self) -> bool:
+        """Whether the job was asked to stop"""
+        return self._cancel_event.is_set()
+
+    def report(
+        self,
+        completed: Optional[int] = None,
+        total: Optional[int] = None,
+        message: Optional[str] = None,
+        partial: Any = None
+    ):
+        """Report the progress of the job
+
+        Args:
+            completed (Optional[int]): Steps completed so far
+            total (Optional[int]): Total steps, if known
+            message (Optional[str]): Description of the current step
+            partial (Any): Partial result the UI can show while the job runs
+        """
+        if completed is not None:
+            self.completed = completed
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message
+        if partial is not None:
+            self.partial = partial
+
+    def check_cancelled(self):
+        """Stop the job function if the job was cancelled
+
+        Raises:
+            JobCancelled: If the job was cancelled
+        """
+        if self._cancel_event.is_set():
+            raise JobCancelled(f"Job {self.id} was cancelled")
+
+
+class JobManager:
+    """Runs jobs on a bounded pool of worker threads, away from the script threads.
+
+    Streamlit script runs only submit jobs and poll them by id, so reruns neither
+    interrupt nor repeat the work and no server thread waits for a generation.
+    Jobs submitted with the key of an unfinished job join it instead of running
+    again; a shared job is only cancelled once every subscriber cancelled it.
+    Finished jobs are kept for ``retention`` seconds so a session polling late
+    still gets the result. Job functions must not touch st.session_state: build
+    chains in the script thread and only run them here.
+    """
+
+    def __init__(self, max_workers: int = 4, retention: float = 900):
+        """
+        Args:
+            max_workers (int): Jobs running at the same time, others wait in line
+            retention (float): Seconds a finished job stays available
+        """
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._keys: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name: str, fn: Callable[..., Any], *args, key: Optional[Hashable] = None, **kwargs) -> str:
+        """Submit a job
+
+        Args:
+            name (str): Kind of work, for the logs
+            fn (Callable[..., Any]): Job function, called with the Job and then *args and **kwargs
+            key (Optional[Hashable]): Identity of the work, an unfinished job with
+                the same key is joined instead of starting another one
+
+        Returns:
+            str: Id of the job
+        """
+        with self._lock:
+            self._prune()
+            job_id = self._join(key) if key is not None else None
+            if job_id is not None:
+                return job_id
+
+            job = Job(name, key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._keys[key] = job.id
+            job.future = self._executor.submit(self._run, job, fn, args, kwargs)
+            return job.id
+
+    def join(self, key: Hashable) -> Optional[str]:
+        """Subscribe to the unfinished job of a key, if there is one
+
+        Lets callers skip building the arguments of a job that is already running.
+
+        Args:
+            key (Hashable): Identity of the work, see submit
+
+        Returns:
+            Optional[str]: Id of the joined job, None if no unfinished job has the key
+        """
+        with self._lock:
+            self._prune()
+            return self._join(key)
+
+    def _join(self, key: Hashable) -> Optional[str]:
+        """Subscribe to the unfinished job of a key, the lock must be held"""
+        job_id = self._keys.get(key)
+        if job_id is None:
+            return None
+        job = self._jobs[job_id]
+        job.subscribers += 1
+        logger.info(f"Joined {job.name} job {job.id} ({job.subscribers} subscribers)")
+        return job.id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id, None if it is unknown or expired"""
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Unsubscribe from a job, cancelling it when nobody else waits for it
+
+        A pending job is dropped from the queue, a running job stops at its next
+        check_cancelled.
+
+        Returns:
+            bool: Whether the job was cancelled
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job.subscribers -= 1
+            if job.subscribers > 0:
+                return False
+
+            job._cancel_event.set()
+            self._release_key(job)
+            if job.future is not None and job.future.cancel():
+                self._finish(job, CANCELLED)
+        logger.info(f"Cancelled {job.name} job {job_id}")
+        return True
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: dict):
+        """Run a job function and record its outcome"""
+        with self._lock:
+            if job.cancel_requested:
+                self._finish(job, CANCELLED)
+                return
+            job.status = RUNNING
+
+        start = time.perf_counter()
+        try:
+            result = fn(job, *args, **kwargs)
+        except JobCancelled:
+            with self._lock:
+                self._finish(job, CANCELLED)
+            return
+        except Exception as e:
+            logger.error(f"Error in {job.name} job {job.id}: {str(e)}")
+            with self._lock:
+                job.error = str(e)
+                self._finish(job, FAILED)
+            return
+
+        with self._lock:
+            job.result = result
+            self._finish(job, CANCELLED if job.cancel_requested else DONE)
+        logger.info(f"Finished {job.name} job {job.id} in {time.perf_counter() - start:.1f}s")
+
+    def _finish(self, job: Job, status: str):
+        """Mark a job finished, the lock must be held"""
+        job.status = status
+        job.finished_at = time.time()
+        self._release_key(job)
+
+    def _release_key(self, job: Job):
+        """Let new submissions of the key of a job start afresh, the lock must be held"""
+        if job.key is not None and self._keys.get(job.key) == job.id:
+            del self._keys[job.key]
+
+    def _prune(self):
+        """Forget the jobs finished for longer than the retention, the lock must be held"""
+        expiry = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < expiry]:
+            del self._jobs[job_id]
+
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Get the process-wide job manager, creating it on first use"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager(
+                max_workers=config.get_job_max_workers(),
+                retention=config.get_job_retention()
+            )
+        return _job_manager
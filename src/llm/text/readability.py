@@ -0,0 +1,198 @@
+"""Readability-style extraction of the main content of an HTML page
+
+This module only depends on beautifulsoup4 and the standard library, so it can
+be imported by worker processes without loading the application configuration.
+"""
+
+import re
+from typing import Dict, Optional, Set
+
+from bs4 import BeautifulSoup, Tag
+
+# Elements without visible text
+HIDDEN_TAGS = ["script", "style", "noscript", "template", "svg", "canvas", "iframe", "object"]
+
+# Elements of page chrome, which only hold the main content on badly structured pages
+CHROME_TAGS = ["nav", "header", "footer", "aside", "form", "button", "input", "select", "textarea"]
+
+# ARIA roles of page chrome
+REMOVED_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search", "menu", "menubar", "dialog"}
+
+# class/id hints of boilerplate blocks and of content blocks
+NEGATIVE_PATTERN = re.compile(
+    r"comment|footer|footnote-nav|masthead|nav|sidebar|side-bar|menu|breadcrumb|share|social|"
+    r"cookie|consent|banner|advert|\bads?\b|promo|sponsor|related|recommend|newsletter|"
+    r"subscribe|popup|modal|skip|toolbar|pagination|widget",
+    re.IGNORECASE
+)
+POSITIVE_PATTERN = re.compile(r"article|content|main|post|entry|story|body|text|prose", re.IGNORECASE)
+
+# Block elements whose text is kept on its own line
+BLOCK_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6", "p", "li", "pre", "blockquote", "dd", "dt", "td", "th", "figcaption"]
+
+# Paragraphs shorter than this (in characters) do not count toward a container score
+MIN_PARAGRAPH_CHARS = 25
+
+# Below this share of the page text, the extraction is assumed to have missed the content
+MIN_EXTRACTED_RATIO = 0.05
+
+# Chrome holding more than this share of the page text is a layout wrapper, not chrome
+MAX_REMOVED_RATIO = 0.5
+
+
+def _hints(element: Tag) -> str:
+    """class and id attributes of an element, as one string"""
+    classes = element.get("class") or []
+    if isinstance(classes, str):
+        classes = [classes]
+    return " ".join(classes) + " " + (element.get("id") or "")
+
+
+def _is_boilerplate(element: Tag) -> bool:
+    """Whether an element is page chrome rather than content"""
+    if element.get("role") in REMOVED_ROLES:
+        return True
+    if element.get("aria-hidden") == "true" or element.has_attr("hidden"):
+        return True
+    hints = _hints(element)
+    return bool(NEGATIVE_PATTERN.search(hints)) and not POSITIVE_PATTERN.search(hints)
+
+
+def _collapse(text: str) -> str:
+    """Collapse whitespace inside lines and drop empty lines"""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _link_density(element: Tag) -> float:
+    """Share of the text of an element that is link text"""
+    text_length = len(element.get_text(" ", strip=True))
+    if not text_length:
+        return 1.0
+    link_length = sum(len(link.get_text(" ", strip=True)) for link in element.find_all("a"))
+    return min(1.0, link_length / text_length)
+
+
+def _main_landmark(root: Tag) -> Optional[Tag]:
+    """Longest <article>, <main> or role="main" element, None if there is none"""
+    landmarks = root.find_all(["article", "main"]) + root.find_all(attrs={"role": "main"})
+    if not landmarks:
+        return None
+    return max(landmarks, key=lambda element: len(element.get_text(" ", strip=True)))
+
+
+def _remove_chrome(root: Tag, page_chars: int, protected: Set[int]):
+    """Remove the chrome elements and boilerplate blocks of a page
+
+    Class and id hints also match layout wrappers such as "layout has-sidebar"
+    or "menu-wrapper", so an element is kept when it contains the main content
+    (its id is in protected) or holds most of the page text.
+    """
+    for element in root.find_all(True):
+        if element.decomposed or id(element) in protected:
+            continue
+        if element.name not in CHROME_TAGS and not _is_boilerplate(element):
+            continue
+        if len(_collapse(element.get_text("\n"))) > MAX_REMOVED_RATIO * page_chars:
+            continue
+        element.decompose()
+
+
+def _best_candidate(root: Tag) -> Optional[Tag]:
+    """Container with the most paragraph text, scored the readability way
+
+    Every paragraph adds to its parent (and half to its grandparent) a score that
+    grows with its length and number of commas. Scores are then scaled down by the
+    link density of the container, so link lists lose against running text.
+    """
+    scores: Dict[int, float] = {}
+    elements: Dict[int, Tag] = {}
+
+    for paragraph in root.find_all(["p", "pre", "td", "blockquote"]):
+        text = paragraph.get_text(" ", strip=True)
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+
+        parent = paragraph.parent
+        for weight, ancestor in ((1.0, parent), (0.5, parent.parent if parent else None)):
+            if ancestor is None or not isinstance(ancestor, Tag):
+                continue
+            key = id(ancestor)
+            elements[key] = ancestor
+            scores[key] = scores.get(key, 0.0) + score * weight
+
+    if not scores:
+        return None
+
+    for key, element in elements.items():
+        scores[key] *= 1 - _link_density(element)
+        if POSITIVE_PATTERN.search(_hints(element)):
+            scores[key] *= 1.25
+
+    return elements[max(scores, key=scores.get)]
+
+
+def _block_text(element: Tag) -> str:
+    """Text of an element with one line per block, dropping link-only blocks
+
+    Content written outside block elements (text in bare <div>s separated by
+    <br>) would be lost, so the whole text of the element is used instead when
+    the blocks hold less than half of it.
+    """
+    full_text = _collapse(element.get_text("\n"))
+    blocks = element.find_all(BLOCK_TAGS)
+    if not blocks:
+        return full_text
+
+    lines = []
+    for block in blocks:
+        # Nested blocks (a <p> in an <li>) are emitted by the innermost one
+        if block.find(BLOCK_TAGS):
+            continue
+        text = " ".join(block.get_text(" ").split())
+        if text and _link_density(block) < 0.5:
+            lines.append(text)
+    text = "\n".join(lines)
+    return text if len(text) >= len(full_text) / 2 else full_text
+
+
+def extract_main_text(html: str) -> Dict[str, object]:
+    """Extract the main content of an HTML page as plain text
+
+    Scripts, styles, navigation, headers, footers, sidebars, forms and blocks
+    whose class or id marks them as boilerplate are removed, except the ones
+    containing the main content or most of the page text. The main content
+    is then the <article>/<main> element when the page has one, otherwise
+    the container holding the most paragraph text. When the extraction finds
+    almost nothing, the whole visible text of the page is returned.
+
+    Args:
+        html (str): HTML of the page
+
+    Returns:
+        Dict[str, object]: "text" (the extracted text), "page_chars" (length of
+            all the visible text of the page) and "text_chars" (length of the
+            extracted text)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    root = soup.body or soup
+    for element in root.find_all(HIDDEN_TAGS):
+        element.decompose()
+    page_text = _collapse(root.get_text("\n"))
+
+    # The landmark, or the best container before cleaning, and their ancestors survive it
+    landmark = _main_landmark(root)
+    content = landmark or _best_candidate(root)
+    protected = {id(element) for element in content.parents} if content is not None else set()
+    if landmark is not None:
+        protected.add(id(landmark))
+    _remove_chrome(root, len(page_text), protected)
+
+    candidate = landmark or _best_candidate(root)
+    text = _block_text(candidate) if candidate is not None else ""
+    if len(text) < MIN_EXTRACTED_RATIO * len(page_text):
+        # Extraction missed the content, keep the whole page text instead
+        text = page_text
+
+    return {"text": text, "page_chars": len(page_text), "text_chars": len(text)}
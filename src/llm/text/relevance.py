@@ -0,0 +1,108 @@
+"""Lexical relevance scoring for selecting the chunks of a page worth summarizing"""
+
+import math
+from collections import Counter
+from typing import List
+
+from src.llm.text.similarity import tokenize
+
+# Function words of the supported languages (English and Spanish), which appear in
+# every chunk and would otherwise let any chunk match a query such as "the history of Rome"
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before
+being below between both but by can could did do does doing down during each few for
+from further had has have having he her here hers herself him himself his how i if in
+into is it its itself just me more most my myself no nor not now of off on once only
+or other our ours ourselves out over own same she should so some such than that the
+their theirs them themselves then there these they this those through to too under
+until up very was we were what when where which while who whom why will with would
+you your yours yourself yourselves
+al algo algunas algunos ante antes como con contra cual cuando de del desde donde
+durante e el ella ellas ellos en entre era eran es esa esas ese eso esos esta estaba
+estan este esto estos fue fueron ha han hasta hay la las le les lo los mas me mi mis
+mucho muy nada ni no nos nosotros o otra otras otro otros para pero poco por porque
+que quien se sea ser si sin sobre son su sus tambien te tiene tienen todo todos tu tus
+un una unas uno unos y ya yo
+""".split())
+
+
+def terms(text: str) -> List[str]:
+    """Split text into lowercase word tokens, without stopwords"""
+    return [token for token in tokenize(text) if token not in STOPWORDS]
+
+
+class BM25:
+    """Okapi BM25 scorer over a fixed set of chunks.
+
+    Scores reward chunks that contain the query terms, weighting rare terms more
+    and normalizing by chunk length, so navigation, comments and sidebars that do
+    not mention the query rank last.
+    """
+
+    def __init__(self, documents: List[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            documents (List[str]): Chunks to score
+            k1 (float): Term frequency saturation
+            b (float): Strength of the length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.term_counts = [Counter(terms(document)) for document in documents]
+        self.lengths = [sum(counts.values()) for counts in self.term_counts]
+        self.average_length = max(1.0, sum(self.lengths) / max(1, len(self.lengths)))
+
+        document_frequency = Counter()
+        for counts in self.term_counts:
+            document_frequency.update(counts.keys())
+        total = len(documents)
+        self.idf = {
+            term: math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequency.items()
+        }
+
+    def scores(self, query: str) -> List[float]:
+        """Score every chunk against a query
+
+        Args:
+            query (str): Topic or search query
+
+        Returns:
+            List[float]: One score per chunk, in chunk order
+        """
+        query_terms = set(terms(query))
+        scores = []
+        for counts, length in zip(self.term_counts, self.lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self.average_length)
+            for term in query_terms:
+                frequency = counts.get(term, 0)
+                if frequency:
+                    score += self.idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+            scores.append(score)
+        return scores
+
+
+def select_relevant_chunks(chunks: List[str], query: str, top_k: int) -> List[str]:
+    """Keep the top_k chunks most relevant to a query, in document order
+
+    Args:
+        chunks (List[str]): Chunks of a document, in order
+        query (str): Topic or search query
+        top_k (int): Number of chunks to keep
+
+    Returns:
+        List[str]: Selected chunks in their original order. Chunks that share no
+            term with the query are dropped, unless none match at all, in which
+            case the first top_k chunks are kept. A query made only of stopwords
+            cannot rank the chunks, so all of them are kept.
+    """
+    if len(chunks) <= top_k or not terms(query):
+        return list(chunks)
+
+    scores = BM25(chunks).scores(query)
+    ranked = sorted(range(len(chunks)), key=lambda index: (-scores[index], index))
+    selected = [index for index in ranked[:top_k] if scores[index] > 0]
+    if not selected:
+        return list(chunks[:top_k])
+    return [chunks[index] for index in sorted(selected)]
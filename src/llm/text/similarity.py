@@ -0,0 +1,80 @@
+"""Lexical similarity helpers for comparing short texts such as flashcards"""
+
+import re
+import zlib
+from typing import List
+
+import numpy as np
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return WORD_PATTERN.findall(text.lower())
+
+
+def hash_vectorize(texts: List[str], n_features: int = 4096) -> np.ndarray:
+    """Vectorize texts with hashed unigram and bigram counts
+
+    Features are hashed with crc32 so vectors are identical across processes, and
+    rows are L2-normalized so a dot product is the cosine similarity.
+
+    Args:
+        texts (List[str]): Texts to vectorize
+        n_features (int): Number of hashed features
+
+    Returns:
+        np.ndarray: Matrix of shape (len(texts), n_features)
+    """
+    matrix = np.zeros((len(texts), n_features), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = tokenize(text)
+        features = tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+        for feature in features:
+            matrix[row, zlib.crc32(feature.encode("utf-8")) % n_features] += 1
+
+    np.log1p(matrix, out=matrix)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+class NearDuplicateFilter:
+    """Incremental filter dropping texts too similar to the ones already kept.
+
+    Texts are compared against every kept text at once with a matrix product.
+    Feeding the same texts in the same order always keeps the same ones, whether
+    they arrive in one call or spread over several.
+    """
+
+    def __init__(self, threshold: float = 0.7, n_features: int = 4096):
+        """
+        Args:
+            threshold (float): Cosine similarity at or above which a text is a duplicate
+            n_features (int): Number of hashed features
+        """
+        self.threshold = threshold
+        self.n_features = n_features
+        self.kept = np.zeros((0, n_features), dtype=np.float32)
+
+    def filter(self, texts: List[str]) -> List[bool]:
+        """Check texts against the kept ones, keeping the new distinct texts
+
+        Args:
+            texts (List[str]): Texts in order
+
+        Returns:
+            List[bool]: Whether each text was kept
+        """
+        if not texts:
+            return []
+
+        vectors = hash_vectorize(texts, self.n_features)
+        keep = []
+        for vector in vectors:
+            is_duplicate = bool(len(self.kept)) and float(np.max(self.kept @ vector)) >= self.threshold
+            if not is_duplicate:
+                self.kept = np.vstack([self.kept, vector])
+            keep.append(not is_duplicate)
+        return keep
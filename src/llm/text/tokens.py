@@ -0,0 +1,110 @@
+"""Token counting for prompt budgeting"""
+
+import math
+import re
+from functools import lru_cache
+from typing import Optional
+
+import tiktoken
+
+from src.core.config import config, logger
+
+PIECE_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# Context window of each model served by the inference endpoint, in tokens.
+# Override with LLM_CONTEXT_WINDOWS when the endpoint serves longer contexts.
+MODEL_CONTEXT_WINDOWS = {
+    "Meta-Llama-3.1-8B-Instruct": 8192,
+    "Meta-Llama-3.1-70B-Instruct": 8192,
+    "Llama-3.2-11B-Vision-Instruct": 4096,
+}
+DEFAULT_CONTEXT_WINDOW = 4096
+
+# Share of the prompt budget kept free, since counts come from a tokenizer close
+# to (but not the same as) the Llama 3 one
+TOKEN_SAFETY_MARGIN = 0.1
+
+
+@lru_cache(maxsize=1)
+def get_encoding() -> Optional[tiktoken.Encoding]:
+    """Load the tokenizer once per process
+
+    cl100k_base is close to the Llama 3 tokenizer (both are tiktoken BPEs with a
+    ~100k+ vocabulary). When it cannot be loaded, for example without network on
+    first use, token counts fall back to an estimate.
+    """
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, estimating token counts: {str(e)}")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without a tokenizer
+
+    Every punctuation mark counts as one token and words as one token per four
+    characters, which also holds up for accented and non-Latin text.
+    """
+    return sum(math.ceil(len(piece) / 4) for piece in PIECE_PATTERN.findall(text))
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of a text"""
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding is None:
+        return estimate_tokens(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text to at most max_tokens tokens"""
+    if max_tokens <= 0:
+        return ""
+    encoding = get_encoding()
+    if encoding is None:
+        used_tokens = 0
+        for match in PIECE_PATTERN.finditer(text):
+            used_tokens += math.ceil(len(match.group()) / 4)
+            if used_tokens > max_tokens:
+                return text[:match.start()]
+        return text
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
+
+
+def get_context_window(model_name: str) -> int:
+    """Get the context window of a model, in tokens
+
+    Args:
+        model_name (str): Name of the model (e.g., "Meta-Llama-3.1-8B-Instruct")
+
+    Returns:
+        int: Configured override, known window of the model, or DEFAULT_CONTEXT_WINDOW
+    """
+    overrides = config.get_context_window_overrides()
+    if model_name in overrides:
+        return overrides[model_name]
+    return MODEL_CONTEXT_WINDOWS.get(model_name, DEFAULT_CONTEXT_WINDOW)
+
+
+def get_input_budget(model_name: str, max_tokens: int, prompt: str = "") -> int:
+    """Get the number of tokens left for the variable input of a prompt
+
+    The budget is the context window minus the tokens reserved for generation
+    (max_tokens) and the fixed prompt text, less a safety margin.
+
+    Args:
+        model_name (str): Name of the model
+        max_tokens (int): Tokens reserved for the completion
+        prompt (str): Fixed part of the prompt, without the variable input
+
+    Returns:
+        int: Token budget of the input, at least 256
+    """
+    available = get_context_window(model_name) - max_tokens - count_tokens(prompt)
+    return max(256, int(available * (1 - TOKEN_SAFETY_MARGIN)))
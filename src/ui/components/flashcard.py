@@ -107,6 +107,18 @@ def render_flashcards(flashcards: List[Dict[str, Any]]):
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+def render_flashcard_progress(placeholder, flashcards: List[Dict[str, Any]]):
+    """Render the flashcards generated so far while the deck is still being built
+    
+    Args:
+        placeholder: Streamlit placeholder (st.empty()) redrawn on every new card
+        flashcards (List[Dict[str, Any]]): Flashcards generated so far
+    """
+    with placeholder.container():
+        st.info(get_translation("Generating flashcards... {count} ready").format(count=len(flashcards)))
+        for number, card in enumerate(flashcards, start=1):
+            st.markdown(f"**{number}.** {card.get('question', '')}")
+
 # Example usage
 if __name__ == "__main__":
     example_flashcards = [
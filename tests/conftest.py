@@ -0,0 +1,17 @@
+import os
+import shutil
+import sys
+import tempfile
+
+# Keep the logs, caches and database of the test run out of the repository
+RUNTIME_DIR = tempfile.mkdtemp(prefix="learnicity-tests-")
+os.environ.setdefault("LOGS_DIR", os.path.join(RUNTIME_DIR, "logs"))
+os.environ.setdefault("CACHE_DIR", os.path.join(RUNTIME_DIR, "cache"))
+os.environ.setdefault("SERPAPI_API_KEY", "test")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(RUNTIME_DIR, 'learnicity.db')}")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(RUNTIME_DIR, ignore_errors=True)
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from src.data.db import get_db_context
+from src.data.db.database import init_db
+from src.data.models.deck import Deck
+from src.data.services.deck_service import DeckService, hash_file, normalize_topic
+
+FLASHCARDS = [
+    {"question": f"Question {index}?", "answer": f"Answer {index}", "source": "https://example.com", "type": "text"}
+    for index in range(5)
+]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def database():
+    init_db()
+
+
+@pytest.fixture
+def service():
+    return DeckService()
+
+
+def test_normalize_topic():
+    assert normalize_topic("  The   French Revolution?! ") == "the french revolution"
+    assert normalize_topic("ＡＢＣ") == "abc"
+
+
+def test_hash_file_is_stable():
+    assert hash_file(b"data") == hash_file(b"data")
+    assert hash_file(b"data") != hash_file(b"other")
+
+
+def test_topic_deck_round_trip(service):
+    deck_id = service.save_topic_deck("Photosynthesis", "en", FLASHCARDS)
+
+    deck = service.find_topic_deck("  photosynthesis ", "en")
+
+    assert deck["id"] == deck_id
+    assert deck["title"] == "Photosynthesis"
+    assert deck["flashcards"] == FLASHCARDS
+    assert deck["quiz"] is None
+    assert service.find_topic_deck("photosynthesis", "es") is None
+
+
+def test_saving_again_replaces_the_deck_and_its_quiz(service):
+    first = service.save_file_deck("hash-1", "notes.pdf", "en", FLASHCARDS)
+    assert service.save_quiz(first, [{"question": "Q?", "options": ["a", "b"], "answer": "a"}])
+
+    second = service.save_file_deck("hash-1", "notes.pdf", "en", FLASHCARDS[:3])
+    deck = service.find_file_deck("hash-1", "en")
+
+    assert second != first
+    assert deck["id"] == second
+    assert len(deck["flashcards"]) == 3
+    assert deck["quiz"] is None
+
+
+def test_quiz_is_stored_with_the_deck(service):
+    deck_id = service.save_topic_deck("Volcanoes", "en", FLASHCARDS)
+    questions = [{"question": "Q?", "options": ["a", "b"], "answer": "a"}]
+
+    assert service.save_quiz(deck_id, questions)
+    assert not service.save_quiz(deck_id, [])
+    assert service.find_topic_deck("volcanoes", "en")["quiz"] == questions
+
+
+def test_empty_deck_is_not_stored(service):
+    assert service.save_topic_deck("Empty", "en", []) is None
+
+
+def test_incomplete_deck_is_not_reused(service, monkeypatch):
+    monkeypatch.setattr("src.core.config.config.get_deck_min_cards", lambda: 3)
+    service.save_topic_deck("Tiny", "en", FLASHCARDS[:2])
+
+    assert service.find_topic_deck("tiny", "en") is None
+
+
+def test_old_deck_is_not_reused(service, monkeypatch):
+    monkeypatch.setattr("src.core.config.config.get_deck_max_age_days", lambda: 30)
+    deck_id = service.save_topic_deck("Old topic", "en", FLASHCARDS)
+    with get_db_context(write=True) as db:
+        db.execute(
+            update(Deck).where(Deck.id == deck_id).values(created_at=datetime.now(timezone.utc) - timedelta(days=31))
+        )
+
+    assert service.find_topic_deck("old topic", "en") is None
+
+    monkeypatch.setattr("src.core.config.config.get_deck_max_age_days", lambda: 0)
+    assert service.find_topic_deck("old topic", "en")["id"] == deck_id
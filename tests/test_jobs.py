@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+
+from src.llm.services.jobs import CANCELLED, DONE, FAILED, JobCancelled, JobManager
+
+
+def wait(manager, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job.finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+@pytest.fixture
+def manager():
+    return JobManager(max_workers=2)
+
+
+def test_job_result_and_progress(manager):
+    def work(job, value):
+        job.report(completed=1, total=2, message="half", partial=[value])
+        return value * 2
+
+    job = wait(manager, manager.submit("double", work, 21))
+
+    assert job.status == DONE
+    assert job.result == 42
+    assert (job.completed, job.total, job.message, job.partial) == (1, 2, "half", [21])
+
+
+def test_failed_job_keeps_the_error(manager):
+    def work(job):
+        raise ValueError("no results")
+
+    job = wait(manager, manager.submit("fail", work))
+
+    assert job.status == FAILED
+    assert job.error == "no results"
+
+
+def test_running_job_stops_at_check_cancelled(manager):
+    started = threading.Event()
+
+    def work(job):
+        started.set()
+        while True:
+            job.check_cancelled()
+            time.sleep(0.01)
+
+    job_id = manager.submit("loop", work)
+    started.wait(5)
+
+    assert manager.cancel(job_id)
+    assert wait(manager, job_id).status == CANCELLED
+
+
+def test_pending_job_is_dropped_from_the_queue():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+    ran = []
+
+    blocker = manager.submit("block", lambda job: release.wait(5))
+    pending = manager.submit("pending", lambda job: ran.append(True))
+
+    assert manager.cancel(pending)
+    assert manager.get(pending).status == CANCELLED
+    release.set()
+    wait(manager, blocker)
+    assert ran == []
+
+
+def test_same_key_joins_the_unfinished_job(manager):
+    release = threading.Event()
+    calls = []
+
+    def work(job):
+        calls.append(job.id)
+        release.wait(5)
+        return "deck"
+
+    first = manager.submit("deck", work, key=("deck", "topic"))
+    assert manager.join(("deck", "topic")) == first
+    assert manager.submit("deck", work, key=("deck", "topic")) == first
+    assert manager.join(("deck", "other")) is None
+
+    # Shared by three subscribers, only the last cancel stops it
+    assert not manager.cancel(first)
+    assert not manager.cancel(first)
+    release.set()
+    assert wait(manager, first).result == "deck"
+    assert calls == [first]
+
+    # A finished job is not joined again
+    assert manager.submit("deck", lambda job: "again", key=("deck", "topic")) != first
+
+
+def test_cancelled_key_starts_afresh(manager):
+    release = threading.Event()
+    first = manager.submit("deck", lambda job: release.wait(5), key="k")
+
+    assert manager.cancel(first)
+    assert manager.join("k") is None
+    release.set()
+
+
+def test_finished_jobs_expire_after_retention():
+    manager = JobManager(max_workers=1, retention=0)
+    release = threading.Event()
+    job_id = manager.submit("quick", lambda job: release.wait(5))
+    job = manager.get(job_id)
+    release.set()
+    job.future.result(5)
+    time.sleep(0.01)
+
+    assert manager.get(job_id) is None
+
+
+def test_check_cancelled_raises_once_cancelled(manager):
+    release = threading.Event()
+    job_id = manager.submit("wait", lambda job: release.wait(5))
+    job = manager.get(job_id)
+    manager.cancel(job_id)
+    release.set()
+
+    with pytest.raises(JobCancelled):
+        job.check_cancelled()
@@ -0,0 +1,50 @@
+import json
+
+from src.llm.chains.repair import RepairChain
+from src.llm.parsers.json_repair import needs_repair, repair_json
+from src.llm.text.tokens import count_tokens
+
+
+def test_valid_object_followed_by_prose_with_braces():
+    assert repair_json('Sure! {"quiz": [1, 2]} Hope {this} helps') == {"quiz": [1, 2]}
+
+
+def test_trailing_commas_are_removed_outside_strings_only():
+    text = '```json\n{"answer": "a, }", "items": [1, 2,],}\n```'
+
+    assert repair_json(text) == {"answer": "a, }", "items": [1, 2]}
+
+
+def test_python_literal():
+    assert repair_json("{'flashcards': [], 'done': True}") == {"flashcards": [], "done": True}
+
+
+def test_truncated_array_keeps_complete_items():
+    text = '{"flashcards": [{"question": "A?"}, {"question": "B?"}, {"question": "C'
+
+    assert repair_json(text) == {"flashcards": [{"question": "A?"}, {"question": "B?"}]}
+
+
+def test_no_json():
+    assert repair_json("I cannot help with that.") is None
+
+
+def test_needs_repair_only_without_decodable_array():
+    assert not needs_repair('{"flashcards": []}', "flashcards")
+    assert not needs_repair('Here: {"flashcards": [{"bad": 1}]}', "flashcards")
+    assert needs_repair('{"flashcards": [{"question": "A?"}, {"question', "flashcards")
+    assert needs_repair("{'flashcards': []}", "flashcards")
+    assert needs_repair('{"quiz": []}', "flashcards")
+    assert needs_repair("", "flashcards")
+
+
+def test_repair_input_fits_the_context_of_the_repair_model():
+    chain = RepairChain.__new__(RepairChain)
+    items = [{"question": f"Question {index} about photosynthesis?", "answer": "x " * 40} for index in range(400)]
+    response = json.dumps({"flashcards": items})
+
+    fitted = chain.fit_response(response, '{"flashcards": [...]}')
+
+    assert response.startswith(fitted)
+    assert count_tokens(fitted) + RepairChain.MAX_TOKENS < 8192
+    assert chain.fit_response('{"flashcards": [', "{}") == '{"flashcards": ['
@@ -0,0 +1,91 @@
+import json
+
+from src.llm.parsers.json_stream import JSONStreamExtractor, extract_json_objects
+
+RESPONSE = json.dumps({
+    "flashcards": [
+        {"question": "What is {photosynthesis}?", "answer": "Light to \"chemical\" energy", "tags": ["a", {"b": [1]}]},
+        {"question": "Where does it happen?", "answer": "In chloroplasts [mostly]"},
+    ]
+})
+
+
+def feed_all(extractor, chunks):
+    items = []
+    for chunk in chunks:
+        items += extractor.feed(chunk)
+    extractor.close()
+    return items
+
+
+def test_emits_items_as_they_close():
+    extractor = JSONStreamExtractor(item_keys=["flashcards"])
+    # Position of the closing brace of the first flashcard
+    closing = RESPONSE.index('}]}, {"question"') + 2
+
+    assert extractor.feed(RESPONSE[:closing]) == []
+    items = extractor.feed(RESPONSE[closing])
+
+    assert [item["question"] for item in items] == ["What is {photosynthesis}?"]
+    assert items[0]["tags"] == ["a", {"b": [1]}]
+
+
+def test_items_of_other_arrays_are_not_emitted():
+    extractor = JSONStreamExtractor(item_keys=["questions"])
+
+    assert feed_all(extractor, [RESPONSE]) == []
+    assert extractor.documents == [json.loads(RESPONSE)]
+
+
+def test_any_chunk_boundary_gives_the_same_result():
+    text = "Here you go:\n```json\n" + RESPONSE + "\n```"
+    expected = json.loads(RESPONSE)["flashcards"]
+
+    for size in (1, 2, 3, 7, 64):
+        extractor = JSONStreamExtractor(item_keys=["flashcards"])
+        items = feed_all(extractor, [text[i:i + size] for i in range(0, len(text), size)])
+        assert items == expected
+        assert extractor.documents == [json.loads(RESPONSE)]
+
+
+def test_escaped_quote_split_across_chunks():
+    extractor = JSONStreamExtractor(item_keys=["items"])
+    text = '{"items": [{"text": "say \\"hi\\" {"}]}'
+    split = text.index('\\"') + 1
+
+    items = feed_all(extractor, [text[:split], text[split:]])
+
+    assert items == [{"text": 'say "hi" {'}]
+
+
+def test_deep_nesting():
+    document = {"a": []}
+    inner = document["a"]
+    for _ in range(500):
+        inner.append([])
+        inner = inner[0]
+
+    assert extract_json_objects(json.dumps(document)) == [document]
+
+
+def test_mismatched_bracket_skips_the_object():
+    text = '{"broken": [1, 2}} then {"ok": true}'
+
+    assert extract_json_objects(text) == [{"ok": True}]
+
+
+def test_invalid_object_is_dropped():
+    assert extract_json_objects('{"a": 1,} and {"b": 2}') == [{"b": 2}]
+
+
+def test_stray_brace_recovers_complete_nested_objects():
+    text = 'Use a { to open. {"a": 1} and {"b": [2]}'
+
+    assert extract_json_objects(text) == [{"a": 1}, {"b": [2]}]
+
+
+def test_extract_json_objects_among_prose():
+    text = 'First {"a": 1}, then some text, then {"b": {"c": "}"}} and the end.'
+
+    assert extract_json_objects(text) == [{"a": 1}, {"b": {"c": "}"}}]
+    assert extract_json_objects("no json here") == []
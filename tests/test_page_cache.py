@@ -0,0 +1,111 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.llm.cache.page_cache import PageCache
+from src.llm.cache.sqlite_store import SQLiteStore
+from src.llm.services.fetcher import PageFetcher
+
+BODY = b"<html><body><p>Photosynthesis converts light into chemical energy.</p></body></html>"
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves one page with validators and answers 304 to a matching revalidation"""
+
+    requests = []
+
+    def do_GET(self):
+        StubHandler.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    StubHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/page"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteStore(path=str(tmp_path / "pages.db"), table="pages", max_bytes=1_000_000)
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def fetcher(store):
+    fetcher = PageFetcher(timeout=5, cache=PageCache(store))
+    yield fetcher
+    fetcher.close()
+
+
+def test_first_fetch_stores_body_and_validators(fetcher, stub_url):
+    page = fetcher.fetch(stub_url)
+
+    assert page["status"] == 200
+    assert page["text"] == BODY.decode("utf-8")
+
+    cached = fetcher.cache.get(stub_url)
+    assert cached["text"] == BODY.decode("utf-8")
+    assert cached["etag"] == ETAG
+    assert cached["last_modified"] == LAST_MODIFIED
+
+
+def test_second_fetch_revalidates_and_serves_cached_body(fetcher, stub_url):
+    fetcher.fetch(stub_url)
+    page = fetcher.fetch(stub_url)
+
+    assert len(StubHandler.requests) == 2
+    assert "If-None-Match" not in StubHandler.requests[0]
+    assert StubHandler.requests[1]["If-None-Match"] == ETAG
+    assert StubHandler.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+    assert page["status"] == 304
+    assert page["text"] == BODY.decode("utf-8")
+
+
+def test_pages_without_validators_are_not_cached(store):
+    cache = PageCache(store)
+
+    cache.put("https://example.com/", {"url": "https://example.com/", "text": "body"}, None, None)
+
+    assert cache.get("https://example.com/") is None
+
+
+def test_byte_budget_evicts_least_recently_used_pages(tmp_path):
+    store = SQLiteStore(path=str(tmp_path / "pages.db"), table="pages", max_bytes=600, touch_interval=0)
+    cache = PageCache(store)
+    page = {"status": 200, "content_type": "text/html", "text": "x" * 150, "truncated": False}
+
+    cache.put("https://example.com/a", dict(page, url="https://example.com/a"), ETAG, None)
+    cache.put("https://example.com/b", dict(page, url="https://example.com/b"), ETAG, None)
+    assert cache.get("https://example.com/a") is not None
+    cache.put("https://example.com/c", dict(page, url="https://example.com/c"), ETAG, None)
+
+    assert cache.get("https://example.com/a") is not None
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/c") is not None
+    assert store.stats()["bytes"] <= 600
+    store.close()
@@ -0,0 +1,70 @@
+import json
+import threading
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from src.llm.chains.quiz import QuizChain
+
+FLASHCARDS = [{"question": f"What is topic {index}?", "answer": f"Answer {index}"} for index in range(8)]
+
+TOPICS = ["volcanoes", "glaciers", "deserts", "rivers", "oceans", "forests"]
+
+
+def question(text):
+    return {"question": text, "options": ["a", "b", "c", "d"], "correct_answer": 0, "explanation": "Because."}
+
+
+@pytest.fixture
+def quiz_chain(monkeypatch):
+    monkeypatch.setattr("src.core.config.config.get_quiz_shard_size", lambda: 2)
+    monkeypatch.setattr("src.core.config.config.get_quiz_max_concurrency", lambda: 2)
+    chain = QuizChain()
+    chain.structured_output = False
+    return chain
+
+
+def test_sharded_quiz_merges_every_shard(quiz_chain):
+    calls = []
+
+    def shard(inputs):
+        calls.append(inputs)
+        shard_topics = TOPICS[len(calls) * 3 - 3:len(calls) * 3]
+        return json.dumps({"quiz": [question(f"Which process shapes {topic}?") for topic in shard_topics]})
+
+    quiz_chain.shard_chain = RunnableLambda(shard)
+
+    quiz = quiz_chain.create_quiz(FLASHCARDS, 4)
+
+    assert len(calls) == 2
+    assert len(quiz) == 4
+
+
+def test_cancelled_quiz_stops_between_shards(quiz_chain):
+    first_done = threading.Event()
+    release = threading.Event()
+    parsed = []
+
+    def shard(inputs):
+        if first_done.is_set():
+            release.wait(5)
+        first_done.set()
+        return json.dumps({"quiz": [question(inputs["flashcards"])]})
+
+    quiz_chain.shard_chain = RunnableLambda(shard)
+    parse_result = quiz_chain.parse_result
+    quiz_chain.parse_result = lambda result: parsed.append(result) or parse_result(result)
+
+    def is_cancelled():
+        release.set()
+        return True
+
+    assert quiz_chain.create_quiz(FLASHCARDS, 4, is_cancelled=is_cancelled) == []
+    assert parsed == []
+
+
+def test_cancelled_quiz_skips_the_llm_call(quiz_chain, monkeypatch):
+    monkeypatch.setattr("src.core.config.config.get_quiz_shard_size", lambda: 0)
+    quiz_chain.chain = RunnableLambda(lambda inputs: pytest.fail("the LLM was called"))
+
+    assert quiz_chain.create_quiz(FLASHCARDS, 4, is_cancelled=lambda: True) == []
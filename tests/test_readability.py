@@ -0,0 +1,55 @@
+from src.llm.text.readability import extract_main_text
+
+ARTICLE = (
+    "<p>Photosynthesis converts light energy into chemical energy, storing it in glucose.</p>"
+    "<p>It takes place in the chloroplasts, mainly in the leaves of green plants.</p>"
+)
+
+NAVIGATION = '<nav><a href="/">Home</a> <a href="/about">About</a></nav>'
+
+SIDEBAR = '<div class="sidebar"><a href="/a">Related link one</a> <a href="/b">Related link two</a></div>'
+
+
+def test_extracts_article_without_chrome():
+    html = f"<html><body>{NAVIGATION}<article>{ARTICLE}</article>{SIDEBAR}<footer>Copyright</footer></body></html>"
+
+    result = extract_main_text(html)
+
+    assert "Photosynthesis converts light energy" in result["text"]
+    assert "chloroplasts" in result["text"]
+    assert "Home" not in result["text"]
+    assert "Related link" not in result["text"]
+    assert "Copyright" not in result["text"]
+
+
+def test_keeps_content_inside_boilerplate_named_wrappers():
+    html = (
+        '<html><body><div id="menu-wrapper">'
+        f"{NAVIGATION}"
+        f'<div class="layout has-sidebar"><div class="prose">{ARTICLE}</div>{SIDEBAR}</div>'
+        "</div></body></html>"
+    )
+
+    result = extract_main_text(html)
+
+    assert result["text_chars"] > 0
+    assert "Photosynthesis converts light energy" in result["text"]
+    assert "Home" not in result["text"]
+
+
+def test_keeps_landmark_inside_boilerplate_named_wrapper():
+    html = f'<html><body><div class="page-with-sidebar"><main>{ARTICLE}</main>{SIDEBAR}</div></body></html>'
+
+    result = extract_main_text(html)
+
+    assert "chloroplasts" in result["text"]
+    assert "Related link" not in result["text"]
+
+
+def test_falls_back_to_page_text_when_nothing_is_extracted():
+    html = "<html><body><div class='menu'>Light energy becomes chemical energy.</div></body></html>"
+
+    result = extract_main_text(html)
+
+    assert result["text"] == "Light energy becomes chemical energy."
+    assert result["text_chars"] == result["page_chars"]
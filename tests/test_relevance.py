@@ -0,0 +1,56 @@
+import pytest
+
+from src.llm.chains.search import SearchChain
+from src.llm.text.relevance import BM25, select_relevant_chunks, terms
+from src.llm.text.tokens import count_tokens
+
+CHUNKS = [
+    "The of and the to in of the and " * 10,
+    "Rome was founded on the Tiber and grew into an empire.",
+    "Cats and dogs are the most common pets in the world.",
+    "The history of Rome spans the kingdom, the republic and the empire of Rome.",
+]
+
+
+def test_stopwords_are_not_terms():
+    assert terms("The history of Rome") == ["history", "rome"]
+    assert terms("La historia de Roma") == ["historia", "roma"]
+
+
+def test_function_words_do_not_match_a_query():
+    scores = BM25(CHUNKS).scores("the history of Rome")
+
+    assert scores[0] == 0
+    assert scores[2] == 0
+    assert scores[3] > scores[1] > 0
+
+
+def test_selected_chunks_keep_document_order():
+    assert select_relevant_chunks(CHUNKS, "the history of Rome", 2) == [CHUNKS[1], CHUNKS[3]]
+
+
+def test_stopword_only_query_keeps_every_chunk():
+    assert select_relevant_chunks(CHUNKS, "the of", 1) == CHUNKS
+
+
+@pytest.fixture
+def search_chain(monkeypatch):
+    monkeypatch.setattr("src.core.config.config.get_summary_top_k_chunks", lambda: 4)
+    return SearchChain()
+
+
+def test_page_within_one_summary_call_is_kept_whole(search_chain):
+    content = "\n\n".join(["Unrelated text about gardening and soil."] * 20 + ["Rome history."])
+    assert count_tokens(content) <= search_chain.summary_input_tokens
+
+    assert search_chain.select_relevant_content(content, "Rome") == content
+
+
+def test_long_page_keeps_the_top_chunks(search_chain):
+    filler = "Unrelated paragraph about gardening, soil, seeds and watering schedules. " * 30
+    content = "\n\n".join([filler] * 60 + ["The founding of Rome is dated to 753 BC."] + [filler] * 60)
+
+    relevant = search_chain.select_relevant_content(content, "founding of Rome")
+
+    assert "753 BC" in relevant
+    assert count_tokens(relevant) < count_tokens(content)
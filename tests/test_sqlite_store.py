@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from src.llm.cache.sqlite_store import SQLiteStore
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    stores = []
+
+    def make(**kwargs):
+        store = SQLiteStore(path=str(tmp_path / "cache.db"), table="entries", **kwargs)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def age(store, key, seconds, column="created_at"):
+    """Move a timestamp of an entry into the past"""
+    store._connection().execute(
+        f"UPDATE {store.table} SET {column} = {column} - ? WHERE key = ?", (seconds, key)
+    )
+
+
+def test_set_get_and_stats(make_store):
+    store = make_store()
+    store.set("a", b"value")
+
+    assert store.get("a") == b"value"
+    assert store.get("missing") is None
+    assert store.stats() == {"hits": 1, "stale_hits": 0, "misses": 1, "entries": 1, "bytes": 5}
+
+
+def test_stale_entries_are_only_served_on_request(make_store):
+    store = make_store(ttl=60, max_stale=600)
+    store.set("a", b"value")
+    age(store, "a", 120)
+
+    assert store.get("a") is None
+    assert store.get("a", allow_stale=True) == b"value"
+    assert store.stats()["stale_hits"] == 1
+
+
+def test_entries_past_max_stale_are_evicted(make_store):
+    store = make_store(ttl=60, max_stale=60)
+    store.set("old", b"value")
+    age(store, "old", 200)
+    store.set("new", b"value")
+
+    assert store.get("old", allow_stale=True) is None
+    assert store.get("new") == b"value"
+
+
+def test_max_entries_evicts_least_recently_used(make_store):
+    store = make_store(max_entries=2, touch_interval=0)
+    store.set("a", b"1")
+    store.set("b", b"2")
+    age(store, "a", 10, "accessed_at")
+    age(store, "b", 5, "accessed_at")
+    store.get("a")
+    store.set("c", b"3")
+
+    assert store.get("a") == b"1"
+    assert store.get("b") is None
+    assert store.get("c") == b"3"
+
+
+def test_max_bytes_evicts_least_recently_used(make_store):
+    store = make_store(max_bytes=10)
+    store.set("a", b"12345")
+    age(store, "a", 5, "accessed_at")
+    store.set("b", b"12345")
+    store.set("c", b"12345")
+
+    assert store.get("a") is None
+    assert store.stats()["bytes"] == 10
+
+
+def test_reads_record_access_time_only_after_touch_interval(make_store):
+    store = make_store(touch_interval=60)
+    store.set("a", b"1")
+    age(store, "a", 30, "accessed_at")
+    accessed_at = lambda: store._connection().execute(
+        "SELECT accessed_at FROM entries WHERE key = 'a'"
+    ).fetchone()[0]
+
+    before = accessed_at()
+    store.get("a")
+    assert accessed_at() == before
+
+    age(store, "a", 60, "accessed_at")
+    store.get("a")
+    assert accessed_at() > time.time() - 5
+
+
+def test_connections_of_finished_threads_are_closed(make_store):
+    store = make_store()
+    thread = threading.Thread(target=store.set, args=("a", b"1"))
+    thread.start()
+    thread.join()
+    assert thread in store._connections
+
+    store.get("a")
+    other = threading.Thread(target=store.get, args=("a",))
+    other.start()
+    other.join()
+
+    assert thread not in store._connections
+
+
+def test_close_closes_every_connection_and_reopens_on_use(make_store):
+    store = make_store()
+    store.set("a", b"1")
+
+    store.close()
+
+    assert store._connections == {}
+    assert store.get("a") == b"1"
+
+
+def test_invalid_table_name_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        SQLiteStore(path=str(tmp_path / "cache.db"), table="entries; DROP TABLE x")